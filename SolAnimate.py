@@ -0,0 +1,200 @@
+#! /usr/bin/env python
+"""
+SolAnimate
+
+Purpose: Animate the solar system over a date range and export it straight
+         to MP4 or GIF, e.g. "my first 30 years, one frame per week".
+
+Usage:
+    python ./SolAnimate.py --start 1990-05-17 --end 2020-05-17 --step 7 \
+                           --out first30.mp4 --processes 4
+
+Comments:
+    Positions are computed in batches (one SolSystem.getPositions call per
+    chunk of frames) and drawn by updating the persistent artists of a
+    HeadlessCanvas. Rendered RGBA frames are piped to ffmpeg as they are
+    produced, so only the frames in flight are held in memory. With more
+    than one process, chunks of frames are rendered in worker processes
+    (each with its own SPICE state) and written in order by the parent.
+
+    Requires the ffmpeg executable (matplotlib's animation.ffmpeg_path).
+
+"""
+
+## Imports
+import os
+import sys
+import time
+import argparse
+import subprocess
+import collections
+
+import matplotlib
+
+from SolBatch import dateRange
+from SolPlot import VIEW_MODES
+from model import WorkerPool
+
+# Per-process state built once by the pool initialiser
+_worker = {}
+
+
+# Class streaming raw RGBA frames into an ffmpeg encoder process
+class FrameEncoder(object):
+    """Pipe frames to ffmpeg, output format chosen from the file extension"""
+    def __init__(self, outFile, width, height, fps=24):
+        super(FrameEncoder, self).__init__()
+
+        self.outFile = outFile
+        self.width, self.height = width, height
+        self.nFrames = 0
+
+        cmd = [matplotlib.rcParams['animation.ffmpeg_path'], '-y',
+               '-loglevel', 'error',
+               '-f', 'rawvideo', '-pix_fmt', 'rgba',
+               '-s', '{0}x{1}'.format(width, height),
+               '-r', str(fps), '-i', '-']
+        if outFile.lower().endswith('.gif'):
+            # A palette per frame (stats_mode=single, paletteuse new=1):
+            # palettegen's default whole-stream palette is only emitted at
+            # the end of the stream, so ffmpeg would buffer every frame
+            cmd += ['-filter_complex',
+                    'split[a][b];[a]palettegen=stats_mode=single[p];[b][p]paletteuse=new=1']
+        else:
+            # libx264/yuv420p needs even dimensions
+            cmd += ['-vf', 'scale=trunc(iw/2)*2:trunc(ih/2)*2',
+                    '-c:v', 'libx264', '-pix_fmt', 'yuv420p']
+        cmd += [outFile]
+
+        try:
+            self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        except OSError:
+            raise RuntimeError('ffmpeg not found ({0}), set '
+                               'animation.ffmpeg_path'.format(cmd[0]))
+
+    # Method for writing one frame of width*height*4 bytes
+    def write(self, frame):
+        self.proc.stdin.write(frame)
+        self.nFrames += 1
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError('ffmpeg failed writing {0}'.format(self.outFile))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Pool initialiser: load kernels, build orbits and a canvas for this worker
+def _initWorker(mkFile, figsize, dpi, backend, viewMode='3d', catalog=None):
+    from model.SolSystem import SolSystem
+    from SolPlot import HeadlessCanvas
+
+    sol = SolSystem(mkFile, backend=backend, catalog=catalog)
+    canvas = HeadlessCanvas(figsize=figsize, viewMode=viewMode)
+    canvas.figure.set_dpi(dpi)
+    _worker.update(sol=sol, canvas=canvas)
+
+
+# Render a chunk of dates, returns a list of (frame bytes, seconds)
+def _renderChunk(dates):
+    sol, canvas = _worker['sol'], _worker['canvas']
+
+    # One batched ephemeris call for the whole chunk
+    eph = sol.getPositions(dates, bodies=canvas.plottedBodies(sol),
+                           frame='HCI', obs='SOLAR SYSTEM BARYCENTER')
+    frames = []
+    for i, date in enumerate(dates):
+        t0 = time.perf_counter()
+        frame = canvas.renderFrame(sol, date, ephemeris=eph[:,i:i+1])
+        frames.append((frame, time.perf_counter() - t0))
+    return frames
+
+
+# Method for rendering a date range to a video/GIF
+def animate(dates, outFile, fps=24, processes=1, chunkSize=16, mkFile=None,
+            figsize=(16, 9), dpi=100, backend=None, viewMode='3d', catalog=None,
+            report=print):
+    """Render one frame per date into outFile, returns per-frame seconds"""
+    width, height = int(round(figsize[0] * dpi)), int(round(figsize[1] * dpi))
+    chunks = [dates[i:i+chunkSize] for i in range(0, len(dates), chunkSize)]
+    initargs = (mkFile, figsize, dpi, backend, viewMode, catalog)
+    timings = []
+
+    t0 = time.perf_counter()
+    with FrameEncoder(outFile, width, height, fps=fps) as encoder:
+        if processes == 1:
+            _initWorker(*initargs)
+            results = (_renderChunk(c) for c in chunks)
+            pool = None
+        else:
+            pool = WorkerPool.spawnPool(processes, _initWorker, initargs,
+                                        mkFile=mkFile, backend=backend)
+            results = _boundedImap(pool, WorkerPool.guarded(_renderChunk), chunks,
+                                   2 * (processes or os.cpu_count()))
+
+        with WorkerPool.finishing(pool):
+            for frames in results:
+                for frame, seconds in frames:
+                    encoder.write(frame)
+                    timings.append(seconds)
+                if report:
+                    report('{0}/{1} frames, last chunk {2:.3f} s/frame'.format(
+                        len(timings), len(dates),
+                        sum(f[1] for f in frames) / len(frames)))
+    elapsed = time.perf_counter() - t0
+
+    if report and timings:
+        report('Wrote {0} frames to {1} in {2:.2f} s: {3:.1f} frames/s, '
+               'render {4:.3f} s/frame (min {5:.3f}, max {6:.3f})'.format(
+                   len(timings), outFile, elapsed, len(timings) / elapsed,
+                   sum(timings) / len(timings), min(timings), max(timings)))
+    return timings
+
+
+# Ordered imap keeping at most `window` tasks in flight, so finished frames
+# never pile up in memory ahead of the encoder
+def _boundedImap(pool, func, items, window):
+    pending = collections.deque()
+    for item in items:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Animate SolBirthday over a '
+                                     'date range and export MP4/GIF')
+    parser.add_argument('--start', required=True, help='first date (YYYY-MM-DD)')
+    parser.add_argument('--end', required=True, help='last date (YYYY-MM-DD)')
+    parser.add_argument('--step', type=int, default=7,
+                        help='days between frames (default 7)')
+    parser.add_argument('--out', required=True, help='output .mp4 or .gif')
+    parser.add_argument('--fps', type=int, default=24)
+    parser.add_argument('--processes', '-j', type=int, default=1)
+    parser.add_argument('--chunk', type=int, default=16,
+                        help='frames per batched ephemeris call/worker task')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--mk', default=None,
+                        help='SPICE metakernel (default ./assets/spice/metakernel.mk)')
+    parser.add_argument('--backend', default=None, choices=['spice', 'numpy', 'table', 'analytic'])
+    parser.add_argument('--view', default='3d', choices=VIEW_MODES,
+                        help='3d, projected (2D, same camera, fastest) or topdown')
+    parser.add_argument('--catalog', nargs='+', default=None, metavar='CSV',
+                        help='extra body catalogs drawn as groups (see model.BodyCatalog)')
+    args = parser.parse_args(argv)
+
+    dates = dateRange(args.start, args.end, args.step)
+    animate(dates, args.out, fps=args.fps, processes=args.processes,
+            chunkSize=args.chunk, mkFile=args.mk, dpi=args.dpi,
+            backend=args.backend, viewMode=args.view, catalog=args.catalog)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#! /usr/bin/env python
+"""
+SolBatch
+
+Purpose: Headless batch renderer for SolBirthday. Renders the solar system
+         on each requested date straight to image files without a
+         QApplication, fanning the work out over a process pool.
+
+Usage:
+    python ./SolBatch.py --dates 1990-05-17 2018-01-16 --outdir posters
+    python ./SolBatch.py --start 1990-01-01 --end 1990-12-31 --step 7 \
+                         --outdir posters --processes 8
+    python ./SolBatch.py --date-file popular.txt --outdir posters --cache
+
+Comments:
+    Each worker process builds its own SolSystem (and so its own CSPICE
+    kernel state) once in the pool initialiser. Workers are started with
+    the 'spawn' method so no SPICE state is inherited from the parent.
+    Kernels that fail to load stop the run before any worker starts (see
+    model.WorkerPool).
+
+    With --cache every worker reads and fills a shared model.RenderCache
+    directory, so a date already rendered with the same settings is copied
+    from the cache instead of drawn again.
+
+"""
+
+## Imports
+import os
+import sys
+import time
+import argparse
+import datetime as dt
+
+from SolPlot import VIEW_MODES
+from model import WorkerPool
+
+# Per-process state built once by the pool initialiser
+_worker = {}
+
+
+# Pool initialiser: load kernels, build orbits and a canvas for this worker
+def _initWorker(mkFile, figsize, backend, viewMode='3d', catalog=None, cache=None):
+    from model.SolSystem import SolSystem
+    from model.RenderCache import RenderCache
+    from SolPlot import HeadlessCanvas
+
+    _worker['sol'] = SolSystem(mkFile, backend=backend, catalog=catalog)
+    _worker['canvas'] = HeadlessCanvas(figsize=figsize, viewMode=viewMode)
+    _worker['cache'] = None if cache is None else RenderCache(*cache)
+
+
+# Render a single date in the current worker, returns (date, file, seconds,
+# whether it came from the render cache)
+def _renderOne(job):
+    date, outDir, dpi, fmt = job
+    t0 = time.perf_counter()
+    name = os.path.join(outDir, 'SolBirthday_{0}.{1}'.format(date, fmt))
+    hit = _worker['canvas'].render(_worker['sol'], date, name, dpi=dpi,
+                                   cache=_worker['cache'])
+    return date, name, time.perf_counter() - t0, hit
+
+
+# Method for building an inclusive list of ISO dates
+def dateRange(start, end, stepDays=1):
+    ts = dt.datetime.strptime(start, '%Y-%m-%d')
+    te = dt.datetime.strptime(end, '%Y-%m-%d')
+    nDays = (te - ts).days
+    return [(ts + dt.timedelta(days=d)).strftime('%Y-%m-%d')
+            for d in range(0, nDays + 1, stepDays)]
+
+
+# Method for rendering many dates to outDir
+def renderDates(dates, outDir, processes=None, mkFile=None, dpi=300,
+                figsize=(16, 9), backend=None, fmt='png', viewMode='3d',
+                catalog=None, cache=None, report=print):
+    """Render every date in `dates`, returns a list of (date, file, seconds)
+
+    processes=1 renders in the calling process, otherwise a pool of
+    `processes` workers is used (default: one per CPU). `cache` is a
+    (cacheDir, maxBytes) pair for a model.RenderCache shared by the workers
+    (cacheDir None for the default location).
+    """
+    if not os.path.isdir(outDir):
+        os.makedirs(outDir)
+
+    jobs = [(d, outDir, dpi, fmt) for d in dates]
+    initargs = (mkFile, figsize, backend, viewMode, catalog,
+                None if cache is None else tuple(cache))
+    results = []
+    hits = 0
+
+    t0 = time.perf_counter()
+    if processes == 1:
+        _initWorker(*initargs)
+        outputs = map(_renderOne, jobs)
+        pool = None
+    else:
+        pool = WorkerPool.spawnPool(processes, _initWorker, initargs,
+                                    mkFile=mkFile, backend=backend)
+        outputs = pool.imap_unordered(WorkerPool.guarded(_renderOne), jobs)
+
+    with WorkerPool.finishing(pool):
+        for date, name, seconds, hit in outputs:
+            results.append((date, name, seconds))
+            hits += hit
+            if report:
+                report('{0} -> {1} ({2:.2f} s{3})'.format(date, name, seconds,
+                                                         ', cached' if hit else ''))
+    elapsed = time.perf_counter() - t0
+
+    if report and results:
+        report('Rendered {0} images in {1:.2f} s: {2:.2f} images/s, '
+               'mean {3:.2f} s per image per worker'.format(
+                   len(results), elapsed, len(results) / elapsed,
+                   sum(r[2] for r in results) / len(results)))
+        if cache is not None:
+            report('Render cache: {0} of {1} images reused ({2:.0%})'.format(
+                hits, len(results), hits / len(results)))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render SolBirthday images '
+                                     'without the GUI')
+    parser.add_argument('--dates', nargs='+', default=[],
+                        help='ISO dates (YYYY-MM-DD) to render')
+    parser.add_argument('--date-file',
+                        help='file with one ISO date per line')
+    parser.add_argument('--start', help='first date of a range (YYYY-MM-DD)')
+    parser.add_argument('--end', help='last date of a range (YYYY-MM-DD)')
+    parser.add_argument('--step', type=int, default=1,
+                        help='range step in days (default 1)')
+    parser.add_argument('--outdir', required=True, help='output directory')
+    parser.add_argument('--processes', '-j', type=int, default=None,
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--format', default='png', dest='fmt')
+    parser.add_argument('--mk', default=None,
+                        help='SPICE metakernel (default ./assets/spice/metakernel.mk)')
+    parser.add_argument('--backend', default=None, choices=['spice', 'numpy', 'table', 'analytic'])
+    parser.add_argument('--view', default='3d', choices=VIEW_MODES,
+                        help='3d, projected (2D, same camera) or topdown')
+    parser.add_argument('--catalog', nargs='+', default=None, metavar='CSV',
+                        help='extra body catalogs drawn as groups (see model.BodyCatalog)')
+    parser.add_argument('--cache', nargs='?', const='', default=None, metavar='DIR',
+                        help='reuse and store renders in a cache directory '
+                        '(default ~/.cache/SolBirthday/renders)')
+    parser.add_argument('--cache-mb', type=float, default=512,
+                        help='render cache size bound in MB (default 512)')
+    args = parser.parse_args(argv)
+
+    dates = list(args.dates)
+    if args.date_file:
+        with open(args.date_file) as f:
+            dates += [l.strip() for l in f if l.strip()]
+    if args.start or args.end:
+        if not (args.start and args.end):
+            parser.error('--start and --end must be given together')
+        dates += dateRange(args.start, args.end, args.step)
+    if not dates:
+        parser.error('no dates given (use --dates, --date-file or --start/--end)')
+
+    renderDates(dates, args.outdir, processes=args.processes, mkFile=args.mk,
+                dpi=args.dpi, backend=args.backend, fmt=args.fmt,
+                viewMode=args.view, catalog=args.catalog,
+                cache=(None if args.cache is None else
+                       (args.cache or None, int(args.cache_mb * (1 << 20)))))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
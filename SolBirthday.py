@@ -1,9 +1,23 @@
 #! /Users/benhall/anaconda/envs/py35/bin/python
+import time
+
+# Process start, reference for --profile-startup
+_t0 = time.perf_counter()
 
 if  __name__ == '__main__':
 
+    import argparse
+    parser = argparse.ArgumentParser(description='Your Sol Birthday')
+    parser.add_argument('--profile-startup', nargs='?', const='', default=None,
+                        metavar='JSON',
+                        help='print a startup timing breakdown (imports, '
+                             'kernel loading, orbit generation, first paint) '
+                             'then exit, optionally also writing it to JSON')
+    args = parser.parse_args()
+
     # Import ViewController for SolBirthday app
     import ViewController as VC
 
     # Run app
-    VC.run()
+    VC.run(profileStartup=args.profile_startup is not None, t0=_t0,
+           profileFile=args.profile_startup or None)
@@ -0,0 +1,596 @@
+"""
+SolPlot
+
+Purpose: Matplotlib drawing logic for SolBirthday figures, shared by the
+         Qt PlotCanvas widget and the headless HeadlessCanvas.
+
+Comments:
+    Nothing here imports PyQt5 so figures can be rendered in worker
+    processes and on machines without a display.
+
+    Extra catalog bodies (SolSystem catalog groups) are drawn with one
+    scatter for the positions and one line collection for the orbits per
+    group and system axis, so a group of thousands of bodies costs a single
+    vectorised position batch and two artists.
+
+    Three view modes share the same layout, legend and labels: '3d' uses
+    mplot3d axes, while 'projected' (the same fixed camera as '3d') and
+    'topdown' (looking down the z axis) project orbits and positions onto
+    plain 2D axes with a single matrix multiply, avoiding mplot3d's
+    per-artist projection and depth sorting on every draw.
+
+"""
+
+## Imports
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mpl_toolkits.mplot3d import Axes3D, proj3d, art3d
+
+import io
+import os
+import hashlib
+import itertools
+import numpy as np
+import datetime as dt
+
+# Available view modes and the camera (elevation, azimuth in degrees) used
+# by '3d'/'projected' and by 'topdown'
+VIEW_MODES = ('3d', 'projected', 'topdown')
+VIEW_ANGLES = (25, 10)
+TOPDOWN_ANGLES = (90, -90)
+
+# Vertical squash of mplot3d's default (4, 4, 3) box aspect, applied by the
+# 'projected' camera so it matches the '3d' view
+BOX_Z_ASPECT = 0.75
+
+
+# Digest of this module's source, part of every render cache key so cached
+# figures never outlive a change to the drawing code
+_sourceHash = None
+
+
+# Method for the digest of this module's source (computed once)
+def sourceHash():
+    global _sourceHash
+    if _sourceHash is None:
+        with open(__file__, 'rb') as f:
+            _sourceHash = hashlib.sha1(f.read()).hexdigest()
+    return _sourceHash
+
+
+# Method for the image format of a file name (png for file objects)
+def imageFormat(name):
+    ext = os.path.splitext(name)[1] if isinstance(name, str) else ''
+    return ext[1:].lower() or 'png'
+
+
+# Method for writing image bytes to a file name or writable file object
+def writeImage(name, data):
+    if hasattr(name, 'write'):
+        name.write(data)
+    else:
+        with open(name, 'wb') as f:
+            f.write(data)
+
+
+# Method for validating a view mode name
+def checkViewMode(viewMode):
+    if viewMode not in VIEW_MODES:
+        raise ValueError("Unknown view mode '{0}', expected one of "
+                         "{1}".format(viewMode, ', '.join(VIEW_MODES)))
+    return viewMode
+
+
+# Mixin holding the figure decoration and plotting methods. Classes using
+# it must provide self.figure attached to a canvas.
+class SolPlotMixin(object):
+    # Persistent artists (created by planetPositions) and blitting state
+    planetMarkers = None
+    groupMarkers = None
+    blitting = False
+    _background = None
+
+    # Orbit lines (created by planetOrbit) and the largest deviation of a
+    # drawn orbit from the true orbit, in output pixels
+    orbitLines = None
+    orbitPixelTolerance = 0.25
+
+    # One of VIEW_MODES, applied by decorateAxes
+    viewMode = '3d'
+
+    # Date whose positions are drawn (set by planetPositions)
+    plottedDate = None
+
+    # Set Up plotting canvas
+    def decorateAxes(self):
+        # Set figure canvas to black
+        self.figure.set_facecolor('black')
+
+        # Style axis for inner solar system bodies
+        self.innerSystem = self.__systemAxes(111, xlim=(-0.75,1),
+                                             ylim=(-0.75,1.5), zlim=(-1,1))
+        self.innerSystem.patch.set_facecolor('Black')
+
+        # Style axis for outer solar system bodies
+        self.outerSystem = self.__systemAxes(326, xlim=(-12,30),
+                                             ylim=(-26,18), zlim=(-40,40))
+        self.outerSystem.patch.set_facecolor('None')
+
+        # Reduce margins between axes
+        self.figure.tight_layout()
+
+        # Style axis for planet legend
+        self.scaleLegend = self.figure.add_axes((0,0.92,1,0.08))
+        self.scaleLegend.set_ylim(0,1)
+        self.scaleLegend.patch.set_facecolor('None')
+        self.scaleLegend.set_axis_off()
+
+    # Private method creating a 3D axis, or for the 2D modes a plain axis
+    # framing the projection of the same equal aspect box
+    def __systemAxes(self, position, xlim, ylim, zlim):
+        if self.viewMode == '3d':
+            ax = self.figure.add_subplot(position, projection='3d')
+            self.plot3dEqualAspect(ax, xlim=xlim, ylim=ylim, zlim=zlim)
+            ax.view_init(*VIEW_ANGLES)
+        else:
+            ax = self.figure.add_subplot(position)
+            lo, hi = np.min([xlim, ylim, zlim]), np.max([xlim, ylim, zlim])
+            if self.viewMode == 'topdown':
+                # Centred on the Sun with room for the outermost orbit
+                r = 1.05 * max(abs(lo), abs(hi))
+                ax.set_xlim(-r, r)
+                ax.set_ylim(-r, r)
+            else:
+                corners = self.project(list(itertools.product((lo, hi), repeat=3)))
+                ax.set_xlim(corners[:,0].min(), corners[:,0].max())
+                ax.set_ylim(corners[:,1].min(), corners[:,1].max())
+            ax.set_aspect('equal')
+        ax.set_axis_off()
+        return ax
+
+    # Method for the (2, 3) orthographic camera matrix of a 2D view mode
+    def viewMatrix(self):
+        if self.viewMode == 'topdown':
+            elev, azim = np.radians(TOPDOWN_ANGLES)
+            zScale = 1.
+        else:
+            elev, azim = np.radians(VIEW_ANGLES)
+            zScale = BOX_Z_ASPECT
+        return np.array([[-np.sin(azim), np.cos(azim), 0.],
+                         [-np.sin(elev) * np.cos(azim), -np.sin(elev) * np.sin(azim),
+                          zScale * np.cos(elev)]])
+
+    # Method for projecting (N, 3) positions to (N, 2) view coordinates
+    def project(self, xyz):
+        return np.asarray(xyz, dtype=np.float64).reshape(-1, 3) @ self.viewMatrix().T
+
+    # Private helpers drawing and updating artists from 3D positions in
+    # either kind of axis
+    def __plot(self, ax, xyz, *args, **kwargs):
+        if self.viewMode == '3d':
+            return ax.plot(xyz[:,0], xyz[:,1], xyz[:,2], *args, **kwargs)
+        xy = self.project(xyz)
+        return ax.plot(xy[:,0], xy[:,1], *args, **kwargs)
+
+    def __scatter(self, ax, xyz, c, s, label=None):
+        if self.viewMode == '3d':
+            return ax.scatter(xyz[0], xyz[1], xyz[2], c=c, s=s, label=label)
+        xy = self.project(xyz)[0]
+        return self.__marker(ax, xy[0], xy[1], c, s, label)
+
+    # Single point markers on 2D axes. The 2D modes use a Line2D marker
+    # (size sqrt(s) points), far cheaper to draw than a one point scatter.
+    def __marker(self, ax, x, y, c, s, label=None):
+        if self.viewMode == '3d':
+            return ax.scatter(x, y, c=c, s=s, label=label)
+        return ax.plot([x], [y], 'o', c=c, ms=np.sqrt(s), label=label)[0]
+
+    @staticmethod
+    def __moveMarker(marker, x, y):
+        if hasattr(marker, 'set_offsets'):
+            marker.set_offsets([[x, y]])
+        else:
+            marker.set_data([x], [y])
+
+    def __text(self, ax, xyz, text, **kwargs):
+        if self.viewMode == '3d':
+            return ax.text(xyz[0], xyz[1], xyz[2], text, **kwargs)
+        xy = self.project(xyz)[0]
+        return ax.text(xy[0], xy[1], text, **kwargs)
+
+    def __setLine(self, line, xyz):
+        if self.viewMode == '3d':
+            line.set_data_3d(xyz[:,0], xyz[:,1], xyz[:,2])
+        else:
+            xy = self.project(xyz)
+            line.set_data(xy[:,0], xy[:,1])
+
+    # Method for plotting Planet orbits. Each orbit uses the coarsest level
+    # of detail that stays within orbitPixelTolerance at the figure DPI.
+    def planetOrbit(self, SolarSystem):
+        self.orbitLines = {}
+        self._orbitSystem = SolarSystem
+        for bodyLab, body in SolarSystem.bodies.items():
+            ax = self.__axis(SolarSystem, bodyLab)
+
+            track = body.orbitTrack(self.orbitPixelTolerance * self.auPerPixel(ax))
+            self.orbitLines[bodyLab], = self.__plot(ax, track, '--', lw=1,
+                                                    c=body.plotSymbolColor)
+
+        # One line collection per catalog group and axis
+        catalog = SolarSystem.catalog
+        for group, axis, index in self.__catalogGroups(SolarSystem):
+            tracks = SolarSystem.groupTracks(group)[index]
+            colors = catalog.colors[catalog.select(group)[index]]
+            if self.viewMode == '3d':
+                lines = art3d.Line3DCollection(tracks, colors=colors, lw=0.5, alpha=0.4)
+            else:
+                lines = LineCollection(self.project(tracks).reshape(len(index), -1, 2),
+                                       colors=colors, lw=0.5, alpha=0.4)
+            getattr(self, axis + 'System').add_collection(lines, autolim=False)
+
+    # Private method for the system axis a body is drawn on
+    def __axis(self, SolarSystem, bodyLab):
+        return self.innerSystem if SolarSystem.axisOf(bodyLab) == 'inner' else self.outerSystem
+
+    # Private method listing (group, axis, rows within the group) for the
+    # catalog groups of SolarSystem
+    @staticmethod
+    def __catalogGroups(SolarSystem):
+        catalog = SolarSystem.catalog
+        for group in SolarSystem.catalogGroups():
+            axes = catalog.axes[catalog.select(group)]
+            for axis in ('inner', 'outer'):
+                index = np.flatnonzero(axes == axis)
+                if index.size:
+                    yield group, axis, index
+
+    # Method for re-selecting the orbit level of detail for output at dpi
+    # (default: the figure DPI)
+    def setOrbitDetail(self, dpi=None):
+        if self.orbitLines is None:
+            return
+        for bodyLab, line in self.orbitLines.items():
+            body = self._orbitSystem.bodies[bodyLab]
+            track = body.orbitTrack(self.orbitPixelTolerance *
+                                    self.auPerPixel(line.axes, dpi))
+            self.__setLine(line, track)
+
+    # Method for the size (AU) of one output pixel on a system axis: the
+    # smallest data step per pixel along x, y or z at the axis centre
+    def auPerPixel(self, ax, dpi=None):
+        dpi = dpi or self.figure.dpi
+        if self.viewMode == '3d':
+            centre = [np.mean(getattr(ax, 'get_{}lim3d'.format(dim))()) for dim in 'xyz']
+            pts = np.array(centre) + np.vstack((np.zeros(3), np.eye(3)))
+            xs, ys, _ = proj3d.proj_transform(pts[:,0], pts[:,1], pts[:,2], ax.get_proj())
+            xy = np.column_stack((xs, ys))
+        else:
+            xy = self.project(np.vstack((np.zeros(3), np.eye(3))))
+        pix = ax.transData.transform(xy) * dpi / self.figure.dpi
+        return 1. / np.max(np.linalg.norm(pix[1:] - pix[0], axis=1))
+
+    # Labels of the bodies drawn as planets (the Sun is drawn separately)
+    @staticmethod
+    def plottedBodies(SolarSystem):
+        return [lab for lab in SolarSystem.bodies if lab != 'SUN']
+
+    # Method for plotting planet's positions at some selected date. Artists
+    # are created on the first call after resetFigure, later calls only
+    # update their data. `ephemeris` may be passed in pre-computed (an
+    # SolSystem.getPositions result for plottedBodies), otherwise it is
+    # computed here in one batched call.
+    def planetPositions(self, SolarSystem, date, ephemeris=None):
+        labels = self.plottedBodies(SolarSystem)
+        if ephemeris is None:
+            ephemeris = SolarSystem.getPositions(date, bodies=labels,
+                                                 frame='HCI',
+                                                 obs='SOLAR SYSTEM BARYCENTER')
+        pos = ephemeris['posInAU'][:,0]
+        if self.viewMode != '3d':
+            # One matrix multiply places every planet
+            xy = self.project(pos)
+        logDist = np.log10(ephemeris['solDistanceInAU'][:,0])
+
+        # Every catalog group in one batch per group
+        groupPos = {group: SolarSystem.groupPositions(date, group,
+                                                      frame='HCI',
+                                                      obs='SOLAR SYSTEM BARYCENTER')[:,0]
+                    for group in SolarSystem.catalogGroups()}
+
+        if self.planetMarkers is None:
+            self.__createArtists(SolarSystem, labels, pos, logDist, groupPos)
+        else:
+            for (group, axis), marker in self.groupMarkers.items():
+                self.__moveCollection(marker, groupPos[group][self._groupRows[group, axis]])
+            for i, bodyLab in enumerate(labels):
+                # Update position of planet and its legend symbol/label
+                if self.viewMode == '3d':
+                    self.planetMarkers[bodyLab]._offsets3d = ([pos[i,0]], [pos[i,1]], [pos[i,2]])
+                else:
+                    self.__moveMarker(self.planetMarkers[bodyLab], xy[i,0], xy[i,1])
+                self.__moveMarker(self.legendMarkers[bodyLab], logDist[i], 0.5)
+                self.legendLabels[bodyLab].set_x(logDist[i])
+
+        # Log-distance legend limits, leaving room for the Sun on the left
+        xmin, xmax, sunX = self.__legendLimits(logDist)
+        self.scaleLegend.set_xlim(xmin, xmax)
+        self.__moveMarker(self.legendSun, sunX, 0.5)
+
+        # Update text describing the date
+        dateString = dt.datetime.strptime(date, '%Y-%m-%d').strftime('%a %B %d %Y')
+        self.dateText.set_text('The Solar System on:\n{0}'.format(dateString))
+        self.plottedDate = date
+
+        # Update the figure
+        self.updateCanvas()
+
+    # Private method moving a scatter collection to (N, 3) positions
+    def __moveCollection(self, marker, xyz):
+        if self.viewMode == '3d':
+            marker._offsets3d = (xyz[:,0], xyz[:,1], xyz[:,2])
+        else:
+            marker.set_offsets(self.project(xyz))
+
+    # Private method creating the persistent artists for planet positions,
+    # catalog groups, legend symbols, labels and date text
+    def __createArtists(self, SolarSystem, labels, pos, logDist, groupPos):
+        sun = SolarSystem.sun
+        self.planetMarkers, self.legendMarkers, self.legendLabels = {}, {}, {}
+
+        # One scatter per catalog group and axis, with the rows within the
+        # group it shows. A single size (and colour, when the group shares
+        # one) lets Agg stamp every point with one cached marker.
+        catalog, self.groupMarkers, self._groupRows = SolarSystem.catalog, {}, {}
+        for group, axis, index in self.__catalogGroups(SolarSystem):
+            rows = catalog.select(group)[index]
+            colors = catalog.colors[rows]
+            c = colors[0] if np.all(colors == colors[0]) else colors
+            radius = np.nanmedian(catalog.radiusKm[rows]) if np.any(catalog.radiusKm[rows] > 0) else 1.
+            s = 3. * np.clip(np.log10(radius), 0.3, 3.)
+            xyz = groupPos[group][index]
+            ax = getattr(self, axis + 'System')
+            if self.viewMode == '3d':
+                marker = ax.scatter(xyz[:,0], xyz[:,1], xyz[:,2], c=c, s=s,
+                                    depthshade=False, label=group)
+            else:
+                xy = self.project(xyz)
+                marker = ax.scatter(xy[:,0], xy[:,1], c=c, s=s, label=group)
+            self.groupMarkers[group, axis] = marker
+            self._groupRows[group, axis] = index
+
+        # To scale Sun for inner system
+        self.__scatter(self.innerSystem, np.zeros(3), c=sun.plotSymbolColor,
+                       s=SolarSystem.scaledPlotSymbol['SUN'],
+                       label=sun.customLabel)
+
+        # Add label for Sun to inner solar system axis
+        self.__text(self.innerSystem, np.full(3, 0.08), 'The Sun (Sol)',
+                    color=sun.plotSymbolColor,
+                    fontweight='heavy')
+
+        # Smaller Sun for outer solar system
+        self.__scatter(self.outerSystem, np.zeros(3), c=sun.plotSymbolColor,
+                       s=SolarSystem.scaledPlotSymbol['SUN']*0.25)
+
+        for i, bodyLab in enumerate(labels):
+            body = SolarSystem.bodies[bodyLab]
+
+            # Aside from selecting inner/outer system axis can treat
+            # plotting of planetary bodies the same
+            ax = self.__axis(SolarSystem, bodyLab)
+
+            # Plot position
+            self.planetMarkers[bodyLab] = self.__scatter(ax, pos[i],
+                                                         c=body.plotSymbolColor,
+                                                         s=SolarSystem.scaledPlotSymbol[bodyLab],
+                                                         label=body.customLabel)
+
+            # Add symbol to legend
+            self.legendMarkers[bodyLab] = self.__marker(
+                self.scaleLegend, logDist[i], 0.5, c=body.plotSymbolColor,
+                s=SolarSystem.scaledPlotSymbol[bodyLab]*0.5)
+
+            # Add label to go with legend symbol for planets
+            self.legendLabels[bodyLab] = self.scaleLegend.text(
+                logDist[i], 0.05, body.customLabel, color=body.plotSymbolColor,
+                fontweight='heavy', ha='center', va='center', rotation=40)
+
+        # Symbol for the Sun, placed once the legend limits are known
+        self.legendSun = self.__marker(self.scaleLegend, 0, 0.5, c=sun.plotSymbolColor,
+                                       s=SolarSystem.scaledPlotSymbol['SUN'])
+        self.scaleLegend.set_autoscalex_on(False)
+
+        # Add text to plot describing the date
+        self.dateText = self.figure.text(0.05,0.05, '', color='w',
+                                         fontsize=25, fontweight='heavy',ha='left')
+
+        # Artists redrawn on every date change are excluded from the
+        # cached background when blitting
+        for artist in self.dynamicArtists():
+            artist.set_animated(self.blitting)
+
+    # Method listing the artists that change with date
+    def dynamicArtists(self):
+        if self.planetMarkers is None:
+            return []
+        return (list(self.planetMarkers.values()) +
+                list(self.groupMarkers.values()) +
+                list(self.legendMarkers.values()) +
+                list(self.legendLabels.values()) +
+                [self.legendSun, self.dateText])
+
+    # Private method reproducing the legend axis autoscaling: 5% margins
+    # around the planets, with the Sun at the resulting left edge and then
+    # 5% margins again. Returns (xmin, xmax, sunX).
+    @staticmethod
+    def __legendLimits(logDist):
+        lo, hi = np.min(logDist), np.max(logDist)
+        sunX = lo - 0.05 * ((hi - lo) or 1.)
+        span = hi - sunX
+        return sunX - 0.05 * span, hi + 0.05 * span, sunX
+
+    # Method for redrawing after the positions change. When blitting only
+    # the dynamic artists are drawn over the cached static background
+    # (orbits, axes and the Sun).
+    def updateCanvas(self):
+        canvas = self.figure.canvas
+        if not self.blitting or self._background is None:
+            # Full draw, the draw_event handler recaptures the background
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self.__drawDynamic()
+            canvas.blit(self.figure.bbox)
+
+    # Method to start caching the static background on every full draw
+    def enableBlitting(self):
+        self.blitting = True
+        self.figure.canvas.mpl_connect('draw_event', self._onDraw)
+
+    # Handler for draw_event: store background, then draw dynamic artists
+    def _onDraw(self, event):
+        # Draws made by savefig (other DPI) must not replace the background
+        if not self.blitting or self.figure.canvas.is_saving():
+            return
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self.__drawDynamic()
+
+    # Private method drawing the dynamic artists onto the canvas
+    def __drawDynamic(self):
+        for artist in self.dynamicArtists():
+            if artist.axes is not None:
+                artist.axes.draw_artist(artist)
+            else:
+                self.figure.draw_artist(artist)
+
+    # Method for making an equal aspect ratio for 3D axes
+    @staticmethod
+    def plot3dEqualAspect(ax3D, xlim=(4,-4), ylim=(4,-4), zlim=(-4,4)):
+        ax3D.set_xlim(xlim)
+        ax3D.set_ylim(ylim)
+        ax3D.set_zlim(zlim)
+        scaling = np.array([getattr(ax3D, 'get_{}lim'.format(dim))()
+                            for dim in 'xyz'])
+        ax3D.auto_scale_xyz(*[[np.min(scaling), np.max(scaling)]]*3)
+
+    # Method to reset figure canvas to starting condition
+    def resetFigure(self, SolarSystem):
+        self.figure.clf()
+        self.planetMarkers = None
+        self.plottedDate = None
+        self.groupMarkers = None
+        self.orbitLines = None
+        self._background = None
+        self.decorateAxes()
+        self.planetOrbit(SolarSystem)
+
+    # Method for switching view mode, rebuilding the axes and orbits
+    def setViewMode(self, viewMode, SolarSystem):
+        self.viewMode = checkViewMode(viewMode)
+        self.resetFigure(SolarSystem)
+
+    # Method for saving figure. With a model.RenderCache (and the
+    # SolarSystem drawn) a figure saved before with the same settings is
+    # copied from the cache rather than rendered.
+    def saveFig(self, name, dpi=300, cache=None, SolarSystem=None, fmt=None):
+        fmt = fmt or imageFormat(name)
+        if cache is not None:
+            settings = self.renderSettings(SolarSystem, self.plottedDate, dpi, fmt)
+            data = cache.get(settings, fmt)
+            if data is None:
+                data = self.encodeFig(dpi, fmt)
+                cache.put(settings, data, fmt)
+            writeImage(name, data)
+            return
+
+        # Orbits detailed enough for the output resolution, then restored
+        self.setOrbitDetail(dpi)
+        try:
+            self.figure.savefig(name, dpi=dpi, format=fmt)
+        finally:
+            self.setOrbitDetail()
+
+    # Method for the figure encoded as image bytes
+    def encodeFig(self, dpi=300, fmt='png'):
+        buf = io.BytesIO()
+        self.saveFig(buf, dpi=dpi, fmt=fmt)
+        return buf.getvalue()
+
+    # Method for the settings that determine a saved figure, the key of a
+    # model.RenderCache entry: date, view mode and camera, output size,
+    # bodies, catalog and kernel set, and the plotting code itself
+    def renderSettings(self, SolarSystem, date, dpi, fmt='png'):
+        camera = []
+        for ax in (self.innerSystem, self.outerSystem):
+            view = ax.get_xlim() + ax.get_ylim()
+            if self.viewMode == '3d':
+                view += ax.get_zlim() + (ax.elev, ax.azim, ax.roll)
+            camera.append([float(v) for v in view])
+        return dict(date=None if date is None else str(date), viewMode=self.viewMode,
+                    dpi=float(dpi), format=fmt,
+                    figsize=self.figure.get_size_inches().tolist(),
+                    orbitPixelTolerance=self.orbitPixelTolerance, camera=camera,
+                    bodies=self.plottedBodies(SolarSystem),
+                    catalog=SolarSystem.catalog.fingerprint,
+                    kernels=SolarSystem.kernelHash, backend=SolarSystem.backendName,
+                    code=sourceHash(), matplotlib=matplotlib.__version__)
+
+
+# Figure canvas rendering off screen through Agg, no QApplication required
+class HeadlessCanvas(SolPlotMixin):
+
+    def __init__(self, figsize=(16, 9), viewMode='3d', blit=False):
+        # Create figure instance attached to an Agg canvas
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        self.viewMode = checkViewMode(viewMode)
+
+        # Set up basic axes
+        self.decorateAxes()
+
+        # Optionally redraw frames over a cached static background (orbits,
+        # catalog tracks, axes) as the GUI does, dynamic artists on top
+        if blit:
+            self.enableBlitting()
+
+    # Headless figures are only drawn when saved or rendered as frames
+    def updateCanvas(self):
+        if self.blitting:
+            super(HeadlessCanvas, self).updateCanvas()
+
+    # Method for rendering the positions on a date straight to file,
+    # orbits are only plotted for the first date. With a model.RenderCache
+    # a date rendered before with the same settings is only copied out of
+    # the cache. Returns whether the image came from the cache.
+    def render(self, SolarSystem, date, name, dpi=300, cache=None):
+        if cache is not None:
+            fmt = imageFormat(name)
+            settings = self.renderSettings(SolarSystem, date, dpi, fmt)
+            data = cache.get(settings, fmt)
+            if data is not None:
+                writeImage(name, data)
+                return True
+
+        if self.planetMarkers is None:
+            self.resetFigure(SolarSystem)
+        self.planetPositions(SolarSystem, date)
+        if cache is None:
+            self.saveFig(name, dpi=dpi)
+        else:
+            data = self.encodeFig(dpi, fmt)
+            cache.put(settings, data, fmt)
+            writeImage(name, data)
+        return False
+
+    # Method for drawing the positions on a date and returning the frame as
+    # raw RGBA bytes (used for animation export)
+    def renderFrame(self, SolarSystem, date, ephemeris=None):
+        if self.planetMarkers is None:
+            self.resetFigure(SolarSystem)
+        self.planetPositions(SolarSystem, date, ephemeris=ephemeris)
+        if not self.blitting:
+            self.figure.canvas.draw()
+        return bytes(self.figure.canvas.buffer_rgba())
@@ -0,0 +1,520 @@
+#! /usr/bin/env python
+"""
+SolService
+
+Purpose: Local HTTP/JSON ephemeris service for SolBirthday. Serves body
+         positions and rendered PNGs for many concurrent clients (e.g. a
+         web page where lots of users submit birth dates at once).
+
+Usage:
+    python ./SolService.py --port 8765 --processes 4
+    python ./SolService.py --synthetic /tmp/synth     # no DE431 needed
+
+    curl 'http://127.0.0.1:8765/positions?date=1990-05-17'
+    curl 'http://127.0.0.1:8765/positions?dates=1990-05-17,2018-01-16&obs=SUN'
+    curl -d '{"dates": ["1990-05-17", "2018-01-16"]}' http://127.0.0.1:8765/positions
+    curl -o sol.png 'http://127.0.0.1:8765/render?date=1990-05-17&dpi=100'
+    curl -o top.png 'http://127.0.0.1:8765/render?date=1990-05-17&view=topdown'
+    curl 'http://127.0.0.1:8765/stats'
+    python ./SolService.py --render-cache               # reuse popular renders
+
+Comments:
+    CSPICE is global and single threaded, so the work is done by a pool of
+    worker processes (started with 'spawn'), each building its SolSystem
+    and loading the kernels once in the pool initialiser. The asyncio
+    front end only parses requests and moves results around.
+
+    Position requests arriving within `batchWindow` seconds of each other
+    (and sharing frame/observer) are coalesced into a single
+    SolSystem.getPositions call on one worker, so a burst of N users costs
+    one batched ephemeris query rather than N. /stats reports latency
+    histograms per endpoint, batch sizes and the current queue depth
+    (requests waiting to be batched plus jobs queued or running in the
+    pool).
+
+    With --render-cache the workers share a model.RenderCache directory
+    (plus an in-memory tier each), so a /render already produced with the
+    same date, view, DPI and kernels costs a file read; /stats reports the
+    cache hit rate.
+
+    Dates must be ISO (YYYY-MM-DD) within Pyprika.KERNEL_SPAN, and frames
+    and observers must be known to SPICE (checked against the kernels,
+    which the front end also loads). Malformed requests (request line,
+    headers, JSON body or fields) are answered with 400 and an error
+    message; a failure in a worker is answered with 500.
+
+"""
+
+## Imports
+import io
+import sys
+import json
+import time
+import bisect
+import asyncio
+import argparse
+import datetime as dt
+import multiprocessing as mp
+from urllib.parse import urlsplit, parse_qs
+
+from model import Pyprika
+from model import WorkerPool
+
+# Per-process state built once by the pool initialiser
+_worker = {}
+
+# Largest request body accepted (bytes) and the DPI range of /render
+MAX_BODY_BYTES = 1 << 20
+DPI_RANGE = (10, 600)
+
+
+class BadRequest(ValueError):
+    """Malformed HTTP request or invalid field, answered with 400"""
+
+
+# Pool initialiser: load kernels and build the solar system for this worker
+def _initWorker(mkFile, backend, renderCache=None):
+    from model.SolSystem import SolSystem
+    from model.RenderCache import RenderCache
+
+    _worker['sol'] = SolSystem(mkFile, backend=backend)
+    _worker['renderCache'] = None if renderCache is None else RenderCache(*renderCache)
+
+
+# Positions of every body on each date, one batched call for all of them
+def _positionsJob(dates, frame, obs):
+    sol = _worker['sol']
+    labels = list(sol.bodies)
+    eph = sol.getPositions(dates, bodies=labels, frame=frame, obs=obs)
+    return [dict(date=date, frame=frame, obs=obs,
+                 bodies={label: dict(posInAU=eph['posInAU'][i,j].tolist(),
+                                     solDistanceInAU=float(eph['solDistanceInAU'][i,j]))
+                         for i, label in enumerate(labels)})
+            for j, date in enumerate(dates)]
+
+
+# PNG of the solar system on a date and whether it came from the render
+# cache, one canvas per view mode built on first use
+def _renderJob(date, dpi, viewMode):
+    key = ('canvas', viewMode)
+    if key not in _worker:
+        from SolPlot import HeadlessCanvas
+        _worker[key] = HeadlessCanvas(viewMode=viewMode)
+    buf = io.BytesIO()
+    hit = _worker[key].render(_worker['sol'], date, buf, dpi=dpi,
+                              cache=_worker['renderCache'])
+    return buf.getvalue(), hit
+
+
+# Class accumulating a latency distribution in fixed log-spaced buckets
+class LatencyHistogram(object):
+    """Cumulative request latencies, quantiles estimated from the buckets"""
+    # Bucket upper bounds in seconds, the last bucket is unbounded
+    bounds = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+              1., 2., 5., 10.)
+
+    def __init__(self):
+        super(LatencyHistogram, self).__init__()
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.
+        self.maximum = 0.
+
+    # Method for recording one latency (seconds)
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    # Method for the upper bound of the bucket holding quantile q
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def snapshot(self):
+        ms = lambda s: None if s is None else round(1e3 * s, 3)
+        labels = ['<={0:g}ms'.format(1e3 * b) for b in self.bounds] + ['>10000ms']
+        return dict(count=self.count,
+                    meanMs=ms(self.total / self.count) if self.count else None,
+                    maxMs=ms(self.maximum), p50Ms=ms(self.quantile(0.5)),
+                    p95Ms=ms(self.quantile(0.95)), p99Ms=ms(self.quantile(0.99)),
+                    buckets=dict(zip(labels, self.counts)))
+
+
+# Class coalescing concurrent position requests into batched pool jobs
+class RequestBatcher(object):
+
+    def __init__(self, service, window=0.005, maxBatch=256):
+        super(RequestBatcher, self).__init__()
+        self.service = service
+        self.window = window
+        self.maxBatch = maxBatch
+        # (frame, obs) -> [(date, future), ...] waiting to be dispatched
+        self.pending = {}
+        self.batches = self.batched = self.largest = 0
+
+    # Number of requests waiting for their batch to be dispatched
+    @property
+    def depth(self):
+        return sum(len(b) for b in self.pending.values())
+
+    # Method for queueing one date, resolves to its positions dict
+    async def submit(self, date, frame, obs):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (frame, obs)
+        batch = self.pending.setdefault(key, [])
+        batch.append((date, future))
+        if len(batch) >= self.maxBatch:
+            self.flush(key)
+        elif len(batch) == 1:
+            loop.call_later(self.window, self.flush, key)
+        return await future
+
+    # Method for dispatching everything waiting under key as one job
+    def flush(self, key):
+        batch = self.pending.pop(key, None)
+        if batch:
+            asyncio.ensure_future(self.__run(key, batch))
+
+    async def __run(self, key, batch):
+        dates = sorted(set(date for date, future in batch))
+        self.batches += 1
+        self.batched += len(batch)
+        self.largest = max(self.largest, len(batch))
+        try:
+            results = await self.service.runJob(_positionsJob, dates, *key)
+        except Exception as e:
+            for date, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        byDate = dict(zip(dates, results))
+        for date, future in batch:
+            if not future.done():
+                future.set_result(byDate[date])
+
+
+# Class serving positions/renders over HTTP from a pool of SPICE workers
+class SolService(object):
+    """asyncio HTTP/JSON front end over a process pool of SolSystems"""
+    def __init__(self, mkFile=None, processes=None, backend=None,
+                 batchWindow=0.005, maxBatch=256, renderCache=None):
+        super(SolService, self).__init__()
+
+        # renderCache: (cacheDir, maxBytes) of the workers' RenderCache
+        self.mkFile = mkFile
+        self.renderCache = None if renderCache is None else tuple(renderCache)
+        self.renderHits = self.renderMisses = 0
+        self.processes = processes or mp.cpu_count()
+        self.backend = backend
+        self.batcher = RequestBatcher(self, window=batchWindow, maxBatch=maxBatch)
+        self.latency = {}
+        self.jobsInFlight = 0
+        self.started = None
+        self.pool = None
+        self.server = None
+        self.kernels = None
+
+    # Method for starting the worker pool and listening on host:port.
+    # Returns the bound port (useful with port=0).
+    async def start(self, host='127.0.0.1', port=8765):
+        # Pool workers are all started (and their kernels loaded) up front,
+        # kernels that fail to load stop start-up (see model.WorkerPool)
+        self.pool = WorkerPool.spawnPool(self.processes, _initWorker,
+                                         (self.mkFile, self.backend, self.renderCache),
+                                         mkFile=self.mkFile, backend=self.backend)
+        try:
+            # The same kernels here, to check request frames and observers
+            self.kernels = Pyprika.kernelsFor(self.mkFile or Pyprika.DEFAULT_MK,
+                                              self.backend)
+            Pyprika.KernelPool.acquire(self.kernels)
+            await asyncio.gather(*[self.runJob(time.sleep, 0.)
+                                   for i in range(self.processes)])
+        except Exception:
+            await self.close()
+            raise
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.started = time.time()
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+        if self.kernels is not None:
+            Pyprika.KernelPool.release(self.kernels)
+            self.kernels = None
+
+    # Method for running func(*args) in the pool without blocking the loop
+    async def runJob(self, func, *args):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(setter, value):
+            if not future.done():
+                setter(value)
+
+        self.jobsInFlight += 1
+        self.pool.apply_async(
+            WorkerPool.guarded(func), args,
+            callback=lambda r: loop.call_soon_threadsafe(resolve, future.set_result, r),
+            error_callback=lambda e: loop.call_soon_threadsafe(resolve, future.set_exception, e))
+        try:
+            return await future
+        finally:
+            self.jobsInFlight -= 1
+
+    # Method for the service statistics served on /stats
+    def stats(self):
+        renders = self.renderHits + self.renderMisses
+        return dict(uptimeSeconds=time.time() - self.started if self.started else 0.,
+                    processes=self.processes,
+                    queueDepth=dict(batching=self.batcher.depth,
+                                    jobs=self.jobsInFlight),
+                    latency={path: h.snapshot() for path, h in self.latency.items()},
+                    batches=dict(count=self.batcher.batches,
+                                 meanSize=(self.batcher.batched / self.batcher.batches
+                                           if self.batcher.batches else None),
+                                 maxSize=self.batcher.largest),
+                    renderCache=dict(enabled=self.renderCache is not None,
+                                     hits=self.renderHits, misses=self.renderMisses,
+                                     hitRate=(self.renderHits / renders if renders else None)))
+
+    # Connection handler: HTTP/1.1 with keep-alive
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.__readRequest(reader)
+                except BadRequest as e:
+                    # The stream position is unknown, so close after answering
+                    await self.__respond(writer, *self.__json(dict(error=str(e)),
+                                                              '400 Bad Request'),
+                                         keepAlive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+
+                t0 = time.perf_counter()
+                status, contentType, payload = await self.dispatch(method, target, body)
+                path = urlsplit(target).path
+                self.latency.setdefault(path if status != 404 else 'other',
+                                        LatencyHistogram()).observe(time.perf_counter() - t0)
+
+                keepAlive = headers.get('connection', '').lower() != 'close'
+                await self.__respond(writer, status, contentType, payload, keepAlive)
+                if not keepAlive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # Private method writing one response
+    @staticmethod
+    async def __respond(writer, status, contentType, payload, keepAlive=True):
+        writer.write('HTTP/1.1 {0}\r\nContent-Type: {1}\r\n'
+                     'Content-Length: {2}\r\nConnection: {3}\r\n\r\n'.format(
+                         status, contentType, len(payload),
+                         'keep-alive' if keepAlive else 'close').encode('latin-1'))
+        writer.write(payload)
+        await writer.drain()
+
+    # Private method parsing one request, None at end of stream. Raises
+    # BadRequest for a malformed request line, header or body length.
+    @staticmethod
+    async def __readRequest(reader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise BadRequest('malformed request line')
+        method, target = parts[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, colon, value = line.decode('latin-1').partition(':')
+            if not colon or not name.strip():
+                raise BadRequest('malformed header line')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise BadRequest('invalid Content-Length')
+        if not 0 <= length <= MAX_BODY_BYTES:
+            raise BadRequest('Content-Length must be 0 to {0}'.format(MAX_BODY_BYTES))
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+    # Method for routing a request, returns (status, content type, bytes)
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == '/positions':
+                if method == 'POST':
+                    try:
+                        fields = json.loads(body.decode('utf-8') or '{}')
+                    except ValueError as e:
+                        raise BadRequest('invalid JSON body: {0}'.format(e))
+                    if not isinstance(fields, dict):
+                        raise BadRequest('request body must be a JSON object')
+                    query.update(fields)
+                dates = query.get('dates') or [query.get('date')]
+                if isinstance(dates, str):
+                    dates = dates.split(',')
+                if not isinstance(dates, list):
+                    raise BadRequest('dates must be a list or a comma separated string')
+                dates = [self.checkDate(d) for d in dates]
+                frame = self.checkFrame(self.checkText(query, 'frame', 'HCI'))
+                obs = self.checkObserver(self.checkText(query, 'obs',
+                                                        'SOLAR SYSTEM BARYCENTER'))
+                results = await asyncio.gather(*[self.batcher.submit(d, frame, obs)
+                                                 for d in dates])
+                return self.__json(results if 'dates' in query else results[0])
+            elif url.path == '/render':
+                date = self.checkDate(query.get('date'))
+                try:
+                    dpi = int(query.get('dpi', 100))
+                except ValueError:
+                    raise BadRequest('dpi must be an integer')
+                if not DPI_RANGE[0] <= dpi <= DPI_RANGE[1]:
+                    raise BadRequest('dpi must be {0} to {1}'.format(*DPI_RANGE))
+                from SolPlot import checkViewMode
+                try:
+                    viewMode = checkViewMode(query.get('view', '3d'))
+                except ValueError as e:
+                    raise BadRequest(str(e))
+                png, hit = await self.runJob(_renderJob, date, dpi, viewMode)
+                if self.renderCache is not None:
+                    if hit:
+                        self.renderHits += 1
+                    else:
+                        self.renderMisses += 1
+                return '200 OK', 'image/png', png
+            elif url.path == '/stats':
+                return self.__json(self.stats())
+            return self.__json(dict(error='not found'), '404 Not Found')
+        except BadRequest as e:
+            return self.__json(dict(error=str(e)), '400 Bad Request')
+        except Exception as e:
+            # Anything else, including errors raised in a worker
+            return self.__json(dict(error=repr(e)), '500 Internal Server Error')
+
+    # Method for validating an ISO date against the kernel span
+    @staticmethod
+    def checkDate(date):
+        from model.Pyprika import KERNEL_SPAN
+        if date is None:
+            raise BadRequest('missing date')
+        if not isinstance(date, str):
+            raise BadRequest('date must be a string (YYYY-MM-DD), not {0}'.format(
+                json.dumps(date)))
+        try:
+            dt.datetime.strptime(date, '%Y-%m-%d')
+        except ValueError as e:
+            raise BadRequest(str(e))
+        if not KERNEL_SPAN[0] <= date <= KERNEL_SPAN[1]:
+            raise BadRequest('date {0} outside {1} to {2}'.format(date, *KERNEL_SPAN))
+        return date
+
+    # Method for a string field of a request, `default` if absent
+    @staticmethod
+    def checkText(query, name, default):
+        value = query.get(name, default)
+        if not isinstance(value, str):
+            raise BadRequest('{0} must be a string'.format(name))
+        return value
+
+    # Method for validating a frame name against the loaded kernels, and
+    # for the analytic backend against the frames it can evaluate without
+    # an SPK (see Analytic.AnalyticBackend.frameTransforms)
+    def checkFrame(self, frame):
+        if Pyprika.spice.namfrm(frame) == 0:
+            raise BadRequest("unknown frame '{0}'".format(frame))
+        if self.backend == 'analytic':
+            from model.Analytic import AnalyticBackend
+            try:
+                AnalyticBackend().frameTransforms('J2000', frame, [0.])
+            except ValueError as e:
+                raise BadRequest(str(e))
+        return frame
+
+    # Method for validating an observer name against the loaded kernels,
+    # by name as Planet.naifID looks it up in the workers
+    @staticmethod
+    def checkObserver(obs):
+        try:
+            Pyprika.spice.bodn2c(obs)
+        except Pyprika.spice.stypes.SpiceyError:
+            raise BadRequest("unknown observer '{0}'".format(obs))
+        return obs
+
+    @staticmethod
+    def __json(obj, status='200 OK'):
+        return status, 'application/json', json.dumps(obj).encode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local SolBirthday ephemeris service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--processes', '-j', type=int, default=None,
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--batch-window', type=float, default=0.005,
+                        help='seconds to wait for requests to coalesce (default 0.005)')
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--mk', default=None,
+                        help='SPICE metakernel (default ./assets/spice/metakernel.mk)')
+    parser.add_argument('--synthetic', metavar='DIR',
+                        help='generate and serve a synthetic kernel set in DIR')
+    parser.add_argument('--backend', default=None, choices=['spice', 'numpy', 'table', 'analytic'])
+    parser.add_argument('--render-cache', nargs='?', const='', default=None, metavar='DIR',
+                        help='reuse and store renders in a cache directory '
+                        '(default ~/.cache/SolBirthday/renders)')
+    parser.add_argument('--render-cache-mb', type=float, default=512,
+                        help='render cache size bound in MB (default 512)')
+    args = parser.parse_args(argv)
+
+    mkFile = args.mk
+    if args.synthetic:
+        from tests.SyntheticKernels import makeSyntheticKernels
+        mkFile = makeSyntheticKernels(args.synthetic)
+
+    async def serve():
+        service = SolService(mkFile, processes=args.processes, backend=args.backend,
+                             batchWindow=args.batch_window, maxBatch=args.max_batch,
+                             renderCache=(None if args.render_cache is None else
+                                          (args.render_cache or None,
+                                           int(args.render_cache_mb * (1 << 20)))))
+        port = await service.start(args.host, args.port)
+        print('Serving on http://{0}:{1} with {2} workers'.format(
+            args.host, port, service.processes))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#! /usr/bin/env python
+"""
+SolSubset
+
+Purpose: Shrink the metakernel's SPK to the bodies and dates a deployment
+         needs (model.SpkSubset), writing a smaller SPK plus a metakernel
+         for it and reporting the size and load time saved.
+
+Usage:
+    python ./SolSubset.py --start 1950-01-01 --end 2050-01-01
+    python ./SolSubset.py --bodies 1 2 3 4 5 6 7 8 9 10 --outdir ./assets/spice/subset
+    python ./SolBatch.py --mk ./assets/spice/subset/subset.mk ...
+
+"""
+
+## Imports
+import sys
+import argparse
+
+from model.SpkSubset import subsetMetakernel
+
+# Bodies plotted by SolSystem: the planetary barycentres and the Sun
+SOLSYSTEM_BODIES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+
+# Method for printing a subsetting report
+def report(r):
+    print('Wrote {0} and {1}'.format(r['spk'], r['metakernel']))
+    print('  bodies {0}, {1} of {2} segments'.format(r['bodies'], r['segments'],
+                                                    r['segmentsIn']))
+    print('  size {0:.2f} MB -> {1:.2f} MB ({2:.1%} of the original)'.format(
+        r['bytesIn'] / 1e6, r['bytesOut'] / 1e6, r['bytesOut'] / float(r['bytesIn'])))
+    print('  load + first lookups {0:.1f} ms -> {1:.1f} ms'.format(
+        r['loadSecondsIn'] * 1e3, r['loadSecondsOut'] * 1e3))
+    print('  max position difference {0:.3g} km'.format(r['maxDiffKm']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Subset the SPK kernels of a metakernel')
+    parser.add_argument('--mk', default='./assets/spice/metakernel.mk')
+    parser.add_argument('--outdir', default='./assets/spice/subset')
+    parser.add_argument('--name', default='subset', help='base name of the .bsp/.mk')
+    parser.add_argument('--bodies', type=int, nargs='+', default=SOLSYSTEM_BODIES,
+                        help='NAIF IDs to keep (default: SolSystem bodies)')
+    parser.add_argument('--all-bodies', action='store_true',
+                        help='keep every body, only trim the dates')
+    parser.add_argument('--start', default=None, help='first date (default: kernel start)')
+    parser.add_argument('--end', default=None, help='last date (default: kernel end)')
+    args = parser.parse_args(argv)
+
+    report(subsetMetakernel(args.mk, args.outdir, None if args.all_bodies else args.bodies,
+                            args.start, args.end, args.name))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
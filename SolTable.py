@@ -0,0 +1,75 @@
+#! /usr/bin/env python
+"""
+SolTable
+
+Purpose: Build step for the compact precomputed ephemeris table
+         (model.EphemerisTable) used by backend='table', and report its
+         worst-case error against SPICE.
+
+Usage:
+    python ./SolTable.py                              # build the default table
+    python ./SolTable.py --mk /tmp/synth/metakernel.mk  # table beside that mk
+    python ./SolTable.py --out sol.eph --samples-per-orbit 256
+    python ./SolTable.py --check ./assets/spice/solsystem.eph
+
+"""
+
+## Imports
+import os
+import sys
+import time
+import argparse
+
+from model.EphemerisTable import EphemerisTable, tableFor, SAMPLES_PER_ORBIT, \
+    MIN_STEP_DAYS, MAX_STEP_DAYS
+
+
+# Method for printing the per body cadence and error summary of a table
+def report(table, errors=None):
+    errors = errors or table.header['maxErrorKm']
+    print('{0}: frame {1}, observer {2}, {3} to {4}, {5:.1f} MB'.format(
+        table.path, table.frame, table.header['obs'], table.header['start'],
+        table.header['end'], os.path.getsize(table.path) / 1e6))
+    for body in table.header['bodies']:
+        print('  {0:<8s} step {1:7.2f} d  {2:7d} records  max error {3:10.3f} km'.format(
+            body['label'], body['step'] / 86400., body['n'], errors[body['label']]))
+    print('  worst case {0:.3f} km'.format(max(errors.values())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the precomputed ephemeris table')
+    parser.add_argument('--out', default=None,
+                        help='table file (default solsystem.eph beside the metakernel, '
+                        'where backend=table looks for it)')
+    parser.add_argument('--mk', default=None,
+                        help='SPICE metakernel (default ./assets/spice/metakernel.mk)')
+    parser.add_argument('--start', default=None, help='first date (default kernel span)')
+    parser.add_argument('--end', default=None, help='last date (default kernel span)')
+    parser.add_argument('--samples-per-orbit', type=int, default=SAMPLES_PER_ORBIT)
+    parser.add_argument('--min-step', type=float, default=MIN_STEP_DAYS,
+                        help='shortest cadence in days (default {0:g})'.format(MIN_STEP_DAYS))
+    parser.add_argument('--max-step', type=float, default=MAX_STEP_DAYS,
+                        help='longest cadence in days (default {0:g})'.format(MAX_STEP_DAYS))
+    parser.add_argument('--check', metavar='TABLE',
+                        help='re-measure the errors of an existing table against SPICE')
+    args = parser.parse_args(argv)
+
+    from model.SolSystem import SolSystem
+    sol = SolSystem(args.mk, useOrbitCache=False)
+
+    if args.check:
+        table = EphemerisTable.open(args.check)
+        from model.Pyprika import SpiceBackend
+        report(table, table.maxErrors(SpiceBackend()))
+        return
+
+    t0 = time.perf_counter()
+    table = EphemerisTable.build(args.out or tableFor(sol.mkFile), sol, start=args.start, end=args.end,
+                                 samplesPerOrbit=args.samples_per_orbit,
+                                 minStepDays=args.min_step, maxStepDays=args.max_step)
+    print('Built in {0:.2f} s'.format(time.perf_counter() - t0))
+    report(table)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
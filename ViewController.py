@@ -1,28 +1,37 @@
 #! /Users/benhall/anaconda/envs/py35/bin/python
 import sys
+import json
+import time
+import threading
 
 from PyQt5 import QtCore
-from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QMenu,
-                             QSizePolicy, QGridLayout, QWidget,
-                             QMessageBox, QPushButton, QCalendarWidget,
-                             QFileDialog)
+from PyQt5.QtWidgets import (QApplication, QGridLayout, QWidget,
+                             QPushButton, QCalendarWidget, QFileDialog,
+                             QComboBox)
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
-from model import Pyprika
-import numpy as np
+from collections import OrderedDict
 import datetime as dt
 
+# NOTE: the model (spiceypy and friends) is imported by EphemerisWorker in
+# its own thread so it stays off the path to the first window
+from SolPlot import SolPlotMixin, VIEW_MODES
+
+# Labels for the view mode selector, in VIEW_MODES order
+VIEW_LABELS = ('3D', '2D projected', 'Top-down')
+
 print('LOADING VIEW...')
 
 #class App(QMainWindow):
 class App(QWidget):
 
-    def __init__(self):
+    # Requests sent to the EphemerisWorker thread
+    positionsRequested = QtCore.pyqtSignal(str)
+
+    def __init__(self, profiler=None):
         super().__init__()
+        self.profiler = profiler
         self.title = 'Your Sol Birthday - Developed by @BeshBashBosh'
         self.left, self.top = 10, 10
         self.width, self.height = 1600, 900
@@ -30,6 +39,14 @@ class App(QWidget):
         # Initialise date to current date
         self.date = QtCore.QDate.currentDate().toString(QtCore.Qt.ISODate)
 
+        # Solar system and positions arrive from the worker thread
+        self.sol = None
+        self.ephemeris = {}
+        self.plottedDate = None
+        self.awaitingDate = None
+        self.renderCache = None
+        self.previewShown = False
+
         # Initialise the UI
         self.initUI()
         print('LOADED')
@@ -47,10 +64,18 @@ class App(QWidget):
         m = PlotCanvas(self)
         self.m = m
 
-        # Load solar system
-        print("PLOTTING ORBITS")
-        self.sol = SolSystem()
-        m.planetOrbit(self.sol)
+        # Load solar system in a background thread that owns all SPICE
+        # state, orbits are plotted once it is ready
+        print("LOADING SOLAR SYSTEM")
+        self.worker = EphemerisWorker(date=self.date)
+        self.workerThread = QtCore.QThread(self)
+        self.worker.moveToThread(self.workerThread)
+        self.workerThread.started.connect(self.worker.start)
+        self.worker.previewReady.connect(self.previewReady)
+        self.worker.solSystemReady.connect(self.solSystemReady)
+        self.worker.solSystemFailed.connect(self.solSystemFailed)
+        self.worker.positionsReady.connect(self.positionsReady)
+        self.positionsRequested.connect(self.worker.requestPositions)
 
         # Calendar selection
         cal = QCalendarWidget(self)
@@ -63,41 +88,255 @@ class App(QWidget):
         exitButton = QPushButton('Exit', self)
         saveButton = QPushButton('Save', self)
 
+        # View mode selector (3D, 2D projected or top-down)
+        viewBox = QComboBox(self)
+        viewBox.addItems(VIEW_LABELS)
+        viewBox.currentIndexChanged.connect(self.selectView)
+
         # (widget, rowNo, colNo, GridRowSpan, GridColSpan)
         grid.addWidget(m, 0, 0, 100, 90)
         grid.addWidget(cal, 0, 90, 60, 10)
         grid.addWidget(confirmButton, 60, 91, 3,3)
         grid.addWidget(saveButton, 60, 94, 3,3)
         grid.addWidget(exitButton, 60, 97, 3,3)
+        grid.addWidget(viewBox, 64, 91, 3,9)
 
         # Connect button to events
         confirmButton.clicked.connect(self.confirm)
         exitButton.clicked.connect(self.quit)
         saveButton.clicked.connect(self.save)
 
-        # Show UI
+        # Nothing to confirm until the solar system has loaded
+        confirmButton.setEnabled(False)
+        viewBox.setEnabled(False)
+        self.confirmButton = confirmButton
+        self.viewBox = viewBox
+
+        # Show UI, then start computing orbits
         self.show()
+        self.mark('window shown')
+        self.workerThread.start()
+
+    # Record a startup milestone when profiling
+    def mark(self, name):
+        if self.profiler:
+            self.profiler.mark(name)
+
+    # Draw the analytic preview (orbits and the selected date) while the
+    # precise kernels load
+    def previewReady(self, preview, date, ephemeris):
+        if self.sol is not None:
+            return
+        self.m.planetOrbit(preview)
+        self.m.planetPositions(preview, date, ephemeris=ephemeris)
+        self.previewShown = True
+        self.mark('preview shown')
+
+    def solSystemReady(self, sol):
+        print("PLOTTING ORBITS")
+        self.sol = sol
+        if self.previewShown:
+            # Replace the preview, redrawing its date from the precise model
+            self.m.resetFigure(self.sol)
+            self.awaitingDate = self.date
+        else:
+            self.m.planetOrbit(self.sol)
+        self.m.draw()
+        self.confirmButton.setEnabled(True)
+        self.viewBox.setEnabled(True)
+
+        if self.profiler:
+            self.profiler.durations.update(self.worker.timings)
+            # Report once the event loop has painted the orbits
+            QtCore.QTimer.singleShot(0, self.reportStartup)
+
+        # Start computing positions for the selected date straight away
+        self.positionsRequested.emit(self.date)
+
+    # The precise kernels failed to load: keep the analytic preview (if
+    # any) on screen and say why the controls stay disabled
+    def solSystemFailed(self, message):
+        print("PRECISE KERNELS UNAVAILABLE: {0}".format(message))
+        self.setWindowTitle('{0} - {1}'.format(
+            self.title, 'analytic preview only, precise kernels unavailable'
+            if self.previewShown else 'SPICE kernels unavailable'))
+        self.mark('load failed')
+        if self.profiler:
+            QtCore.QTimer.singleShot(0, self.reportStartup)
+
+    def positionsReady(self, date, ephemeris):
+        self.ephemeris = {date: ephemeris}
+        if date == self.awaitingDate:
+            self.awaitingDate = None
+            self.plottedDate = date
+            self.m.planetPositions(self.sol, date, ephemeris=ephemeris)
 
     def confirm(self):
         print("Plotting position of planets on the date: {0}".format(self.date))
-        self.m.resetFigure(self.sol)
-        self.m.planetPositions(self.sol, self.date)
+        if self.date in self.ephemeris:
+            self.plottedDate = self.date
+            self.m.planetPositions(self.sol, self.date,
+                                   ephemeris=self.ephemeris[self.date])
+        else:
+            # Plotted when the worker delivers the positions
+            self.awaitingDate = self.date
+            self.positionsRequested.emit(self.date)
+
+    # Switch the canvas view mode, redrawing the plotted date if any
+    def selectView(self, index):
+        self.m.setViewMode(VIEW_MODES[index], self.sol)
+        if self.plottedDate in self.ephemeris:
+            self.m.planetPositions(self.sol, self.plottedDate,
+                                   ephemeris=self.ephemeris[self.plottedDate])
+        else:
+            self.m.draw()
+
+    def reportStartup(self):
+        self.mark('first paint')
+        self.profiler.report()
+        self.quit()
 
     def save(self):
         name, ext = QFileDialog.getSaveFileName(self, 'Save File',
                                            filter=self.tr('.png'))
         fn = name + ext
-        self.m.saveFig(fn)
+        if self.sol is None:
+            self.m.saveFig(fn)
+        else:
+            # Saving the same date and view again copies the cached image
+            if self.renderCache is None:
+                from model.RenderCache import RenderCache
+                self.renderCache = RenderCache()
+            self.m.saveFig(fn, cache=self.renderCache, SolarSystem=self.sol)
         print('File saved as: {0}'.format(fn))
 
     def quit(self):
-         sys.exit()
+        self.workerThread.quit()
+        self.workerThread.wait()
+        sys.exit()
 
     def selectDate(self, date):
         self.date = date.toString(QtCore.Qt.ISODate)
 
-# Class describing the figure canvas widget
-class PlotCanvas(FigureCanvas):
+        # Get the worker going on the new date before Confirm is pressed
+        if self.sol is not None:
+            self.positionsRequested.emit(self.date)
+
+# Worker object living in a QThread. It builds the SolSystem and serves
+# position requests, so all SPICE calls happen off the GUI thread. After
+# each request the days either side are prefetched into a bounded cache.
+class EphemerisWorker(QtCore.QObject):
+
+    previewReady = QtCore.pyqtSignal(object, str, object)
+    solSystemReady = QtCore.pyqtSignal(object)
+    solSystemFailed = QtCore.pyqtSignal(str)
+    positionsReady = QtCore.pyqtSignal(str, object)
+
+    def __init__(self, mkFile=None, prefetchDays=3, cacheSize=256, date=None):
+        super().__init__()
+        self.mkFile = mkFile
+        self.date = date
+        self.prefetchDays = prefetchDays
+        self.cacheSize = cacheSize
+        self.sol = None
+        self.cache = OrderedDict()
+        self.timings = OrderedDict()
+        self.previewSeconds = 0.
+
+    # Build the solar system, including orbit tracks, in the worker thread,
+    # while the analytic preview is built in a thread of its own. SPICE
+    # calls are serialised between the two (model.SpiceLock). Errors are
+    # reported through solSystemFailed, an exception escaping a slot would
+    # abort the application.
+    def start(self):
+        t0 = time.perf_counter()
+        from model.SolSystem import SolSystem
+        from model.Pyprika import KernelPool
+        from model import SpiceLock
+        t1 = time.perf_counter()
+        with SpiceLock.serialised():
+            previewThread = None
+            if self.date is not None:
+                previewThread = threading.Thread(target=self.preview, name='AnalyticPreview',
+                                                 daemon=True)
+                previewThread.start()
+            failure = None
+            try:
+                sol = SolSystem(self.mkFile)
+                t2 = time.perf_counter()
+                self.labels = PlotCanvas.plottedBodies(sol)
+                # Kernel fingerprint (render cache key) computed here, off the GUI thread
+                sol.kernelHash
+                for body in sol.bodies.values():
+                    body.orbitLOD
+                t3 = time.perf_counter()
+            except Exception as err:
+                failure = str(err)
+
+            # The preview is finished (drawn or abandoned) before the GUI
+            # gets the precise model, and with it its own SPICE calls
+            if previewThread is not None:
+                previewThread.join()
+        if failure is not None:
+            self.solSystemFailed.emit(failure)
+            return
+        self.sol = sol
+
+        self.timings['model imports'] = t1 - t0
+        self.timings['analytic preview'] = self.previewSeconds
+        self.timings['kernel loading'] = sum(t['seconds'] for t in KernelPool.timings)
+        self.timings['SolSystem construction'] = t2 - t1
+        self.timings['orbit generation'] = t3 - t2
+        self.solSystemReady.emit(self.sol)
+
+    # Build a kernel-free analytic SolSystem (model.Analytic) and its
+    # positions on self.date, drawn until the precise one is ready. Runs
+    # in its own thread, a failure only costs the preview.
+    def preview(self):
+        t0 = time.perf_counter()
+        try:
+            from model.SolSystem import SolSystem
+            preview = SolSystem(self.mkFile, useOrbitCache=False, backend='analytic')
+            for body in preview.bodies.values():
+                body.orbitLOD
+            eph = preview.getPositions([self.date], bodies=PlotCanvas.plottedBodies(preview),
+                                       frame='HCI', obs='SOLAR SYSTEM BARYCENTER')
+        except Exception as err:
+            print('Analytic preview unavailable: {0}'.format(err))
+            return
+        finally:
+            self.previewSeconds = time.perf_counter() - t0
+        self.previewReady.emit(preview, self.date, eph)
+
+    def requestPositions(self, date):
+        if date not in self.cache:
+            self.compute([date])
+        self.cache.move_to_end(date)
+        self.positionsReady.emit(date, self.cache[date])
+
+        # Speculatively fill the cache with the neighbouring days
+        day = dt.datetime.strptime(date, '%Y-%m-%d')
+        neighbours = [(day + dt.timedelta(days=d)).strftime('%Y-%m-%d')
+                      for d in range(-self.prefetchDays, self.prefetchDays + 1)]
+        missing = [d for d in neighbours if d not in self.cache and
+                   '1850-01-01' <= d <= '2100-01-01']
+        if missing:
+            self.compute(missing)
+
+    # Compute positions for several dates in one batched call
+    def compute(self, dates):
+        eph = self.sol.getPositions(dates, bodies=self.labels, frame='HCI',
+                                    obs='SOLAR SYSTEM BARYCENTER')
+        for i, date in enumerate(dates):
+            self.cache[date] = eph[:,i:i+1].copy()
+
+        # Bounded LRU eviction
+        while len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+
+# Class describing the figure canvas widget, drawing logic is shared with
+# the headless renderer through SolPlot.SolPlotMixin
+class PlotCanvas(FigureCanvas, SolPlotMixin):
 
     def __init__(self, parent=None):
         # Create figure instance
@@ -107,259 +346,40 @@ class PlotCanvas(FigureCanvas):
         # Set parent widget
         self.setParent(parent)
 
-        # Set up basic axes
-        self.decorateAxes()
-
-    # Set Up plotting canvas
-    def decorateAxes(self):
-        # Set figure canvas to black
-        self.figure.set_facecolor('black')
-
-        # Style axis for inner solar system bodies
-        self.innerSystem = self.figure.add_subplot(111, projection='3d')
-        self.plot3dEqualAspect(self.innerSystem, xlim=(-0.75,1),
-                               ylim=(-0.75,1.5), zlim=(-1,1))
-        self.innerSystem.view_init(25, 10)
-        self.innerSystem.patch.set_facecolor('Black')
-        self.innerSystem.set_axis_off()
-
-        # Style axis for outer solar system bodies
-        self.outerSystem = self.figure.add_subplot(326, projection='3d')
-        self.plot3dEqualAspect(self.outerSystem, xlim=(-12,30),
-                               ylim=(-26,18), zlim=(-40,40))
-        self.outerSystem.view_init(25, 10)
-        self.outerSystem.patch.set_facecolor('None')
-        self.outerSystem.set_axis_off()
-
-        # Reduce margins between axes
-        self.figure.tight_layout()
-
-        # Style axis for planet legend
-        self.scaleLegend = self.figure.add_axes((0,0.92,1,0.08))
-        self.scaleLegend.set_ylim(0,1)
-        self.scaleLegend.patch.set_facecolor('None')
-        self.scaleLegend.set_axis_off()
-
-    # Method for plotting Planet orbits
-    def planetOrbit(self, SolarSystem):
-        for bodyLab, body in SolarSystem.bodies.items():
-            ax = self.innerSystem if bodyLab in ['MERCURY', 'VENUS', 'EARTH', 'MARS'] else self.outerSystem
-
-            ax.plot(body.orbitPosInAU[0][:,0], body.orbitPosInAU[0][:,1],
-                    body.orbitPosInAU[0][:,2], '--', lw=1,
-                    c=body.plotSymbolColor)
-
-    # Method for plotting planet's positions at some selected date
-    def planetPositions(self, SolarSystem, date):
-
-        # Loop through bodies in the SolarSystem helper class
-        for bodyLab, body in SolarSystem.bodies.items():
-            # Treat Sun's position as unique case
-            if bodyLab == 'SUN':
-                # To scale Sun for inner system
-                self.innerSystem.scatter(0, 0, 0, c=body.plotSymbolColor,
-                                        s=SolarSystem.scaledPlotSymbol[bodyLab],
-                                        label=body.customLabel)
-
-                # Add label for Sun to inner solar system axis
-                self.innerSystem.text(0.08,0.08,0.08, 'The Sun (Sol)',
-                                      color=body.plotSymbolColor,
-                                      fontweight='heavy')
-
-                # Smaller Sun for outer solar system
-                self.outerSystem.scatter(0, 0, 0, c=body.plotSymbolColor,
-                                        s=SolarSystem.scaledPlotSymbol[bodyLab]*0.25)
-
-            else:
-                # Aside from selecting inner/outer system axis (done below)
-                # can treat plotting of planetary bodies the same
-                ax = self.innerSystem if bodyLab in ['MERCURY', 'VENUS', 'EARTH', 'MARS'] else self.outerSystem
-
-                # Get position
-                planetPos = body.getPos(time=date, frame='HCI',
-                                        obs='SOLAR SYSTEM BARYCENTER')
-
-                # Plot position
-                ax.scatter(planetPos[0][:,0], planetPos[0][:,1],
-                           planetPos[0][:,2],
-                           c=body.plotSymbolColor,
-                           s=SolarSystem.scaledPlotSymbol[bodyLab],
-                           label=body.customLabel)
-
-                # Add symbol to legend
-                self.scaleLegend.scatter(np.log10(planetPos[1]), 0.5,
-                                         c=body.plotSymbolColor,
-                                         s=SolarSystem.scaledPlotSymbol[bodyLab]*0.5)
-
-                # Add label to go with legend symbol for planets
-                self.scaleLegend.text(np.log10(planetPos[1]), 0.05,
-                                      body.customLabel,
-                                      color=body.plotSymbolColor,
-                                      fontweight='heavy', ha='center',
-                                      va='center', rotation=40, )
-
-        # Add symbol for the Sun last when axis limits have been
-        # dynamically determined
-        self.scaleLegend.scatter(self.scaleLegend.get_xlim()[0],0.5,
-                                 c=SolarSystem.sun.plotSymbolColor,
-                                 s=SolarSystem.scaledPlotSymbol['SUN'])
-
-
-        # Add text to plot describing the date
-        dateString = dt.datetime.strptime(date, '%Y-%m-%d').strftime('%a %B %d %Y')
-        txtStr = 'The Solar System on:\n{0}'.format(dateString)
-        txt = self.figure.text(0.05,0.05,txtStr, color='w',
-                          fontsize=25, fontweight='heavy',ha='left')
-
-        # Update the figure
-        self.figure.canvas.draw()
-
-    # Method for making an equal aspect ratio for 3D axes
-    @staticmethod
-    def plot3dEqualAspect(ax3D, xlim=(4,-4), ylim=(4,-4), zlim=(-4,4)):
-        ax3D.set_xlim(xlim)
-        ax3D.set_ylim(ylim)
-        ax3D.set_zlim(zlim)
-        scaling = np.array([getattr(ax3D, 'get_{}lim'.format(dim))()
-                            for dim in 'xyz'])
-        ax3D.auto_scale_xyz(*[[np.min(scaling), np.max(scaling)]]*3)
-
-    # Method to reset figure canvas to starting condition
-    def resetFigure(self, SolarSystem):
-        self.figure.clf()
+        # Set up basic axes, date changes redraw over a cached background
         self.decorateAxes()
-        self.planetOrbit(SolarSystem)
-
-    # Method for saving figure
-    def saveFig(self, name):
-        self.figure.savefig(name, dpi=300)
-
-# Helper class for managing solar system of bodies
-class SolSystem(object):
-
-    def __init__(self, mkFile=None):
-        # Set expected location for spice metakernel if custom not entered
-        # TODO: Catch errors related to this kernel not being found
-        if mkFile == None:
-            mkFile = './assets/spice/metakernel.mk'
-
-        # Generate planets
-        self.sun = Pyprika.Planet(mk=mkFile,
-                                  planetName='SUN',
-                                  radiusInKilometers=695700,
-                                  orbPeriodInEarthYears=1,
-                                  plotSymbolColor='#ffd000')
-
-        self.mercury = Pyprika.Planet(mk=mkFile,
-                                      planetName='MERCURY BARYCENTER',
-                                      radiusInKilometers=2440.,
-                                      orbPeriodInEarthYears=87.97/365.26,
-                                      plotSymbolColor='#aa9e91',
-                                      customLabel='MERCURY')
-
-        self.venus = Pyprika.Planet(mk=mkFile,
-                                    planetName='VENUS BARYCENTER',
-                                    radiusInKilometers=6052.,
-                                    orbPeriodInEarthYears=224.7/365.26,
-                                    plotSymbolColor='#f2b94f',
-                                    customLabel='VENUS')
-
-        self.earth = Pyprika.Planet(mk=mkFile,
-                                    planetName='EARTH BARYCENTER',
-                                    radiusInKilometers=6378.,
-                                    orbPeriodInEarthYears=1.,
-                                    plotSymbolColor='#02721e',
-                                    customLabel='EARTH')
-
-        self.mars = Pyprika.Planet(mk=mkFile,
-                                   planetName='MARS BARYCENTER',
-                                   radiusInKilometers=3396.,
-                                   orbPeriodInEarthYears=1.88,
-                                   plotSymbolColor='#cc2504',
-                                   customLabel='MARS')
-
-        self.jupiter = Pyprika.Planet(mk=mkFile,
-                                      planetName='JUPITER BARYCENTER',
-                                      radiusInKilometers=71492.,
-                                      orbPeriodInEarthYears=11.86,
-                                      plotSymbolColor='#c18503',
-                                      customLabel='JUPITER')
-
-        self.saturn = Pyprika.Planet(mk=mkFile,
-                                     planetName='SATURN BARYCENTER',
-                                     radiusInKilometers=60268.,
-                                     orbPeriodInEarthYears=29.46,
-                                     plotSymbolColor='#e0c147',
-                                     customLabel='SATURN')
-
-        self.uranus = Pyprika.Planet(mk=mkFile,
-                                     planetName='URANUS BARYCENTER',
-                                     radiusInKilometers=25559.,
-                                     orbPeriodInEarthYears=84.01,
-                                     plotSymbolColor='#2dc49c',
-                                     customLabel='URANUS')
-
-        self.neptune = Pyprika.Planet(mk=mkFile,
-                                      planetName='NEPTUNE BARYCENTER',
-                                      radiusInKilometers=24764.,
-                                      orbPeriodInEarthYears=164.79,
-                                      plotSymbolColor='#1ebfdb',
-                                      customLabel='NEPTUNE')
-
-        self.pluto = Pyprika.Planet(mk=mkFile,
-                                    planetName='PLUTO BARYCENTER',
-                                    radiusInKilometers=1195.,
-                                    orbPeriodInEarthYears=248.59,
-                                    plotSymbolColor='#f1c9a2',
-                                    customLabel='PLUTO')
-
-        # Store solar system bodies in look-up dictionary
-        self.bodies = {self.sun.customLabel: self.sun,
-                        self.mercury.customLabel: self.mercury,
-                        self.venus.customLabel: self.venus,
-                        self.earth.customLabel: self.earth,
-                        self.mars.customLabel: self.mars,
-                        self.jupiter.customLabel: self.jupiter,
-                        self.saturn.customLabel: self.saturn,
-                        self.uranus.customLabel: self.uranus,
-                        self.neptune.customLabel: self.neptune,
-                        self.pluto.customLabel: self.pluto}
-
-        # Create dictionary lookup table for scaled plot symbols
-        # Pluto will be made not to scale since it is so tiny.
-
-        # Define 'private' function for min-max scaling
-        def __scale(ps, top=200):
-            ps = np.log10(ps)
-            ps = top*((ps - ps.min()) / (ps.max() - ps.min()))
-            ps[ps == 0] = ps[ps > 0].min() * (2./3.)
-            return ps
-
-        # Scale size of planets using min-max scaler
-        sizes = __scale(np.array([self.sun.radiusInKilometers,
-                          self.mercury.radiusInKilometers,
-                          self.venus.radiusInKilometers,
-                          self.earth.radiusInKilometers,
-                          self.mars.radiusInKilometers,
-                          self.jupiter.radiusInKilometers,
-                          self.saturn.radiusInKilometers,
-                          self.uranus.radiusInKilometers,
-                          self.neptune.radiusInKilometers,
-                          self.pluto.radiusInKilometers]), top=200)
-
-        # Add sizes to look-up disctionary
-        self.scaledPlotSymbol = {self.sun.customLabel: sizes[0],
-                                 self.mercury.customLabel: sizes[1],
-                                 self.venus.customLabel: sizes[2],
-                                 self.earth.customLabel: sizes[3],
-                                 self.mars.customLabel: sizes[4],
-                                 self.jupiter.customLabel: sizes[5],
-                                 self.saturn.customLabel: sizes[6],
-                                 self.uranus.customLabel: sizes[7],
-                                 self.neptune.customLabel: sizes[8],
-                                 self.pluto.customLabel: sizes[9]}
-
-def run():
+        self.enableBlitting()
+
+# Class collecting a timing breakdown of application startup
+class StartupProfiler(object):
+
+    def __init__(self, t0=None, outFile=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.outFile = outFile
+        self.marks = OrderedDict()
+        self.durations = OrderedDict()
+
+    # Record seconds since process start for a milestone
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - self.t0
+
+    def report(self):
+        print('STARTUP PROFILE')
+        print('  milestones (s since start):')
+        for name, t in self.marks.items():
+            print('    {0:<24s} {1:8.3f}'.format(name, t))
+        print('  background work (s):')
+        for name, t in self.durations.items():
+            print('    {0:<24s} {1:8.3f}'.format(name, t))
+        if self.outFile:
+            with open(self.outFile, 'w') as f:
+                json.dump(dict(milestones=self.marks, durations=self.durations),
+                          f, indent=2)
+
+def run(profileStartup=False, t0=None, profileFile=None):
+    profiler = StartupProfiler(t0, profileFile) if profileStartup else None
+    if profiler:
+        profiler.mark('imports')
     app = QApplication(sys.argv)
-    ex = App()
+    ex = App(profiler=profiler)
     sys.exit(app.exec_())
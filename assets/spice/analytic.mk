@@ -0,0 +1,26 @@
+\begintext
+    Kernels for the analytic (mean element) quick-preview ephemeris, see
+    model/Analytic.py. No SPK: positions come from JPL's approximate
+    planetary elements, so this set loads in milliseconds and lets
+    lightweight workers run without de431_1850_2100.bsp.
+
+    File name                     Contents
+    ---------                     --------
+    naif0012.tls                  Leapseconds kernel
+
+    RSSDVvvv.TF                   Reference frame definitions (HCI, HEE...)
+
+\begindata
+
+    PATH_VALUES       = ('./assets/spice/')
+
+    PATH_SYMBOLS      = ( 'KERNELS' )
+
+    KERNELS_TO_LOAD = (
+                        '$KERNELS/lsk/NAIF0012.TLS'
+
+                        '$KERNELS/fk/RSSD0002.TF'
+
+                      )
+
+\begintext
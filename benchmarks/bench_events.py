@@ -0,0 +1,64 @@
+#! /usr/bin/env python
+"""
+bench_events
+
+Purpose: Benchmark the event finder: solar returns for every body from the
+         start of the kernel span, plus conjunctions/oppositions for every
+         pair of bodies, over the whole 1850-2100 range. Reports events/s.
+
+Usage:
+    python ./benchmarks/bench_events.py                  # repository kernels
+    python ./benchmarks/bench_events.py --synthetic /tmp/synth --backend numpy
+
+"""
+
+## Imports
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from model.SolSystem import SolSystem
+from model import Pyprika
+
+
+def run(mkFile=None, backend=None, repeat=3):
+    sol = SolSystem(mkFile, useOrbitCache=False, backend=backend)
+
+    results = {}
+    for name, search in [('solarReturns', lambda: sol.findSolarReturns(Pyprika.KERNEL_SPAN[0])),
+                         ('conjunctions', lambda: sol.findConjunctions())]:
+        best = None
+        for i in range(repeat):
+            t0 = time.perf_counter()
+            events = search()
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = dict(events=len(events), seconds=best,
+                             eventsPerSecond=len(events) / best)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('Usage')[0].strip())
+    parser.add_argument('--mk', default=None, help='SPICE metakernel')
+    parser.add_argument('--synthetic', metavar='DIR',
+                        help='generate and use a synthetic kernel set in DIR')
+    parser.add_argument('--backend', default=None, choices=['spice', 'numpy'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    mkFile = args.mk
+    if args.synthetic:
+        from tests.SyntheticKernels import makeSyntheticKernels
+        mkFile = makeSyntheticKernels(args.synthetic)
+
+    for name, r in run(mkFile, args.backend, args.repeat).items():
+        print('{0:>14s}: {1:6d} events in {2:7.3f} s -> {3:9.1f} events/s'.format(
+            name, r['events'], r['seconds'], r['eventsPerSecond']))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
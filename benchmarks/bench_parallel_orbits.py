@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+"""
+bench_parallel_orbits
+
+Purpose: Scaling curve for building every SolSystem orbit track (plotted
+         and level-of-detail) in 1..N worker processes against the serial
+         path, on a synthetic kernel set. Checks the parallel tracks are
+         bit-identical to the serial ones.
+
+Usage:
+    python ./benchmarks/bench_parallel_orbits.py --max-processes 8 --backend numpy
+
+Comments:
+    'cold' times SolSystem(processes=n), which starts its own pool (spawn,
+    imports and kernel loading in every worker; processes=1 is the serial
+    path). 'warm' reuses a pool started beforehand, as a long running
+    process would.
+
+"""
+
+## Imports
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+
+from model import ParallelOrbits
+from model.SolSystem import SolSystem
+from tests.SyntheticKernels import makeSyntheticKernels
+
+
+# Method for the orbit tracks of a SolSystem, keyed on body label
+def tracks(sol):
+    return {label: (body.orbitPosInAU[0], body.orbitPosInAU[1], body.orbitLOD)
+            for label, body in sol.bodies.items()}
+
+
+# Method for checking two sets of tracks are bit-identical
+def identical(a, b):
+    return all(np.array_equal(a[k][0], b[k][0]) and a[k][1] == b[k][1] and
+               np.array_equal(a[k][2], b[k][2]) for k in a)
+
+
+# Method for the best of `repeat` timings of op()
+def best(op, repeat):
+    times = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        result = op()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('Usage')[0].strip())
+    parser.add_argument('--max-processes', '-j', type=int, default=os.cpu_count())
+    parser.add_argument('--backend', default=None, choices=['spice', 'numpy'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix='solorbits')
+    try:
+        mkFile = makeSyntheticKernels(tmp)
+        def serial():
+            sol = SolSystem(mkFile, useOrbitCache=False, backend=args.backend)
+            return tracks(sol)
+        tSerial, reference = best(serial, args.repeat)
+        print('cpus {0}, serial {1:.3f} s'.format(os.cpu_count(), tSerial))
+        print('{0:>9s} {1:>9s} {2:>8s} {3:>9s} {4:>8s} {5:>10s}'.format(
+            'processes', 'cold s', 'speedup', 'warm s', 'speedup', 'identical'))
+
+        for n in range(1, args.max_processes + 1):
+            tCold, cold = best(lambda: tracks(SolSystem(mkFile, useOrbitCache=False,
+                                                        backend=args.backend,
+                                                        processes=n)), args.repeat)
+            pool = ParallelOrbits.orbitPool(mkFile, n, args.backend)
+            try:
+                # First job waits for the workers to start
+                SolSystem(mkFile, useOrbitCache=False, backend=args.backend, pool=pool)
+                tWarm, warm = best(lambda: tracks(SolSystem(mkFile, useOrbitCache=False,
+                                                            backend=args.backend,
+                                                            pool=pool)), args.repeat)
+            finally:
+                pool.close()
+                pool.join()
+            print('{0:9d} {1:9.3f} {2:7.2f}x {3:9.3f} {4:7.2f}x {5:>10s}'.format(
+                n, tCold, tSerial / tCold, tWarm, tSerial / tWarm,
+                str(identical(reference, cold) and identical(reference, warm))))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
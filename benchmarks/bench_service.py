@@ -0,0 +1,92 @@
+#! /usr/bin/env python
+"""
+bench_service
+
+Purpose: Load test SolService on localhost against a synthetic kernel set:
+         many concurrent clients each asking for the positions on a random
+         birth date, with and without request batching. Reports requests/s,
+         batch sizes and latency percentiles from /stats.
+
+Usage:
+    python ./benchmarks/bench_service.py --requests 2000 --concurrency 200 -j 2
+
+"""
+
+## Imports
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from SolService import SolService
+from tests.SyntheticKernels import makeSyntheticKernels
+
+
+# Method for one GET over a fresh connection, returns the decoded JSON
+async def get(port, target):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write('GET {0} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'
+                 .format(target).encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    if not head.startswith(b'HTTP/1.1 200'):
+        raise RuntimeError(head.split(b'\r\n')[0].decode('latin-1'))
+    return json.loads(body.decode('utf-8'))
+
+
+async def load(mkFile, processes, requests, concurrency, maxBatch):
+    service = SolService(mkFile, processes=processes, maxBatch=maxBatch)
+    port = await service.start(port=0)
+    try:
+        rng = random.Random(1)
+        dates = ['{0}-{1:02d}-{2:02d}'.format(rng.randint(1900, 2050),
+                                              rng.randint(1, 12), rng.randint(1, 28))
+                 for i in range(requests)]
+        slots = asyncio.Semaphore(concurrency)
+
+        async def client(date):
+            async with slots:
+                return await get(port, '/positions?date=' + date)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*[client(d) for d in dates])
+        elapsed = time.perf_counter() - t0
+        stats = await get(port, '/stats')
+    finally:
+        await service.close()
+    return elapsed, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('Usage')[0].strip())
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--processes', '-j', type=int, default=2)
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix='solservice')
+    try:
+        mkFile = makeSyntheticKernels(tmp)
+        for label, maxBatch in [('batched', 256), ('unbatched', 1)]:
+            elapsed, stats = asyncio.run(load(mkFile, args.processes, args.requests,
+                                              args.concurrency, maxBatch))
+            latency = stats['latency']['/positions']
+            print('{0:>10s}: {1:8.1f} req/s  mean batch {2:6.1f}  '
+                  'p50 {3} ms  p95 {4} ms  p99 {5} ms'.format(
+                      label, args.requests / elapsed, stats['batches']['meanSize'],
+                      latency['p50Ms'], latency['p95Ms'], latency['p99Ms']))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+"""
+check_analytic
+
+Purpose: Measure the position error of the analytic preview ephemeris
+         (model.Analytic) against the SPICE path for every SolSystem body,
+         and check it against Analytic.ERROR_BOUND_KM.
+
+Usage:
+    python ./benchmarks/check_analytic.py --mk ./assets/spice/metakernel.mk --step-days 5
+
+Comments:
+    Needs a metakernel with a planetary SPK (DE430/DE431 or similar).
+    Positions are compared relative to the solar system barycentre in
+    J2000 over --start to --end (default the part of the kernel span
+    within Analytic.VALID_SPAN, where the bounds apply). Prints the
+    largest error of each body beside its bound and exits with status 1 if
+    any bound is exceeded.
+
+"""
+
+## Imports
+import os
+import sys
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from model import Pyprika
+from model import Analytic
+from model.SolSystem import SolSystem
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('Usage')[0].strip())
+    parser.add_argument('--mk', default='./assets/spice/metakernel.mk')
+    parser.add_argument('--start', default=max(Pyprika.KERNEL_SPAN[0], Analytic.VALID_SPAN[0]))
+    parser.add_argument('--end', default=min(Pyprika.KERNEL_SPAN[1], Analytic.VALID_SPAN[1]))
+    parser.add_argument('--step-days', type=float, default=5.)
+    args = parser.parse_args(argv)
+
+    sol = SolSystem(args.mk, useOrbitCache=False, backend='spice')
+    et0, et1 = sol.sun.convertDateToET([args.start, args.end])
+    et = np.arange(et0, et1, args.step_days * 86400.)
+    analytic = Analytic.AnalyticBackend()
+
+    failed = False
+    print('{0:<10s} {1:>14s} {2:>14s} {3:>10s}'.format('body', 'max error km',
+                                                       'bound km', 'at'))
+    for label, body in sol.bodies.items():
+        precise = sol.sun.backend.position(body.ID, et, frame='J2000', obs=0)
+        approx = analytic.position(body.ID, et, frame='J2000', obs=0)
+        err = np.linalg.norm(approx - precise, axis=1)
+        worst = int(np.argmax(err))
+        bound = Analytic.errorBound(body.ID)
+        failed = failed or err[worst] > bound
+        print('{0:<10s} {1:14.0f} {2:14.0f} {3:>10s}{4}'.format(
+            label, err[worst], bound, Pyprika.spice.et2utc(et[worst], 'C', 0)[:11],
+            '' if err[worst] <= bound else '  EXCEEDED'))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
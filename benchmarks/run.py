@@ -0,0 +1,444 @@
+#! /usr/bin/env python
+"""
+run
+
+Purpose: Benchmark harness for the ephemeris and rendering hot paths.
+
+Usage:
+    python ./benchmarks/run.py                       # run, print, compare
+    python ./benchmarks/run.py --json results.json   # also write results
+    python ./benchmarks/run.py --save-baseline       # store new baseline
+    python ./benchmarks/run.py --only et_ position_
+
+Comments:
+    Everything runs against a synthetic kernel set (tests.SyntheticKernels)
+    generated into a temporary directory, so no network or DE431 kernel is
+    needed. Each benchmark runs once untimed and then reports the best and
+    median of several repeats (seconds per operation, and items per second
+    where it makes sense).
+
+    Results are compared with benchmarks/baseline.json. Machine speed and
+    load vary between sessions and drift within one, so each timed repeat
+    is divided by the time of a fixed calibration workload run just before
+    it, and the medians of these calibrated times are compared. A benchmark more than
+    --threshold slower than the baseline is measured again (up to
+    CONFIRM_RUNS times), and if still slower it is a regression. Benchmarks missing from the baseline are
+    reported and also fail the run. --save-baseline updates the baseline
+    entries of the benchmarks that were run.
+
+"""
+
+## Imports
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import platform
+import statistics
+import datetime as dt
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from model import Pyprika
+from model.SolSystem import SolSystem
+from tests.SyntheticKernels import makeSyntheticKernels
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Times a benchmark over the threshold is measured again before it counts
+# as a regression
+CONFIRM_RUNS = 2
+
+# Registered benchmarks as (name, setup function, repeat, number)
+BENCHMARKS = []
+
+
+# Decorator registering a benchmark. The decorated function does any setup
+# and returns (operation, itemsPerOperation); only the operation is timed,
+# `number` times in a row per repeat for operations too short to time once.
+def benchmark(name, repeat=5, number=1):
+    def register(func):
+        BENCHMARKS.append((name, func, repeat, number))
+        return func
+    return register
+
+
+# Method for timing a benchmark after one untimed run, returns a results
+# dict. Each repeat is paired with a run of the calibration workload just
+# before it, and `calibrated` is the median ratio of the two.
+def measure(op, items, repeat, number=1):
+    op()
+    times, ratios = [], []
+    for i in range(repeat):
+        calibration = timeOnce(calibrationOp)
+        times.append(timeOnce(op, number) / number)
+        ratios.append(times[-1] / calibration)
+    best = min(times)
+    return dict(best=best, median=statistics.median(times), repeat=repeat,
+                number=number,
+                items=items, itemsPerSecond=items / best if best > 0 else None,
+                calibrated=statistics.median(ratios))
+
+
+# Method for the wall time of `number` calls
+def timeOnce(op, number=1):
+    t0 = time.perf_counter()
+    for i in range(number):
+        op()
+    return time.perf_counter() - t0
+
+
+# Fixed NumPy and interpreter workload every time is normalised against.
+# Its buffers are allocated once so it measures the CPU, not the state of
+# the allocator left by the previous benchmark.
+CALIBRATION_IN = np.random.default_rng(0).random(250000)
+CALIBRATION_OUT = np.empty_like(CALIBRATION_IN)
+
+def calibrationOp():
+    for i in range(10):
+        np.sin(CALIBRATION_IN, out=CALIBRATION_OUT)
+        np.multiply(CALIBRATION_OUT, CALIBRATION_IN, out=CALIBRATION_OUT)
+    sum(k * k for k in range(200000))
+
+
+## Benchmarks
+
+DATES_100K = np.datetime64('1850-01-01') + np.arange(100000) * np.timedelta64(2, 'h')
+
+@benchmark('et_conversion_100k')
+def benchEtConversion(ctx):
+    ctx.sol()
+    return (lambda: Pyprika.SpiceBase.convertDateToET(DATES_100K)), DATES_100K.size
+
+@benchmark('position_single_spice', repeat=10, number=200)
+def benchPositionSingle(ctx):
+    earth = ctx.sol().earth
+    return (lambda: earth.getPos('2000-01-01', frame='HCI',
+                                 obs='SOLAR SYSTEM BARYCENTER')), 1
+
+@benchmark('position_single_uncached', repeat=10, number=200)
+def benchPositionSingleUncached(ctx):
+    earth = ctx.sol().earth
+    def op():
+        Pyprika.SpiceCache.clear()
+        earth.getPos('2000-01-01', frame='HCI', obs='SOLAR SYSTEM BARYCENTER')
+    return op, 1
+
+@benchmark('position_batched_spice_10x5k', repeat=3)
+def benchPositionBatchedSpice(ctx):
+    sol, dates = ctx.sol(), DATES_100K[:5000]
+    return (lambda: sol.getPositions(dates)), 10 * dates.size
+
+@benchmark('position_batched_numpy_10x100k')
+def benchPositionBatchedNumpy(ctx):
+    sol = ctx.sol(backend='numpy')
+    return (lambda: sol.getPositions(DATES_100K)), 10 * DATES_100K.size
+
+@benchmark('position_batched_table_10x100k')
+def benchPositionBatchedTable(ctx):
+    sol = ctx.sol(backend=ctx.table())
+    return (lambda: sol.getPositions(DATES_100K)), 10 * DATES_100K.size
+
+@benchmark('position_batched_analytic_10x100k')
+def benchPositionBatchedAnalytic(ctx):
+    sol = ctx.sol(backend='analytic')
+    analytic = sol.sun.backend.backend
+    def op():
+        # Solve the elements every call, not just the first
+        analytic._lastKey = None
+        return sol.getPositions(DATES_100K)
+    return op, 10 * DATES_100K.size
+
+# Frames and observers of a multi-view export
+VIEW_FRAMES = ('HCI', 'HEE', 'ECLIPJ2000')
+VIEW_OBSERVERS = ('SUN', 'SOLAR SYSTEM BARYCENTER')
+
+@benchmark('views_spice_10x5k_3frames_2obs', repeat=3)
+def benchViews(ctx):
+    sol, dates = ctx.sol(), DATES_100K[:5000]
+    return (lambda: sol.getViews(dates, VIEW_FRAMES, VIEW_OBSERVERS)), 10 * dates.size
+
+@benchmark('views_separate_spice_10x5k_3frames_2obs', repeat=3)
+def benchViewsSeparate(ctx):
+    sol, dates = ctx.sol(), DATES_100K[:5000]
+    def op():
+        for frame in VIEW_FRAMES:
+            for obs in VIEW_OBSERVERS:
+                sol.getPositions(dates, frame=frame, obs=obs)
+    return op, 10 * dates.size
+
+@benchmark('stream_positions_numpy_1M', repeat=3)
+def benchStreamPositions(ctx):
+    earth = ctx.sol(backend='numpy').earth
+    runs = iter(range(1000))
+    def op():
+        # A fresh store each repeat, so nothing is resumed
+        out = os.path.join(ctx.tmp, 'stream{0}'.format(next(runs)))
+        for chunk in earth.iterPositions('1900-01-01', '1901-11-26T10:39', 60,
+                                         chunkSize=250000, out=out):
+            pass
+    return op, 1000000
+
+@benchmark('solsystem_cold', repeat=3)
+def benchSolSystemCold(ctx):
+    def op():
+        Pyprika.KernelPool.clear()
+        sol = SolSystem(ctx.mk, useOrbitCache=False)
+        for body in sol.bodies.values():
+            body.orbitPosInAU
+    return op, 1
+
+@benchmark('solsystem_warm')
+def benchSolSystemWarm(ctx):
+    cacheDir = os.path.join(ctx.tmp, 'orbits')
+    # Populate the kernel pool and orbit cache first
+    for body in SolSystem(ctx.mk, cacheDir=cacheDir).bodies.values():
+        body.orbitPosInAU
+    def op():
+        sol = SolSystem(ctx.mk, cacheDir=cacheDir)
+        for body in sol.bodies.values():
+            body.orbitPosInAU
+    return op, 1
+
+@benchmark('orbit_per_body', repeat=3)
+def benchOrbitPerBody(ctx):
+    bodies = list(ctx.sol().bodies.values())
+    def op():
+        for body in bodies:
+            body.getOrbit()
+    return op, len(bodies)
+
+@benchmark('orbit_lod_per_body', repeat=3)
+def benchOrbitLODPerBody(ctx):
+    bodies = list(ctx.sol().bodies.values())
+    def op():
+        for body in bodies:
+            body.getOrbitLOD()
+    return op, len(bodies)
+
+@benchmark('kernel_load_unload_cycle', repeat=10)
+def benchKernelCycle(ctx):
+    # A second metakernel so each cycle really furnishes and unloads the set
+    mk = ctx.mk + '.cycle'
+    shutil.copy(ctx.mk, mk)
+    def op():
+        with Pyprika.KernelPool.scoped(mk):
+            pass
+    return op, 1
+
+@benchmark('render_frame_update', repeat=10)
+def benchRenderFrame(ctx):
+    from SolPlot import HeadlessCanvas
+    sol, canvas = ctx.sol(), HeadlessCanvas()
+    canvas.figure.set_dpi(100)
+    canvas.renderFrame(sol, '2000-01-01')
+    days = iter(range(1, 100000))
+    def op():
+        date = (dt.date(2000, 1, 1) + dt.timedelta(days=next(days))).isoformat()
+        canvas.renderFrame(sol, date)
+    return op, 1
+
+@benchmark('render_save_png_100dpi', repeat=5)
+def benchRenderSave(ctx):
+    from SolPlot import HeadlessCanvas
+    sol, canvas = ctx.sol(), HeadlessCanvas()
+    canvas.renderFrame(sol, '2000-01-01')
+    return (lambda: canvas.saveFig(io.BytesIO(), dpi=100)), 1
+
+@benchmark('render_frame_update_projected', repeat=10)
+def benchRenderFrameProjected(ctx):
+    return benchRenderFrameView(ctx, 'projected')
+
+@benchmark('render_frame_update_topdown', repeat=10)
+def benchRenderFrameTopdown(ctx):
+    return benchRenderFrameView(ctx, 'topdown')
+
+@benchmark('render_save_png_100dpi_projected', repeat=5)
+def benchRenderSaveProjected(ctx):
+    from SolPlot import HeadlessCanvas
+    sol, canvas = ctx.sol(), HeadlessCanvas(viewMode='projected')
+    canvas.renderFrame(sol, '2000-01-01')
+    return (lambda: canvas.saveFig(io.BytesIO(), dpi=100)), 1
+
+@benchmark('render_cached_png_300dpi', repeat=10, number=20)
+def benchRenderCached(ctx):
+    from SolPlot import HeadlessCanvas
+    from model.RenderCache import RenderCache
+    sol, canvas = ctx.sol(), HeadlessCanvas()
+    cache = RenderCache(os.path.join(ctx.tmp, 'renders'))
+    canvas.render(sol, '2000-01-01', io.BytesIO(), dpi=300, cache=cache)
+    # Disk tier only, as for a popular date first seen by another process
+    cold = RenderCache(cache.cacheDir, hotBytes=0)
+    return (lambda: canvas.render(sol, '2000-01-01', io.BytesIO(), dpi=300,
+                                  cache=cold)), 1
+
+# Frame update in one of the 2D view modes (compare render_frame_update)
+def benchRenderFrameView(ctx, viewMode):
+    from SolPlot import HeadlessCanvas
+    sol, canvas = ctx.sol(), HeadlessCanvas(viewMode=viewMode)
+    canvas.figure.set_dpi(100)
+    canvas.renderFrame(sol, '2000-01-01')
+    days = iter(range(1, 100000))
+    def op():
+        date = (dt.date(2000, 1, 1) + dt.timedelta(days=next(days))).isoformat()
+        canvas.renderFrame(sol, date)
+    return op, 1
+
+@benchmark('catalog_positions_5k', repeat=10)
+def benchCatalogPositions(ctx):
+    sol = ctx.sol(catalog=ctx.catalog(5000))
+    return (lambda: sol.groupPositions('2000-01-01', 'asteroid')), 5000
+
+@benchmark('render_frame_update_catalog_5k', repeat=10)
+def benchRenderFrameCatalog(ctx):
+    from SolPlot import HeadlessCanvas
+    sol = ctx.sol(catalog=ctx.catalog(5000))
+    canvas = HeadlessCanvas(viewMode='projected', blit=True)
+    canvas.figure.set_dpi(100)
+    canvas.renderFrame(sol, '2000-01-01')
+    days = iter(range(1, 100000))
+    def op():
+        date = (dt.date(2000, 1, 1) + dt.timedelta(days=next(days))).isoformat()
+        canvas.renderFrame(sol, date)
+    return op, 1
+
+@benchmark('events_solar_returns_numpy', repeat=3)
+def benchSolarReturns(ctx):
+    sol = ctx.sol(backend='numpy')
+    return (lambda: sol.findSolarReturns(Pyprika.KERNEL_SPAN[0])), 1
+
+
+# Context giving benchmarks access to the synthetic kernels
+class Context(object):
+
+    def __init__(self, tmp):
+        self.tmp = tmp
+        self.mk = makeSyntheticKernels(os.path.join(tmp, 'kernels'))
+
+    # Method for a SolSystem on the synthetic kernels (no orbit cache)
+    def sol(self, backend=None, catalog=None):
+        return SolSystem(self.mk, useOrbitCache=False, backend=backend,
+                         catalog=catalog)
+
+    # Method for a catalog CSV of n random main belt asteroids
+    def catalog(self, n):
+        path = os.path.join(self.tmp, 'asteroids{0}.csv'.format(n))
+        if not os.path.exists(path):
+            rng = np.random.default_rng(n)
+            with open(path, 'w') as f:
+                f.write('label,group,axis,radiusKm,a,e,i,node,peri,M,epoch\n')
+                for k in range(n):
+                    f.write('A{0},asteroid,inner,{1:.1f},{2:.4f},{3:.4f},{4:.3f},'
+                            '{5:.3f},{6:.3f},{7:.3f},2000-01-01\n'.format(
+                                k, rng.uniform(1, 100), rng.uniform(2.1, 3.3),
+                                rng.uniform(0, 0.3), rng.uniform(0, 20),
+                                *rng.uniform(0, 360, 3)))
+        return path
+
+    # Method for an ephemeris table of the synthetic kernels, built once
+    def table(self):
+        from model.EphemerisTable import EphemerisTable
+        path = os.path.join(self.tmp, 'solsystem.eph')
+        if not os.path.exists(path):
+            EphemerisTable.build(path, self.sol(), start=str(DATES_100K[0]))
+        return EphemerisTable.open(path)
+
+
+# Method for comparing calibrated results against a baseline, returns
+# (regressions as (name, ratio), names missing from the baseline)
+def compare(results, baseline, threshold):
+    regressions, missing = [], []
+    for name, r in results.items():
+        if 'calibrated' not in baseline.get(name, {}):
+            missing.append(name)
+            continue
+        ratio = r['calibrated'] / baseline[name]['calibrated']
+        r['baselineRatio'] = ratio
+        if ratio > 1. + threshold:
+            regressions.append((name, ratio))
+    return regressions, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SolBirthday benchmarks')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='overwrite the baseline with these results')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown against baseline (default 0.25)')
+    parser.add_argument('--only', nargs='+', default=None,
+                        help='run benchmarks whose names start with these')
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    tmp = tempfile.mkdtemp(prefix='solbench')
+    try:
+        ctx = Context(tmp)
+        results, ops = {}, {}
+        for name, func, repeat, number in BENCHMARKS:
+            if args.only and not any(name.startswith(o) for o in args.only):
+                continue
+            op, items = func(ctx)
+            ops[name] = op
+            results[name] = measure(op, items, repeat, number)
+            report(name, results[name])
+
+        regressions, missing = compare(results, baseline, args.threshold)
+        for attempt in range(0 if args.save_baseline else CONFIRM_RUNS):
+            # Measure suspected regressions again, keeping the better run
+            for name, ratio in regressions:
+                r = results[name]
+                again = measure(ops[name], r['items'], r['repeat'], r['number'])
+                report(name, again)
+                if again['calibrated'] < r['calibrated']:
+                    results[name] = again
+            regressions, missing = compare(results, baseline, args.threshold)
+    finally:
+        Pyprika.KernelPool.clear()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    meta = dict(python=platform.python_version(), machine=platform.machine(),
+                platform=platform.platform(), date=dt.datetime.now().isoformat())
+
+    if args.save_baseline:
+        # Entries of benchmarks not run are kept (calibrated times from
+        # different sessions are comparable)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(dict(meta=meta, results=baseline), f, indent=2, sort_keys=True)
+        print('Baseline written to {0}'.format(args.baseline))
+        regressions, missing = [], []
+    else:
+        for name, ratio in regressions:
+            print('REGRESSION: {0} is {1:.2f}x the baseline time'.format(name, ratio))
+        for name in missing:
+            print('MISSING: {0} has no baseline entry (run --save-baseline)'.format(name))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(dict(meta=meta, results=results, missing=missing,
+                           regressions=[r[0] for r in regressions]), f, indent=2)
+    return 1 if regressions or missing else 0
+
+
+# Method for printing one benchmark's results
+def report(name, r):
+    print('{0:<40s} best {1:10.6f} s  median {2:10.6f} s  x{3:8.3f}{4}'.format(
+        name, r['best'], r['median'], r['calibrated'],
+        '  {0:12.1f} items/s'.format(r['itemsPerSecond']) if r['items'] > 1 else ''))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+"""
+trace_spice
+
+Purpose: Count and time the SPICE calls behind loading a SolSystem and
+         drawing one frame (PlotCanvas.planetPositions), on a synthetic
+         kernel set, using model.SpiceTrace.
+
+Usage:
+    python ./benchmarks/trace_spice.py --json spice.json --trace spice_trace.json
+
+Comments:
+    Prints one table per stage. --trace writes every call of both stages as
+    a Chrome trace (open in chrome://tracing or https://ui.perfetto.dev).
+    --overhead also times a frame with tracing off and on.
+
+"""
+
+## Imports
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from model import Pyprika
+from model import SpiceTrace
+from model.SolSystem import SolSystem
+from tests.SyntheticKernels import makeSyntheticKernels
+
+
+# Method for the best time of `repeat` frames drawn on consecutive days
+def frameSeconds(canvas, sol, repeat=20):
+    times = []
+    for day in range(repeat):
+        t0 = time.perf_counter()
+        canvas.planetPositions(sol, '2000-01-{0:02d}'.format(day % 28 + 1))
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('Usage')[0].strip())
+    parser.add_argument('--backend', default=None, choices=['spice', 'numpy', 'table', 'analytic'])
+    parser.add_argument('--json', default=None, help='write the statistics here')
+    parser.add_argument('--trace', default=None, help='write a Chrome trace here')
+    parser.add_argument('--overhead', action='store_true')
+    args = parser.parse_args(argv)
+
+    from SolPlot import HeadlessCanvas
+
+    tmp = tempfile.mkdtemp(prefix='soltrace')
+    try:
+        mkFile = makeSyntheticKernels(tmp)
+        with SpiceTrace.capture() as everything:
+            with SpiceTrace.capture() as load:
+                sol = SolSystem(mkFile, useOrbitCache=False, backend=args.backend)
+            canvas = HeadlessCanvas()
+            canvas.planetPositions(sol, '2000-01-01')
+            with SpiceTrace.capture() as frame:
+                canvas.planetPositions(sol, '2000-01-02')
+
+        print('SolSystem load ({0} calls)'.format(load.calls))
+        print(load.report())
+        print('\nplanetPositions, one frame after the first ({0} calls)'.format(frame.calls))
+        print(frame.report())
+
+        if args.overhead:
+            off = frameSeconds(canvas, sol)
+            with SpiceTrace.capture():
+                on = frameSeconds(canvas, sol)
+            print('\nframe {0:.3f} ms untraced, {1:.3f} ms traced'.format(1e3 * off, 1e3 * on))
+
+        if args.json:
+            everything.dumpJSON(args.json)
+        if args.trace:
+            everything.dumpChromeTrace(args.trace)
+    finally:
+        Pyprika.KernelPool.clear()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Analytic
+
+Purpose: Kernel-free quick-preview ephemeris: positions of the SolSystem
+         bodies from JPL's mean Keplerian elements with secular rates
+         ("Approximate Positions of the Planets", E. M. Standish, Table 1),
+         usable as a Planet/SolSystem backend (backend='analytic').
+
+Comments:
+    No SPK is read. The elements give heliocentric ECLIPJ2000 positions of
+    the planetary barycentres (the Earth-Moon barycentre for Earth); the
+    Sun's offset from the solar system barycentre is the mass-weighted sum
+    of those, so positions relative to the barycentre follow too. Every
+    body is evaluated for the whole epoch array in one vectorised Kepler
+    solve (model.Kepler). Planets and SolSystems using this backend load
+    only the small text kernels in ANALYTIC_MK (leapseconds and frames)
+    instead of the metakernel.
+
+    Error bound: ERROR_BOUND_KM is the largest position error of each
+    body relative to the solar system barycentre within VALID_SPAN, the
+    interval the elements were fitted to. The bounds are 1.5 times the
+    largest error measured against DE421 every day over 1900-2050 (DE421
+    starts in 1900), the margin covering 1800-1900. Outside VALID_SPAN the
+    errors grow. tests/test_analytic.py checks positions against DE421
+    reference positions (tests/data/analytic_reference.json) and
+    benchmarks/check_analytic.py measures the errors against any
+    metakernel with a planetary SPK. At the default figure size every
+    bound is under one pixel on the axis the body is drawn on.
+
+    Earth (399) and the inner planets (199, 299) are given their
+    barycentre's position: up to 4700 km off for Earth, within the Earth
+    bound.
+
+    Frames: rotations come from the frames kernel, except for frames the
+    kernel defines by a body's ephemeris, which SPICE cannot evaluate
+    without an SPK. HEE (the Sun-Earth vector in the ecliptic of date) is
+    built here from the analytic Earth-Moon barycentre, its X axis within
+    Earth bound / 1 AU (about 2e-4 rad) of the SPICE frame; the others
+    (GSE, HEEQ...) raise ValueError.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import numpy as np
+import spiceypy as spice
+
+from . import Pyprika
+from . import Kepler
+
+# Kernels needed by the analytic backend (no SPK)
+ANALYTIC_MK = './assets/spice/analytic.mk'
+
+# Kilometres per astronomical unit of the elements
+AU_KM = 149597870.7
+
+# Bodies with elements (NAIF barycentre IDs)
+BODIES = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+# Elements at J2000 and their rates per Julian century (JPL Table 1, valid
+# 1800-2050): a (au), e, I, L, longitude of perihelion, longitude of the
+# ascending node (degrees)
+ELEMENTS = np.array([
+    [ 0.38709927, 0.20563593,  7.00497902, 252.25032350,  77.45779628,  48.33076593],
+    [ 0.72333566, 0.00677672,  3.39467605, 181.97909950, 131.60246718,  76.67984255],
+    [ 1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193,   0.0       ],
+    [ 1.52371034, 0.09339410,  1.84969142,  -4.55343205, -23.94362959,  49.55953891],
+    [ 5.20288700, 0.04838624,  1.30439695,  34.39644051,  14.72847983, 100.47390909],
+    [ 9.53667594, 0.05386179,  2.48599187,  49.95424423,  92.59887831, 113.66242448],
+    [19.18916464, 0.04725744,  0.77263783, 313.23810451, 170.95427630,  74.01692503],
+    [30.06992276, 0.00859048,  1.77004347, -55.12002969,  44.96476227, 131.78422574],
+    [39.48211675, 0.24882730, 17.14001206, 238.92903833, 224.06891629, 110.30393684]])
+RATES = np.array([
+    [ 0.00000037,  0.00001906, -0.00594749, 149472.67411175,  0.16047689, -0.12534081],
+    [ 0.00000390, -0.00004107, -0.00078890,  58517.81538729,  0.00268329, -0.27769418],
+    [ 0.00000562, -0.00004392, -0.01294668,  35999.37244981,  0.32327364,  0.0       ],
+    [ 0.00001847,  0.00007882, -0.00813131,  19140.30268499,  0.44441088, -0.29257343],
+    [-0.00011607, -0.00013253, -0.00183714,   3034.74612775,  0.21252668,  0.20469106],
+    [-0.00125060, -0.00050991,  0.00193609,   1222.49362201, -0.41897216, -0.28867794],
+    [-0.00196176, -0.00004397, -0.00242939,    428.48202785,  0.40805281,  0.04240589],
+    [ 0.00026291,  0.00005105,  0.00035372,    218.45945325, -0.32241464, -0.00508664],
+    [-0.00031596,  0.00005170,  0.00004818,    145.20780515, -0.04062942, -0.01183482]])
+
+# Sun / body mass ratios (system masses), for the barycentre offset
+MASS_RATIOS = np.array([6023600., 408523.71, 328900.56, 3098708., 1047.3486,
+                        3497.898, 22902.98, 19412.24, 1.352e8])
+
+# Interval the elements are valid for (UTC dates)
+VALID_SPAN = ('1800-01-01', '2050-01-01')
+
+# Largest position error (km) against DE within VALID_SPAN, relative to the
+# solar system barycentre, by NAIF ID (see Comments). Largest measured
+# against DE421 over 1900-2050: Sun 2433, Mercury 8003, Venus 15052,
+# Earth-Moon barycentre 16400, Mars 100693, Jupiter 1.86e6, Saturn
+# 4.97e6, Uranus 1.66e6, Neptune 1.61e6, Pluto 1.40e6.
+ERROR_BOUND_KM = {10: 4000., 1: 12000., 2: 23000., 3: 25000., 4: 150000.,
+                  5: 2.8e6, 6: 7.5e6, 7: 2.5e6, 8: 2.4e6, 9: 2.1e6}
+
+# Bodies evaluated as another body's barycentre
+ALIASES = {199: 1, 299: 2, 399: 3}
+
+# Seconds per Julian century
+CENTURY = 36525. * 86400.
+
+# Frames built from the analytic positions rather than SPICE (see Comments)
+DERIVED_FRAMES = ('HEE',)
+
+
+# Method for the heliocentric ECLIPJ2000 positions (AU) of every body in
+# BODIES at ET epochs, (9, N, 3) in one Kepler solve
+def heliocentric(et):
+    T = np.asarray(et, dtype=np.float64).ravel() / CENTURY
+    a, e, inc, L, varpi, node = (ELEMENTS[:,k,None] + RATES[:,k,None] * T[None]
+                                 for k in range(6))
+    return Kepler.positions(a, e, inc, node, varpi - node, L - varpi)
+
+
+# Method for the position (AU) of the solar system barycentre relative to
+# the Sun, from heliocentric positions (9, N, 3)
+def barycentreOffset(helio):
+    mu = 1. / MASS_RATIOS
+    return np.einsum('b,bnj->nj', mu, helio) / (1. + mu.sum())
+
+
+# Method for the (N,3,3) rotations from J2000 to HEE at ET epochs, given
+# the J2000 Sun-Earth vectors (N,3): +Z the ecliptic pole of date, +X the
+# Sun-Earth vector's component in the ecliptic, as the frames kernel does
+def heeTransforms(et, sunEarth):
+    z = Pyprika.SpiceBase.frameTransforms('J2000', 'ECLIPDATE', et)[:,2]
+    x = sunEarth - np.sum(sunEarth * z, axis=1)[:,None] * z
+    x /= np.linalg.norm(x, axis=1)[:,None]
+    return np.stack([x, np.cross(z, x), z], axis=1)
+
+
+# Method for the error bound (km) of a body's analytic position
+def errorBound(target):
+    target = ALIASES.get(int(target), int(target))
+    return ERROR_BOUND_KM[target]
+
+
+# Ephemeris backend from mean elements, same interface as SpiceBackend
+class AnalyticBackend(object):
+    """Positions (km) and states (km, km/s) of target relative to obs"""
+    def __init__(self):
+        super(AnalyticBackend, self).__init__()
+
+        # Barycentric positions of the last epoch array, shared by the
+        # per-body calls of one SolSystem query
+        self._lastKey = None
+        self._last = None
+
+    # Method for barycentric ECLIPJ2000 positions (km) of the Sun (row 0)
+    # and BODIES (rows 1-9) at ET epochs
+    def barycentric(self, et):
+        key = (et.size, hash(et.tobytes()))
+        if key != self._lastKey:
+            helio = heliocentric(et)
+            offset = barycentreOffset(helio)
+            self._last = np.concatenate([-offset[None], helio - offset[None]]) * AU_KM
+            self._lastKey = key
+        return self._last
+
+    # Private method for the row of a NAIF ID in barycentric(), None for
+    # the barycentre itself
+    @staticmethod
+    def __row(body):
+        body = ALIASES.get(int(body), int(body))
+        if body == 0:
+            return None
+        if body == 10:
+            return 0
+        if body not in BODIES:
+            raise ValueError('Body {0} has no analytic elements'.format(body))
+        return body
+
+    def position(self, target, et, frame='J2000', obs=0):
+        et = np.asarray(et, dtype=np.float64).ravel()
+        bary = self.barycentric(et)
+        rows = [self.__row(target), self.__row(obs)]
+        pos = bary[rows[0]] if rows[0] is not None else np.zeros((et.size, 3))
+        if rows[1] is not None:
+            pos = pos - bary[rows[1]]
+        rot = self.frameTransforms('ECLIPJ2000', frame, et)
+        return np.einsum('nij,nj->ni', rot, pos)
+
+    # Method for the (N,3,3) rotations from one frame to another at ET
+    # epochs, same interface as SpiceBase.frameTransforms. Frames in
+    # DERIVED_FRAMES use the analytic Earth, frames SPICE cannot evaluate
+    # from the loaded kernels raise ValueError.
+    def frameTransforms(self, fromFrame, toFrame, et):
+        et = np.asarray(et, dtype=np.float64).ravel()
+        if fromFrame == toFrame or not {fromFrame, toFrame} & set(DERIVED_FRAMES):
+            return self.__spiceTransforms(fromFrame, toFrame, et)
+        toRot, fromRot = (self.__fromJ2000(frame, et) for frame in (toFrame, fromFrame))
+        return np.einsum('nij,nkj->nik', toRot, fromRot)
+
+    # Private method for the rotations from J2000 to `frame`
+    def __fromJ2000(self, frame, et):
+        if frame != 'HEE':
+            return self.__spiceTransforms('J2000', frame, et)
+        bary = self.barycentric(et)
+        rot = self.__spiceTransforms('ECLIPJ2000', 'J2000', et)
+        return heeTransforms(et, np.einsum('nij,nj->ni', rot, bary[3] - bary[0]))
+
+    @staticmethod
+    def __spiceTransforms(fromFrame, toFrame, et):
+        try:
+            return Pyprika.SpiceBase.frameTransforms(fromFrame, toFrame, et)
+        except spice.stypes.SpiceyError as e:
+            raise ValueError("No {0} to {1} rotation from the analytic backend's "
+                             "kernels (frames defined by ephemeris data need an "
+                             "SPK): {2}".format(fromFrame, toFrame, e.short or e))
+
+    # States with velocities by central difference over `h` seconds
+    def state(self, target, et, frame='J2000', obs=0, h=60.):
+        et = np.asarray(et, dtype=np.float64).ravel()
+        vel = (self.position(target, et + h, frame, obs) -
+               self.position(target, et - h, frame, obs)) / (2. * h)
+        return np.concatenate([self.position(target, et, frame, obs), vel], axis=1)
@@ -0,0 +1,249 @@
+"""
+BodyCatalog
+
+Purpose: Data-driven registry of the bodies SolBirthday can show, held as
+         one struct-of-arrays (labels, NAIF IDs, groups, radii, periods,
+         colours, orbital elements and orbit tracks) rather than one object
+         per body, so catalogs of thousands of small bodies stay compact
+         and are evaluated in vectorised batches.
+
+Comments:
+    Catalogs are CSV files with a header row; lines starting with '#' are
+    comments, except '#kernel <path>' which names an extra SPICE kernel
+    (relative to the catalog file) needed by the catalog's SPK bodies.
+    Columns:
+
+        label        unique name shown for the body
+        naif         NAIF name or integer ID, for bodies evaluated from SPK
+        group        free-form group name ('sun' and 'planet' are the
+                     SolSystem bodies, anything else is drawn as a group)
+        axis         'inner' or 'outer' system axis to draw on
+        radiusKm     body radius in km
+        periodYears  orbital period in Earth years (derived from a if empty)
+        color        matplotlib colour
+        a, e, i, node, peri, M, epoch
+                     optional heliocentric ECLIPJ2000 elements (AU and
+                     degrees, mean anomaly M at the UTC date epoch). Rows
+                     with elements are propagated analytically (model.Kepler)
+                     instead of from SPK.
+
+    Orbit tracks are TRACK_SAMPLES points per body in one (N, S, 3) float32
+    array: element bodies are sampled analytically (evenly in eccentric
+    anomaly), SPK bodies over one period from 1850 like Planet.getOrbit.
+    Positions are heliocentric for element bodies and barycentric for SPK
+    bodies, both expressed in the requested frame relative to `obs`.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import csv
+import hashlib
+
+import numpy as np
+
+from . import Pyprika
+from . import Kepler
+
+# Catalog of the SolSystem figure bodies shipped with the repository
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', 'assets', 'catalog')
+DEFAULT_CATALOG = os.path.join(ASSET_DIR, 'solsystem.csv')
+
+# Points per catalog orbit track
+TRACK_SAMPLES = 96
+
+ELEMENTS = ('a', 'e', 'i', 'node', 'peri', 'M')
+DEFAULT_COLOR = '#8c8c8c'
+
+
+class BodyCatalog(object):
+    """Struct-of-arrays body registry with vectorised positions and tracks"""
+    def __init__(self, labels, naif, groups, axes, radiusKm, periodYears, colors,
+                 elements=None, epochs=None, kernels=()):
+        super(BodyCatalog, self).__init__()
+
+        n = len(labels)
+        self.labels = np.asarray(labels, dtype=str).reshape(n)
+        self.naif = np.asarray(naif, dtype=str).reshape(n)
+        self.groups = np.asarray(groups, dtype=str).reshape(n)
+        self.axes = np.asarray(axes, dtype=str).reshape(n)
+        self.radiusKm = np.asarray(radiusKm, dtype=np.float64).reshape(n)
+        self.colors = np.asarray(colors, dtype=str).reshape(n)
+        self.kernels = list(kernels)
+
+        # Elements (N, 6) and their epochs (ET), NaN for SPK bodies
+        self.elements = (np.full((n, 6), np.nan) if elements is None else
+                         np.asarray(elements, dtype=np.float64).reshape(n, 6))
+        self.epochs = (np.full(n, np.nan) if epochs is None else
+                       np.asarray(epochs, dtype=np.float64).reshape(n))
+        self.analytic = ~np.isnan(self.elements[:,0])
+        if np.any(self.elements[self.analytic,1] >= 1.):
+            raise ValueError('Only elliptical orbits (e < 1) are supported')
+
+        periodYears = np.asarray(periodYears, dtype=np.float64).reshape(n)
+        elementPeriods = 360. / Kepler.meanMotion(self.elements[:,0]) / Pyprika.DAYS_PER_YEAR
+        self.periodYears = np.where(np.isnan(periodYears) & self.analytic,
+                                    elementPeriods, periodYears)
+
+        # NAIF IDs resolved when first needed (requires the kernels)
+        self._ids = None
+
+        # Orbit tracks, filled by buildTracks
+        self.tracks = np.full((n, TRACK_SAMPLES, 3), np.nan, dtype=np.float32)
+        self.hasTrack = np.zeros(n, dtype=bool)
+
+        if len(set(self.labels)) != n:
+            raise ValueError('Catalog labels must be unique')
+        self._index = {label: i for i, label in enumerate(self.labels)}
+
+    # Method for reading a catalog CSV file
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOG):
+        kernels, lines = [], []
+        with open(path) as f:
+            for line in f:
+                if line.startswith('#kernel '):
+                    kernels.append(os.path.join(os.path.dirname(os.path.abspath(path)),
+                                                line[len('#kernel '):].strip()))
+                elif line.strip() and not line.startswith('#'):
+                    lines.append(line)
+        rows = list(csv.DictReader(lines))
+
+        def column(name, default=''):
+            return [(row.get(name) or default).strip() for row in rows]
+
+        def numbers(name):
+            return np.array([float(v) if v else np.nan for v in column(name)])
+
+        epochs = np.full(len(rows), np.nan)
+        epochDates = column('epoch')
+        withEpoch = [k for k, v in enumerate(epochDates) if v]
+        if withEpoch:
+            epochs[withEpoch] = Pyprika.SpiceBase.convertDateToET(
+                [epochDates[k] for k in withEpoch])
+
+        elements = np.column_stack([numbers(name) for name in ELEMENTS])
+        missing = np.isnan(elements).any(axis=1) & ~np.isnan(elements).all(axis=1)
+        if missing.any() or np.any(~np.isnan(elements[:,0]) & np.isnan(epochs)):
+            raise ValueError('{0}: rows with elements need all of {1} and '
+                             'epoch'.format(path, ', '.join(ELEMENTS)))
+        noSource = np.isnan(elements[:,0]) & (np.array(column('naif')) == '')
+        if noSource.any():
+            raise ValueError('{0}: row {1} has neither a NAIF body nor '
+                             'elements'.format(path, int(np.argmax(noSource)) + 1))
+
+        return cls(column('label'), column('naif'), column('group', 'other'),
+                   column('axis', 'outer'), numbers('radiusKm'), numbers('periodYears'),
+                   column('color', DEFAULT_COLOR), elements, epochs, kernels)
+
+    # Method for joining catalogs (labels must stay unique)
+    @classmethod
+    def concatenate(cls, catalogs):
+        catalogs = list(catalogs)
+        joined = cls(*[np.concatenate([getattr(c, name) for c in catalogs])
+                       for name in ('labels', 'naif', 'groups', 'axes', 'radiusKm',
+                                    'periodYears', 'colors', 'elements', 'epochs')],
+                     kernels=[k for c in catalogs for k in c.kernels])
+        joined.tracks = np.concatenate([c.tracks for c in catalogs])
+        joined.hasTrack = np.concatenate([c.hasTrack for c in catalogs])
+        return joined
+
+    def __len__(self):
+        return self.labels.size
+
+    # Method for the row of a label
+    def index(self, label):
+        return self._index[label]
+
+    # Method for the rows of a group (all rows if group is None)
+    def select(self, group=None):
+        return np.flatnonzero(self.groups == group) if group else np.arange(len(self))
+
+    # Property for the group names in order of first appearance
+    @property
+    def groupNames(self):
+        names, first = np.unique(self.groups, return_index=True)
+        return list(names[np.argsort(first)])
+
+    # Property for the NAIF IDs of the SPK bodies (0 for element bodies)
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = np.array([0 if analytic else
+                                  int(name) if name.lstrip('-').isdigit() else
+                                  Pyprika.SpiceBase.naifID(str(name))
+                                  for name, analytic in zip(self.naif, self.analytic)],
+                                 dtype=np.int64)
+        return self._ids
+
+    # Property for a digest of the catalog contents and its kernel files
+    @property
+    def fingerprint(self):
+        sha = hashlib.sha1()
+        for name in ('labels', 'naif', 'groups', 'axes', 'radiusKm', 'periodYears',
+                     'colors', 'elements', 'epochs'):
+            sha.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+        for kern in self.kernels:
+            st = os.stat(kern)
+            sha.update('{0}|{1}|{2}'.format(kern, st.st_size, st.st_mtime_ns).encode())
+        return sha.hexdigest()
+
+    # Property for the memory held by the catalog arrays (bytes)
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in
+                   ('labels', 'naif', 'groups', 'axes', 'radiusKm', 'periodYears',
+                    'colors', 'elements', 'epochs', 'analytic', 'tracks', 'hasTrack'))
+
+    # Method for the positions (AU) of rows `index` at epochs `et`, in
+    # frame relative to obs. Returns (len(index), len(et), 3).
+    def positions(self, et, frame='HCI', obs='SOLAR SYSTEM BARYCENTER', backend=None,
+                  index=None):
+        et = np.asarray(et, dtype=np.float64).ravel()
+        index = np.arange(len(self)) if index is None else np.asarray(index)
+        backend = backend or Pyprika.resolveBackend(None)
+        obsID = Pyprika.SpiceBase.naifID(obs)
+        out = np.empty((index.size, et.size, 3))
+
+        analytic = self.analytic[index]
+        if analytic.any():
+            rows = index[analytic]
+            el = self.elements[rows]
+            # Mean anomaly at every epoch for every row in one expression
+            M = (el[:,5,None] + Kepler.meanMotion(el[:,0])[:,None] *
+                 (et[None,:] - self.epochs[rows,None]) / 86400.)
+            pos = Kepler.positions(*[el[:,k,None] for k in range(5)], M)
+            rot = Pyprika.frameTransforms('ECLIPJ2000', frame, et, backend)
+            pos = np.einsum('tij,ntj->nti', rot, pos)
+            sun = backend.position(10, et, frame=frame, obs=obsID) / Pyprika.KM_PER_AU
+            out[analytic] = pos + sun[None]
+
+        for k in np.flatnonzero(~analytic):
+            out[k] = backend.position(self.ids[index[k]], et, frame=frame,
+                                      obs=obsID) / Pyprika.KM_PER_AU
+        return out
+
+    # Method for computing the orbit tracks of rows `index` (default: all
+    # without one) in HCI relative to the solar system barycentre
+    def buildTracks(self, backend=None, index=None):
+        index = np.flatnonzero(~self.hasTrack) if index is None else np.asarray(index)
+        backend = backend or Pyprika.resolveBackend(None)
+
+        analytic = index[self.analytic[index]]
+        if analytic.size:
+            el = self.elements[analytic]
+            rot = Pyprika.SpiceBase.frameTransform('ECLIPJ2000', 'HCI', 0.)
+            self.tracks[analytic] = Kepler.sampleOrbits(*el[:,:5].T, TRACK_SAMPLES) @ rot.T
+
+        et0 = Pyprika.SpiceBase.convertDateToET('1850-01-01')[0]
+        for k in index[~self.analytic[index]]:
+            period = self.periodYears[k] * Pyprika.DAYS_PER_YEAR * 86400.
+            et = et0 + np.linspace(0., period, TRACK_SAMPLES)
+            self.tracks[k] = backend.position(self.ids[k], et, frame='HCI',
+                                              obs=0) / Pyprika.KM_PER_AU
+        self.hasTrack[index] = True
+        return self.tracks[index]
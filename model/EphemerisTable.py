@@ -0,0 +1,300 @@
+"""
+EphemerisTable
+
+Purpose: Compact precomputed ephemeris for the SolSystem bodies over the
+         kernel span, interpolated with cubic Hermite polynomials. Enough
+         precision for plotting at a fraction of the cost of full SPICE
+         evaluation.
+
+Comments:
+    File layout (little endian, version 1):
+
+        8 bytes   magic b'SOLEPH\\0\\0'
+        uint32    format version
+        uint32    header length in bytes
+        ...       UTF-8 JSON header (frame, observer, bodies, errors)
+        ...       zero padding to a 64 byte boundary
+        ...       per body: float32 (n, 6) records of position (AU) and
+                  velocity (AU/day) at et0 + k * step
+
+    Each body's cadence is its orbital period / samplesPerOrbit, clipped
+    to [minStepDays, maxStepDays] then shortened to divide the span. Files
+    are opened with np.memmap and every body's records are a view into the
+    mapping, so opening copies nothing and worker processes reading the
+    same table share its pages.
+
+    The table can be used directly (getPos, same interface as
+    Pyprika.Planet.getPos) or as a Planet/SolSystem backend
+    (backend='table', the table beside the metakernel). The header records
+    the content hashes of the kernels it was built from, and the backend
+    refuses a table whose kernels are not the ones loaded. A table is
+    identified in the orbit and render caches by its fingerprint, a hash
+    of the header (which includes its build time).
+
+    The worst-case error against the reference ephemeris is measured when
+    the table is built, at every record and ERROR_SAMPLES points across
+    each interval, and stored in the header. With the default cadence it
+    is a few km for the inner planets, largest just past mid-interval; for
+    the outer planets float32 rounding of the records dominates (about
+    300 km at Pluto), so the worst case is at the records themselves.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import json
+import struct
+import hashlib
+import datetime as dt
+
+import numpy as np
+
+from . import Pyprika
+
+MAGIC = b'SOLEPH\x00\x00'
+VERSION = 1
+ALIGN = 64
+
+# Default location of the table built by SolTable.py, beside the default
+# metakernel
+TABLE_NAME = 'solsystem.eph'
+DEFAULT_TABLE = os.path.join(os.path.dirname(Pyprika.DEFAULT_MK), TABLE_NAME)
+
+# Default cadence tuning
+SAMPLES_PER_ORBIT = 128
+MIN_STEP_DAYS = 0.5
+MAX_STEP_DAYS = 32.
+
+# Points per interval (from its first record) at which errors are measured
+ERROR_SAMPLES = 8
+
+
+# Method for the table the 'table' backend uses with metakernel `mk`
+def tableFor(mk=None):
+    if mk is None:
+        return DEFAULT_TABLE
+    return os.path.join(os.path.dirname(mk), TABLE_NAME)
+
+
+# Class reading (and building) versioned memory-mapped ephemeris tables
+class EphemerisTable(object):
+    """Hermite interpolated positions/velocities from a compact float32 table"""
+    # Tables opened from disk, keyed on absolute path
+    _opened = {}
+
+    def __init__(self, buffer, path=None):
+        super(EphemerisTable, self).__init__()
+
+        self.path = path
+        raw = np.frombuffer(buffer, dtype=np.uint8)
+        if bytes(raw[:8]) != MAGIC:
+            raise ValueError('{0} is not an ephemeris table'.format(path or 'buffer'))
+        version, headerLen = struct.unpack('<II', bytes(raw[8:16]))
+        if version != VERSION:
+            raise ValueError('Unsupported ephemeris table version {0} '
+                             '(expected {1})'.format(version, VERSION))
+        headerText = bytes(raw[16:16 + headerLen])
+        self.header = json.loads(headerText.decode('utf-8'))
+        self.fingerprint = hashlib.sha1(headerText).hexdigest()
+
+        self.frame = self.header['frame']
+        self.obs = self.header['obsID']
+
+        # Zero copy (n, 6) float32 views of each body's records
+        self.bodies = {}
+        for body in self.header['bodies']:
+            body = dict(body)
+            body['data'] = np.ndarray((body['n'], 6), dtype='<f4', buffer=raw,
+                                      offset=body['offset'])
+            self.bodies[body['id']] = body
+
+        # Rotations out of the table frame for time invariant frames
+        self._rotations = {}
+
+    # Method for opening (or reusing) a table file through a memory map
+    @classmethod
+    def open(cls, path=DEFAULT_TABLE):
+        path = os.path.abspath(path)
+        if path not in cls._opened:
+            if not os.path.exists(path):
+                raise IOError('No ephemeris table at {0}, build one with '
+                              'SolTable.py'.format(path))
+            cls._opened[path] = cls(np.memmap(path, dtype=np.uint8, mode='r'), path)
+        return cls._opened[path]
+
+    # Method for checking the table was built from loaded kernels (content
+    # hashes as in KernelPool.hashes), raises ValueError if not
+    def checkKernels(self, hashes=None):
+        hashes = Pyprika.KernelPool.hashes if hashes is None else hashes
+        missing = [kern for kern, kernHash in self.header['kernels'].items()
+                   if kernHash not in hashes.values()]
+        if missing:
+            raise ValueError('Ephemeris table {0} was built from kernels that are '
+                             'not loaded ({1}), rebuild it with SolTable.py'.format(
+                                 self.path, ', '.join(missing)))
+
+    # Method for the labels of the tabulated bodies
+    @property
+    def labels(self):
+        return [b['label'] for b in self.header['bodies']]
+
+    # Method for Hermite interpolation of a body's state in the table frame
+    # relative to the table observer, in AU and AU/day
+    def interpolate(self, target, et, velocity=False):
+        try:
+            body = self.bodies[int(target)]
+        except (KeyError, ValueError):
+            raise ValueError('Body {0} is not in the ephemeris table'.format(target))
+        et = np.asarray(et, dtype=np.float64).ravel()
+
+        x = (et - body['et0']) / body['step']
+        if x.size and (x.min() < -1e-9 or x.max() > body['n'] - 1 + 1e-9):
+            raise ValueError('Epoch outside the ephemeris table span')
+        i = np.clip(np.floor(x).astype(np.int64), 0, body['n'] - 2)
+        s = (x - i)[:,None]
+
+        h = body['step'] / 86400.
+        rec0 = body['data'][i].astype(np.float64)
+        rec1 = body['data'][i + 1].astype(np.float64)
+        p0, v0, p1, v1 = rec0[:,:3], rec0[:,3:] * h, rec1[:,:3], rec1[:,3:] * h
+
+        s2, s3 = s * s, s * s * s
+        pos = ((2.*s3 - 3.*s2 + 1.) * p0 + (s3 - 2.*s2 + s) * v0 +
+               (3.*s2 - 2.*s3) * p1 + (s3 - s2) * v1)
+        if not velocity:
+            return pos
+        vel = ((6.*s2 - 6.*s) * p0 + (3.*s2 - 4.*s + 1.) * v0 +
+               (6.*s - 6.*s2) * p1 + (3.*s2 - 2.*s) * v1) / h
+        return np.concatenate([pos, vel], axis=1)
+
+    # Method for the rotation from the table frame to frame (None if same)
+    def rotation(self, frame):
+        if frame == self.frame:
+            return None
+        if frame not in self._rotations:
+            r0 = Pyprika.SpiceBase.frameTransform(self.frame, frame, 0.)
+            r1 = Pyprika.SpiceBase.frameTransform(self.frame, frame, 3.15576e9)
+            if not np.allclose(r0, r1, rtol=0, atol=1e-14):
+                raise ValueError('Frame {0} is not fixed relative to the table '
+                                 'frame {1}'.format(frame, self.frame))
+            self._rotations[frame] = r0
+        return self._rotations[frame]
+
+    # Backend interface: state (km, km/s) of target relative to obs
+    def state(self, target, et, frame='J2000', obs=0, velocity=True):
+        st = self.interpolate(target, et, velocity)
+        if int(obs) != self.obs:
+            st = st - self.interpolate(obs, et, velocity)
+
+        rot = self.rotation(frame)
+        if rot is not None:
+            st = np.concatenate([st[:,i:i+3] @ rot.T for i in range(0, st.shape[1], 3)],
+                                axis=1)
+        st = st * Pyprika.KM_PER_AU
+        if velocity:
+            st[:,3:] /= 86400.
+        return st
+
+    # Backend interface: position (km) of target relative to obs
+    def position(self, target, et, frame='J2000', obs=0):
+        return self.state(target, et, frame=frame, obs=obs, velocity=False)
+
+    # Method with the same interface as Pyprika.Planet.getPos for a body
+    # given by table label (e.g. 'MARS') or NAIF ID
+    def getPos(self, body, time, frame='HCI', obs='SUN'):
+        target = (self.header['bodies'][self.labels.index(body)]['id'] if body in self.labels
+                  else int(body))
+        et = Pyprika.SpiceBase.convertDateToET(time)
+        obsID = Pyprika.SpiceBase.naifID(obs)
+        pos = self.position(target, et, frame=frame, obs=obsID)
+        solDistance = np.linalg.norm(self.position(target, et[:1], frame=self.frame,
+                                                   obs=10)[0])
+        return pos / Pyprika.KM_PER_AU, solDistance / Pyprika.KM_PER_AU
+
+    # Method for the largest position error (km) per body against a
+    # reference backend, evaluated at `samples` evenly spaced points of
+    # every interval and at the last record
+    def maxErrors(self, reference, samples=ERROR_SAMPLES):
+        errors = {}
+        for body in self.header['bodies']:
+            x = np.append(np.arange((body['n'] - 1) * samples) / float(samples),
+                          body['n'] - 1)
+            et = body['et0'] + body['step'] * x
+            ref = reference.position(body['id'], et, frame=self.frame, obs=self.obs)
+            errors[body['label']] = float(np.max(np.linalg.norm(
+                self.position(body['id'], et, frame=self.frame, obs=self.obs) - ref,
+                axis=1)))
+        return errors
+
+    # Method for building a table for the bodies of a SolSystem
+    @classmethod
+    def build(cls, outFile, solSystem, start=None, end=None, frame='HCI',
+              obs='SOLAR SYSTEM BARYCENTER', samplesPerOrbit=SAMPLES_PER_ORBIT,
+              minStepDays=MIN_STEP_DAYS, maxStepDays=MAX_STEP_DAYS, reference=None):
+        """Write the table to outFile and return it (opened from disk)
+
+        States are taken from `reference` (default: CSPICE) and the
+        worst-case interpolation error against it is stored in the header.
+        """
+        reference = reference or Pyprika.SpiceBackend()
+        start, end = start or Pyprika.KERNEL_SPAN[0], end or Pyprika.KERNEL_SPAN[1]
+        et0, et1 = Pyprika.SpiceBase.convertDateToET([start, end])
+        obsID = Pyprika.SpiceBase.naifID(obs)
+
+        bodies, blocks, offset = [], [], 0
+        for label, planet in solSystem.bodies.items():
+            stepDays = np.clip(planet.orbPeriodInEarthYears * Pyprika.DAYS_PER_YEAR /
+                               samplesPerOrbit, minStepDays, maxStepDays)
+            # Shorten the step slightly so the grid ends exactly at et1
+            n = int(np.ceil((et1 - et0) / (stepDays * 86400.))) + 1
+            step = (et1 - et0) / (n - 1)
+            st = reference.state(planet.ID, et0 + step * np.arange(n),
+                                 frame=frame, obs=obsID)
+            data = np.empty((n, 6), dtype='<f4')
+            data[:,:3] = st[:,:3] / Pyprika.KM_PER_AU
+            data[:,3:] = st[:,3:] * 86400. / Pyprika.KM_PER_AU
+            bodies.append(dict(label=label, id=int(planet.ID), et0=float(et0),
+                               step=float(step), n=n, offset=offset,
+                               periodInEarthYears=planet.orbPeriodInEarthYears))
+            blocks.append(data)
+            offset += data.nbytes
+
+        header = dict(frame=frame, obs=obs, obsID=int(obsID), start=start, end=end,
+                      units=dict(position='AU', velocity='AU/day', kmPerAU=Pyprika.KM_PER_AU),
+                      samplesPerOrbit=samplesPerOrbit, created=dt.datetime.now().isoformat(),
+                      kernels=dict(Pyprika.KernelPool.hashes), bodies=bodies)
+
+        # Measure the errors on an in-memory copy, then write them with it
+        table = cls(cls.__pack(header, blocks))
+        header['maxErrorKm'] = table.maxErrors(reference)
+
+        tmp = '{0}.{1}.tmp'.format(outFile, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(cls.__pack(header, blocks))
+        os.replace(tmp, outFile)
+        cls._opened.pop(os.path.abspath(outFile), None)
+        return cls.open(outFile)
+
+    # Private method serialising header and data blocks, the data offsets
+    # in the header are made absolute here
+    @staticmethod
+    def __pack(header, blocks):
+        # Header length depends on the offsets written into it, iterate
+        # until the padded data start is stable
+        dataStart, relative = 0, [b['offset'] for b in header['bodies']]
+        while True:
+            for body, rel in zip(header['bodies'], relative):
+                body['offset'] = dataStart + rel
+            text = json.dumps(header, sort_keys=True).encode('utf-8')
+            start = -(-(16 + len(text)) // ALIGN) * ALIGN
+            if start == dataStart:
+                break
+            dataStart = start
+        for body, rel in zip(header['bodies'], relative):
+            body['offset'] = rel
+        return b''.join([MAGIC, struct.pack('<II', VERSION, len(text)), text,
+                         b'\x00' * (dataStart - 16 - len(text))] +
+                        [b.tobytes() for b in blocks])
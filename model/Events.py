@@ -0,0 +1,127 @@
+"""
+Events
+
+Purpose: Event search over the kernel span: solar returns ("Sol
+         birthdays") and heliocentric conjunctions/oppositions.
+
+Comments:
+    Events are found in two vectorised stages. A coarse grid, spaced at a
+    fraction of the relevant period, brackets every sign change of the
+    wrapped angle difference; all brackets are then refined together with
+    the Illinois (modified regula falsi) method, so each refinement
+    iteration is a single batched ephemeris query rather than a dense
+    sampling of the whole span.
+
+    Longitudes are heliocentric ecliptic longitudes in ECLIPJ2000.
+    Conjunctions/oppositions are heliocentric (equal/opposite longitude as
+    seen from the Sun).
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import numpy as np
+
+# Event kinds
+SOLAR_RETURN = 0
+CONJUNCTION = 1
+OPPOSITION = 2
+
+# Compact record layout for found events
+EVENT_DTYPE = np.dtype([('et', np.float64),
+                        ('kind', np.int8),
+                        ('body', np.int32),
+                        ('other', np.int32)])
+
+# Coarse grid samples per period (of the angle being searched)
+SAMPLES_PER_PERIOD = 16
+
+
+# Method for wrapping angles into [-pi, pi)
+def wrapAngle(a):
+    return (a + np.pi) % (2. * np.pi) - np.pi
+
+
+# Method for finding every epoch in [et0, et1] where
+# wrap(angleFunc(et) - target) passes through zero
+def findCrossings(angleFunc, target, et0, et1, step, tol=1e-3, maxIter=60):
+    """Return sorted epochs of the zero crossings of the wrapped angle
+
+    `angleFunc` maps an array of ET to angles (radians). `step` must be
+    small enough that the angle changes by well under pi between samples.
+    Roots are refined to `tol` seconds.
+    """
+    def g(et):
+        return wrapAngle(angleFunc(et) - target)
+
+    # Coarse bracketing
+    grid = np.append(np.arange(et0, et1, step), et1)
+    fg = g(grid)
+    cross = ((fg[:-1] < 0) != (fg[1:] < 0)) & (np.abs(fg[1:] - fg[:-1]) < np.pi)
+    a, b = grid[:-1][cross], grid[1:][cross]
+    fa, fb = fg[:-1][cross], fg[1:][cross]
+
+    # Exact hits on the grid need no refinement
+    active = fb != 0
+
+    # Vectorised Illinois refinement of all brackets at once
+    for i in range(maxIter):
+        idx = np.nonzero(active)[0]
+        if idx.size == 0:
+            break
+        c = b[idx] - fb[idx] * (b[idx] - a[idx]) / (fb[idx] - fa[idx])
+        fc = g(c)
+
+        # Root between c and b: old b becomes the other end of the bracket,
+        # otherwise halve the retained end's value (Illinois modification)
+        flip = (fc < 0) != (fb[idx] < 0)
+        a[idx[flip]], fa[idx[flip]] = b[idx[flip]], fb[idx[flip]]
+        fa[idx[~flip]] *= 0.5
+
+        moved = np.abs(c - b[idx])
+        b[idx], fb[idx] = c, fc
+        active[idx] = (moved > tol) & (fc != 0)
+
+    return np.sort(b)
+
+
+# Method for packing epochs into an EVENT_DTYPE array
+def makeEvents(et, kind, body, other=-1):
+    events = np.empty(len(et), dtype=EVENT_DTYPE)
+    events['et'] = et
+    events['kind'] = kind
+    events['body'] = body
+    events['other'] = other
+    return events
+
+
+# Method for finding solar returns of a body with heliocentric longitude
+# function lonFunc and orbital period (seconds)
+def solarReturns(lonFunc, bodyID, birthET, et0, et1, period, tol=1e-3):
+    target = lonFunc(np.array([birthET]))[0]
+    et = findCrossings(lonFunc, target, et0, et1, period / SAMPLES_PER_PERIOD,
+                       tol=tol)
+    # Drop the birth instant itself
+    return makeEvents(et[np.abs(et - birthET) > tol], SOLAR_RETURN, bodyID)
+
+
+# Method for finding heliocentric conjunctions (and oppositions) of two
+# bodies given their longitude functions and periods (seconds)
+def conjunctions(lonFuncA, lonFuncB, bodyA, bodyB, et0, et1, periodA,
+                 periodB, oppositions=True, tol=1e-3):
+    # Relative longitude repeats on the synodic period
+    synodic = 1. / abs(1. / periodA - 1. / periodB) if periodA != periodB else np.inf
+    step = min(periodA, periodB, synodic) / SAMPLES_PER_PERIOD
+
+    def delta(et):
+        return lonFuncA(et) - lonFuncB(et)
+
+    events = [makeEvents(findCrossings(delta, 0., et0, et1, step, tol=tol),
+                         CONJUNCTION, bodyA, bodyB)]
+    if oppositions:
+        events.append(makeEvents(findCrossings(delta, np.pi, et0, et1, step, tol=tol),
+                                 OPPOSITION, bodyA, bodyB))
+    events = np.concatenate(events)
+    return events[np.argsort(events['et'], kind='stable')]
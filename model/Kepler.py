@@ -0,0 +1,78 @@
+"""
+Kepler
+
+Purpose: Vectorised two-body (Keplerian) orbit propagation from classical
+         orbital elements, for bodies given by element tables rather than
+         SPK kernels.
+
+Comments:
+    Elements are heliocentric, referred to the ecliptic and equinox of
+    J2000 (ECLIPJ2000): semi-major axis a (AU), eccentricity e (< 1),
+    inclination i, longitude of the ascending node, argument of perihelion
+    and mean anomaly (degrees). Every function broadcasts over its
+    arguments, so thousands of bodies at many epochs are one array
+    expression.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import numpy as np
+
+# Gaussian gravitational constant (rad/day, AU, solar masses)
+GAUSS_K = 0.01720209895
+
+
+# Method for the mean motion (degrees/day) of an orbit of semi-major axis a (AU)
+def meanMotion(a):
+    return np.degrees(GAUSS_K / np.asarray(a, dtype=np.float64)**1.5)
+
+
+# Method for solving Kepler's equation M = E - e sin(E) for the eccentric
+# anomaly E (radians), by Newton iteration on whole arrays
+def solveKepler(M, e, tol=1e-12, maxIter=30):
+    M = np.remainder(np.asarray(M, dtype=np.float64), 2. * np.pi)
+    e = np.asarray(e, dtype=np.float64)
+    E = np.where(e < 0.8, M, np.pi)
+    for i in range(maxIter):
+        dE = (E - e * np.sin(E) - M) / (1. - e * np.cos(E))
+        E = E - dE
+        if np.all(np.abs(dE) < tol):
+            break
+    return E
+
+
+# Method for positions (AU, ECLIPJ2000) at eccentric anomalies E (radians)
+def positionsFromAnomaly(E, a, e, i, node, peri):
+    a, e = np.asarray(a, dtype=np.float64), np.asarray(e, dtype=np.float64)
+    i, node, peri = (np.radians(np.asarray(x, dtype=np.float64)) for x in (i, node, peri))
+
+    # Position in the orbital plane, perihelion along x
+    xp = a * (np.cos(E) - e)
+    yp = a * np.sqrt(1. - e * e) * np.sin(E)
+
+    cw, sw = np.cos(peri), np.sin(peri)
+    cn, sn = np.cos(node), np.sin(node)
+    ci, si = np.cos(i), np.sin(i)
+    x = (cw * cn - sw * sn * ci) * xp + (-sw * cn - cw * sn * ci) * yp
+    y = (cw * sn + sw * cn * ci) * xp + (-sw * sn + cw * cn * ci) * yp
+    z = (sw * si) * xp + (cw * si) * yp
+    return np.stack([x, y, z], axis=-1)
+
+
+# Method for positions (AU, ECLIPJ2000) from elements with mean anomaly M
+# (degrees)
+def positions(a, e, i, node, peri, M):
+    E = solveKepler(np.radians(M), e)
+    return positionsFromAnomaly(E, a, e, i, node, peri)
+
+
+# Method for `samples` positions around each orbit, evenly spaced in
+# eccentric anomaly (denser near perihelion), first point repeated last.
+# Elements of shape (N,) give an (N, samples, 3) array.
+def sampleOrbits(a, e, i, node, peri, samples):
+    E = np.linspace(0., 2. * np.pi, samples)
+    args = [np.asarray(x, dtype=np.float64)[..., None] for x in (a, e, i, node, peri)]
+    return positionsFromAnomaly(E, *args)
@@ -0,0 +1,166 @@
+"""
+OrbitCache
+
+Purpose: Persistent on-disk cache for the orbit tracks computed by
+         Pyprika.Planet.getOrbit, stored as memory-mappable NumPy files.
+
+Comments:
+    Entries are keyed on a fingerprint of the metakernel (its contents plus
+    the path, size and modification time of every kernel it furnished), the
+    ephemeris backend, body NAIF ID, frame, observer, number of samples
+    (or level-of-detail tag) and the sampled span (start epoch and orbital
+    period), so tracks from the numpy, table or analytic backends are never
+    served as SPICE output. Each fingerprint has its own subdirectory, so
+    several kernel sets can share one cache; a fingerprint directory unused
+    for MAX_AGE_DAYS is purged the next time an entry is written.
+
+    The furnished kernels are fingerprinted by path, size and modification
+    time rather than by content: hashing a multi-hundred-megabyte SPK on
+    every start-up would cost more than the cache saves. A kernel rewritten
+    in place with the same size and modification time is not detected.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import json
+import time
+import shutil
+import hashlib
+
+import spiceypy as spice
+import numpy as np
+
+from . import Pyprika
+
+
+# Default cache location (honours XDG_CACHE_HOME)
+def defaultCacheDir():
+    base = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'SolBirthday', 'orbits')
+
+# Fingerprint directories not used for this many days are purged
+MAX_AGE_DAYS = 30
+
+
+class OrbitCache(object):
+    """Memory-mapped cache of Planet.orbitPosInAU keyed on kernels and geometry"""
+    def __init__(self, mk, cacheDir=None, backend=None):
+        super(OrbitCache, self).__init__()
+
+        self.mk = mk
+        self.backendName = Pyprika.backendName(backend, mk)
+        self.cacheDir = cacheDir if not cacheDir == None else defaultCacheDir()
+
+        # Fingerprint computed lazily once kernels are furnished, and again
+        # whenever the KernelPool contents change
+        self._kernelHash = None
+        self._generation = -1
+
+    # Property giving the fingerprint of the metakernel and the kernels it
+    # loaded. Requires the metakernel to be furnished.
+    @property
+    def kernelHash(self):
+        if self._kernelHash is None or self._generation != Pyprika.KernelPool.generation:
+            self._generation = Pyprika.KernelPool.generation
+            sha = hashlib.sha1()
+            with open(self.mk, 'rb') as f:
+                sha.update(f.read())
+
+            # Every kernel loaded through this metakernel
+            for k in range(spice.ktotal('ALL')):
+                kern, kType, source, handle = spice.kdata(k, 'ALL', 255, 255, 255)
+                if source != self.mk:
+                    continue
+                st = os.stat(kern)
+                sha.update('{0}|{1}|{2}'.format(os.path.abspath(kern), st.st_size,
+                                                st.st_mtime_ns).encode())
+            self._kernelHash = sha.hexdigest()
+        return self._kernelHash
+
+    # Method for forgetting the fingerprint (call after kernels change)
+    def invalidate(self):
+        self._kernelHash = None
+
+    # Property for the subdirectory holding this fingerprint's entries
+    @property
+    def entryDir(self):
+        return os.path.join(self.cacheDir, self.kernelHash[:16])
+
+    # Method for building the file stem for an entry (see
+    # Planet.orbitCacheKey for the span)
+    def key(self, bodyID, frame, obs, nSamples, span):
+        obs = str(obs).replace(' ', '_')
+        return '{0}_{1}_{2}_{3}_{4}_{5}'.format(self.backendName, bodyID, frame,
+                                                obs, nSamples, span)
+
+    # Method for loading an orbit track, returns None on a miss
+    def load(self, bodyID, frame, obs, nSamples, span):
+        stem = os.path.join(self.entryDir, self.key(bodyID, frame, obs, nSamples, span))
+        try:
+            with open(stem + '.json') as f:
+                meta = json.load(f)
+            pos = np.load(stem + '.npy', mmap_mode='r')
+        except (IOError, OSError, ValueError):
+            return None
+
+        if (meta.get('kernelHash') != self.kernelHash or
+                meta.get('backend') != self.backendName or
+                meta.get('span') != span or pos.ndim != 2):
+            return None
+        self.touch()
+        return pos, meta['solDistanceInAU']
+
+    # Method for writing an orbit track (as returned by Planet.getOrbit, or
+    # (track, None) for tracks without a Sun distance such as orbitLOD)
+    def store(self, bodyID, frame, obs, nSamples, span, orbit):
+        if not os.path.isdir(self.entryDir):
+            os.makedirs(self.entryDir)
+        self.purgeStale()
+
+        stem = os.path.join(self.entryDir, self.key(bodyID, frame, obs, nSamples, span))
+        pid = os.getpid()
+
+        # Write to temporary files then rename so that concurrent readers
+        # never see a partial entry. Array written first, metadata last.
+        with open('{0}.{1}.npy.tmp'.format(stem, pid), 'wb') as f:
+            np.save(f, np.ascontiguousarray(orbit[0], dtype=np.float64))
+        os.replace('{0}.{1}.npy.tmp'.format(stem, pid), stem + '.npy')
+
+        meta = dict(kernelHash=self.kernelHash, backend=self.backendName,
+                    bodyID=int(bodyID), frame=frame,
+                    obs=obs, nSamples=nSamples, span=span,
+                    solDistanceInAU=(None if orbit[1] is None else
+                                     float(np.ravel(orbit[1])[0])))
+        with open('{0}.{1}.json.tmp'.format(stem, pid), 'w') as f:
+            json.dump(meta, f)
+        os.replace('{0}.{1}.json.tmp'.format(stem, pid), stem + '.json')
+
+        self.touch()
+
+    # Method for marking this fingerprint's entries as used
+    def touch(self):
+        try:
+            os.utime(self.entryDir)
+        except OSError:
+            pass
+
+    # Method for deleting the entries of kernel sets not used for
+    # maxAgeDays, and entries left in the cache root by older versions
+    def purgeStale(self, maxAgeDays=MAX_AGE_DAYS):
+        cutoff = time.time() - maxAgeDays * 86400.
+        own = os.path.basename(self.entryDir)
+        for fn in os.listdir(self.cacheDir):
+            path = os.path.join(self.cacheDir, fn)
+            try:
+                if os.path.isdir(path):
+                    if fn != own and os.path.getmtime(path) < cutoff:
+                        shutil.rmtree(path)
+                elif fn.endswith(('.npy', '.json')):
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,155 @@
+"""
+ParallelOrbits
+
+Purpose: Build the orbit tracks of every SolSystem body concurrently in a
+         pool of worker processes (SolSystem(processes=N)).
+
+Comments:
+    CSPICE state is per process, so each worker (started with 'spawn', as
+    in SolBatch, through model.WorkerPool) furnishes the metakernel once in
+    its initialiser and then serves any number of bodies. A worker
+    evaluates a track exactly as the serial path does (Planet.getOrbit /
+    Planet.getOrbitLOD with the same backend), copies it into a new shared
+    memory block and returns only the block's name, shape and dtype; the
+    parent copies the track out and unlinks the block. Tracks are
+    therefore bit-identical to those built serially and never pickled. If
+    a job fails the pool is terminated and the blocks of the jobs that had
+    already finished are unlinked before the error is raised.
+
+    Tracks already in the OrbitCache are loaded in the parent and not
+    recomputed; new tracks are written to the cache as the serial path
+    would. Backends given as objects (rather than by name) cannot be sent
+    to the workers, in that case tracks are built serially.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import Pyprika
+from . import WorkerPool
+
+# Per-process state of a pool worker
+_worker = {}
+
+
+# Pool initialiser: load the kernels once for this worker
+def _initWorker(mkFile, backend):
+    Pyprika.KernelPool.acquire(mkFile)
+    _worker['mkFile'] = mkFile
+    _worker['backend'] = backend
+
+
+# Method for computing one track in a worker, returned through shared memory
+def _orbitJob(bodyID, orbPeriodInEarthYears, lod):
+    planet = Pyprika.Planet(_worker['mkFile'], planetID=bodyID,
+                            orbPeriodInEarthYears=orbPeriodInEarthYears,
+                            backend=_worker['backend'])
+    if lod:
+        track, solDistance = planet.getOrbitLOD(), None
+    else:
+        track, solDistance = planet.getOrbit(nSamples=planet.orbitSamples)
+    track = np.ascontiguousarray(track)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(track.nbytes, 1))
+    np.ndarray(track.shape, dtype=track.dtype, buffer=shm.buf)[...] = track
+    shm.close()
+    return shm.name, track.shape, track.dtype.str, solDistance
+
+
+# Method for copying a track out of a worker's shared memory block and
+# releasing the block
+def _collect(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Method for starting a pool of workers with the kernels loaded
+def orbitPool(mkFile, processes, backend=None):
+    return WorkerPool.spawnPool(processes, _initWorker, (mkFile, backend),
+                                mkFile=mkFile, backend=backend)
+
+
+# Method for filling in the orbit tracks of a SolSystem's bodies in parallel
+def buildOrbits(solSystem, mkFile, processes=None, pool=None, backend=None, lod=True):
+    """Set orbitPosInAU (and orbitLOD if lod) on every body of solSystem
+
+    Uses `pool` (from orbitPool) if given, otherwise a pool of `processes`
+    workers started for this call. Returns the number of tracks computed.
+    """
+    bodies = list(solSystem.bodies.values())
+    cache = solSystem.orbitCache
+    if backend is not None and not isinstance(backend, str):
+        for body in bodies:
+            body.orbitPosInAU
+            if lod:
+                body.orbitLOD
+        return 0
+
+    # Cached tracks are read here, the rest become jobs
+    jobs = []
+    for body in bodies:
+        for kind in ((False, True) if lod else (False,)):
+            key = body.orbitCacheKey(lod=kind)
+            orbit = cache.load(*key) if cache else None
+            if orbit is not None:
+                setOrbit(body, kind, orbit)
+            else:
+                jobs.append((body, kind, key))
+    if not jobs:
+        return 0
+
+    ownPool = pool is None
+    if ownPool:
+        pool = orbitPool(mkFile, processes or len(jobs), backend)
+    with WorkerPool.finishing(pool if ownPool else None):
+        results = [pool.apply_async(WorkerPool.guarded(_orbitJob),
+                                    (body.ID, body.orbPeriodInEarthYears, kind))
+                   for body, kind, key in jobs]
+        k = 0
+        try:
+            for k, ((body, kind, key), result) in enumerate(zip(jobs, results)):
+                name, shape, dtype, solDistance = result.get()
+                orbit = (_collect(name, shape, dtype), solDistance)
+                if cache:
+                    cache.store(*(key + (orbit,)))
+                setOrbit(body, kind, orbit)
+        except BaseException:
+            # Stop our own workers first, then free the blocks of the jobs
+            # that finished (a shared pool's jobs are waited for)
+            if ownPool:
+                pool.terminate()
+            _discard(results[k+1:], wait=not ownPool)
+            raise
+    return len(jobs)
+
+
+# Method for releasing the shared memory blocks of uncollected jobs
+def _discard(results, wait=False):
+    for result in results:
+        if wait:
+            result.wait()
+        if result.ready() and result.successful():
+            try:
+                shm = shared_memory.SharedMemory(name=result.get()[0])
+            except FileNotFoundError:
+                continue
+            shm.close()
+            shm.unlink()
+
+
+# Method for setting a body's track as the Planet properties would
+def setOrbit(body, lod, orbit):
+    if lod:
+        body.orbitLOD = np.asarray(orbit[0])
+    else:
+        body.orbitPosInAU = orbit
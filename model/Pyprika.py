@@ -47,24 +47,340 @@ __version__ = "0.1branch"
 ## Imports
 import time
 import sys
+import hashlib
+import threading
+import contextlib
+import collections
 import spiceypy as spice
 
-import pkg_resources
-
 import numpy as np
-import matplotlib.pyplot as plt
 
 import datetime as dt
 
+# Metakernel loaded when none is given (relative to the working directory)
+DEFAULT_MK = './assets/spice/metakernel.mk'
+
+# Kilometres per astronomical unit used for all AU conversions
+KM_PER_AU = 149.6e+6
+
+# Days per (Julian) year, for every orbPeriodInEarthYears conversion
+DAYS_PER_YEAR = 365.25
+
+# Span covered by de431_1850_2100.bsp (spkmerge BEGIN/END_TIME) less a
+# day's margin at either end, used as the default event search window
+KERNEL_SPAN = ('1850-01-02', '2099-12-31')
+
+# Levels of detail for adaptively sampled orbit tracks, coarse to fine. Each
+# is the largest deviation of the track from the true orbit as a fraction of
+# the orbit's largest distance from the origin.
+ORBIT_LOD_TOLERANCES = (1e-2, 3e-3, 1e-3, 3e-4, 1e-4)
+
+# First epoch of every orbit track (early enough to cover the long periods
+# of the outer planets within the kernel span)
+ORBIT_START = dt.datetime(1850,1,1)
+
+# J2000 epoch expressed as a UTC calendar instant, used as the origin of
+# "formal" UTC seconds (no leap seconds) when converting in bulk
+J2000_UTC = np.datetime64('2000-01-01T12:00:00', 'us')
+
+# Class holding the leapseconds kernel (LSK) parameters pulled out of the
+# kernel pool, used to convert UTC epochs to ephemeris time (TDB) in NumPy
+class LeapSecondTable(object):
+    """Vectorised UTC -> ET conversion using the loaded LSK (e.g. NAIF0012.TLS)
+
+    Mirrors the DELTET arithmetic SPICE performs inside str2et:
+
+        TAI - UTC = DELTA_AT  (step function of UTC from the LSK)
+        TDT       = TAI + DELTA_T_A
+        ET        = TDT + K*sin(E),  E = M + EB*sin(M),  M = M0 + M1*TDT
+    """
+    def __init__(self):
+        super(LeapSecondTable, self).__init__()
+
+        # Read the DELTET variables out of the kernel pool
+        self.deltaTA = spice.gdpool('DELTET/DELTA_T_A', 0, 1)[0]
+        self.k = spice.gdpool('DELTET/K', 0, 1)[0]
+        self.eb = spice.gdpool('DELTET/EB', 0, 1)[0]
+        self.m = spice.gdpool('DELTET/M', 0, 2)
+
+        # DELTA_AT is stored as (value, @epoch) pairs where the epochs are
+        # formal UTC seconds past J2000
+        nVals = spice.dtpool('DELTET/DELTA_AT')[0]
+        deltaAT = np.array(spice.gdpool('DELTET/DELTA_AT', 0, nVals)).reshape(-1, 2)
+        self.leapValues = deltaAT[:,0]
+        self.leapEpochs = deltaAT[:,1]
+
+    # Method for converting formal UTC seconds past J2000 to ET
+    def utcToET(self, utcSec):
+        utcSec = np.asarray(utcSec, dtype=np.float64)
+
+        # Look up TAI-UTC for each epoch. Epochs before the first table entry
+        # take one second less than the first value (as SPICE does)
+        idx = np.searchsorted(self.leapEpochs, utcSec, side='right') - 1
+        deltaAT = np.where(idx >= 0, self.leapValues[np.maximum(idx, 0)],
+                           self.leapValues[0] - 1.)
+
+        # TAI -> TDT -> TDB (ET)
+        tdt = utcSec + deltaAT + self.deltaTA
+        m = self.m[0] + self.m[1] * tdt
+        e = m + self.eb * np.sin(m)
+        return tdt + self.k * np.sin(e)
+
+# Versions of SpiceyPy and the NAIF toolkit, looked up once per process
+_versions = None
+
+def toolkitVersions():
+    global _versions
+    if _versions is None:
+        try:
+            from importlib.metadata import version
+        except ImportError:
+            # Python < 3.8
+            import pkg_resources
+            version = lambda name: pkg_resources.get_distribution(name).version
+        _versions = dict(SpiceyPy = version("spiceypy"),
+                         NAIF = spice.tkvrsn('TOOLKIT'))
+    return _versions
+
+# Process-wide manager for the SPICE kernel pool
+class KernelPool(object):
+    """Reference counted kernel loading shared by every SpiceBase instance
+
+    Each file is furnished once however many times it is acquired, and its
+    SHA-1 is recorded at load time. `generation` increases whenever the
+    pool contents change so dependent caches can invalidate themselves.
+    Every furnsh/unload is timed and appended to `timings`.
+    """
+    refCounts = {}
+    hashes = {}
+    timings = []
+    generation = 0
+
+    # Method for hashing a kernel file's contents
+    @staticmethod
+    def fileHash(kern):
+        sha = hashlib.sha1()
+        with open(kern, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    # Private methods for timed furnsh/unload. A metakernel that fails to
+    # load part way is unloaded again, so nothing it listed stays loaded.
+    @classmethod
+    def _furnsh(cls, kern):
+        t0 = time.perf_counter()
+        try:
+            spice.furnsh(kern)
+        except Exception:
+            try:
+                spice.unload(kern)
+            except Exception:
+                pass
+            raise
+        finally:
+            cls.timings.append(dict(kernel=kern, action='furnsh',
+                                    seconds=time.perf_counter() - t0))
+            cls.generation += 1
+
+    @classmethod
+    def _unload(cls, kern):
+        t0 = time.perf_counter()
+        spice.unload(kern)
+        cls.timings.append(dict(kernel=kern, action='unload',
+                                seconds=time.perf_counter() - t0))
+        cls.generation += 1
+
+    # Method for taking a reference to a kernel, furnishing it if needed.
+    # Returns the kernel's content hash. The kernel is only recorded once
+    # it has been furnished.
+    @classmethod
+    def acquire(cls, kern, reload=False):
+        if kern not in cls.refCounts:
+            kernHash = cls.fileHash(kern)
+            cls._furnsh(kern)
+            cls.hashes[kern] = kernHash
+            cls.refCounts[kern] = 0
+        elif reload:
+            # Only re-furnish if the file has changed since it was loaded
+            newHash = cls.fileHash(kern)
+            if newHash != cls.hashes[kern]:
+                cls._unload(kern)
+                loaded = False
+                try:
+                    cls._furnsh(kern)
+                    loaded = True
+                finally:
+                    # A kernel that failed to reload is no longer held
+                    if loaded:
+                        cls.hashes[kern] = newHash
+                    else:
+                        cls.forget(kern)
+        cls.refCounts[kern] += 1
+        return cls.hashes[kern]
+
+    # Method for dropping a reference, unloading the kernel on the last one
+    @classmethod
+    def release(cls, kern):
+        if kern not in cls.refCounts:
+            return
+        cls.refCounts[kern] -= 1
+        if cls.refCounts[kern] <= 0:
+            cls._unload(kern)
+            cls.forget(kern)
+
+    # Context manager for scoped kernel loading
+    @classmethod
+    @contextlib.contextmanager
+    def scoped(cls, kern):
+        cls.acquire(kern)
+        try:
+            yield cls.hashes[kern]
+        finally:
+            cls.release(kern)
+
+    # Method for dropping bookkeeping for a kernel unloaded elsewhere
+    @classmethod
+    def forget(cls, kern, keepLoaded=False):
+        if not keepLoaded:
+            cls.refCounts.pop(kern, None)
+            cls.hashes.pop(kern, None)
+        cls.generation += 1
+
+    # Method for clearing the whole kernel pool
+    @classmethod
+    def clear(cls):
+        spice.kclear()
+        cls.refCounts.clear()
+        cls.hashes.clear()
+        cls.generation += 1
+
+    # Method for summarising time spent loading/unloading per kernel
+    @classmethod
+    def loadTimings(cls):
+        summary = {}
+        for t in cls.timings:
+            entry = summary.setdefault(t['kernel'], dict(furnsh=0., unload=0., calls=0))
+            entry[t['action']] += t['seconds']
+            entry['calls'] += 1
+        return summary
+
+# Bounded least-recently-used cache tied to the kernel pool
+class LRUCache(object):
+    """Dictionary cache evicting the least recently used entries
+
+    Bounded by entry count and (optionally) by the approximate bytes of its
+    values. The whole cache is dropped when KernelPool.generation changes,
+    so entries never outlive the kernels they were computed from.
+    """
+    def __init__(self, maxEntries=1024, maxBytes=None):
+        super(LRUCache, self).__init__()
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = KernelPool.generation
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    # Private method dropping everything if the kernel pool has changed
+    def _checkGeneration(self):
+        if self._generation != KernelPool.generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.nbytes = 0
+            self._generation = KernelPool.generation
+
+    # Method for looking up a key, returns default on a miss
+    def get(self, key, default=None):
+        with self._lock:
+            self._checkGeneration()
+            try:
+                value = self._entries[key][0]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    # Method for storing a value, evicting old entries to stay in bounds
+    def put(self, key, value):
+        size = getattr(value, 'nbytes', 0) + sys.getsizeof(key)
+        with self._lock:
+            self._checkGeneration()
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self._entries and (len(self._entries) > self.maxEntries or
+                                     (self.maxBytes is not None and
+                                      self.nbytes > self.maxBytes)):
+                self.nbytes -= self._entries.popitem(last=False)[1][1]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Method for the hit/miss statistics
+    def stats(self):
+        lookups = self.hits + self.misses
+        return dict(entries=len(self._entries), bytes=self.nbytes,
+                    hits=self.hits, misses=self.misses,
+                    hitRate=self.hits / lookups if lookups else None,
+                    evictions=self.evictions, invalidations=self.invalidations)
+
+# Process-wide caches for repeated SPICE lookups
+class SpiceCache(object):
+    """NAIF name/ID lookups, frame transforms and computed states
+
+    States are keyed on (backend, body, ET epochs, frame, observer,
+    aberration correction); only queries of up to `maxEpochs` epochs are
+    cached so large batched calls do not flush the single-date entries
+    the GUI and query service repeat.
+    """
+    naifIDs = LRUCache(maxEntries=4096)
+    naifNames = LRUCache(maxEntries=4096)
+    frames = LRUCache(maxEntries=4096, maxBytes=4 << 20)
+    states = LRUCache(maxEntries=16384, maxBytes=32 << 20)
+    maxEpochs = 64
+
+    # Whether the rotation between two frames is constant, keyed on
+    # (fromFrame, toFrame)
+    fixedFrames = LRUCache(maxEntries=256)
+
+    # Method for the statistics of every cache
+    @classmethod
+    def stats(cls):
+        return dict(naifIDs=cls.naifIDs.stats(), naifNames=cls.naifNames.stats(),
+                    frames=cls.frames.stats(), states=cls.states.stats(),
+                    fixedFrames=cls.fixedFrames.stats())
+
+    @classmethod
+    def clear(cls):
+        for cache in (cls.naifIDs, cls.naifNames, cls.frames, cls.states,
+                      cls.fixedFrames):
+            cache.clear()
+
 # Base spice class for kernel management
 class SpiceBase(object):
     """class docstring"""
+    # Leapseconds table shared by all instances, (re)built from the kernel
+    # pool on first use after the pool changes
+    _leapSeconds = None
+    _leapSecondsGeneration = -1
+
     def __init__(self):
         super(SpiceBase, self).__init__()
 
-        # Set SpiceyPy version number being used
-        self.versions = dict(SpiceyPy = pkg_resources.get_distribution("spiceypy").version,
-                    NAIF = spice.tkvrsn('TOOLKIT'))
+        # Set SpiceyPy version number being used (shared, computed once)
+        self.versions = toolkitVersions()
 
     # Method for checking what kernels are loaded
     @staticmethod
@@ -100,7 +416,7 @@ class SpiceBase(object):
     # Method for clearing the loaded kernel pool
     @staticmethod
     def clearKernPool():
-        spice.kclear()
+        KernelPool.clear()
 
     # Method for checking for duplicate kernels
     @classmethod
@@ -111,52 +427,84 @@ class SpiceBase(object):
     # Method for removing specific/duplicate kernels
     @classmethod
     def removeKernel(cls, kern, rmDupsOnly=False):
-        # Determine number of times kernel is loaded
+        # Determine number of times kernel is loaded (enumerated once), each
+        # unload removes a single instance
         nDups = cls.checkDuplicates(kern)
-        if rmDupsOnly:
-            # only want to remove duplicates
-            if nDups > 0:
-                # recursively remove
-                # NOTE: I wouldn't like to say where in the full kernel last
-                # the last one remaining will be
-                spice.unload(kern)
-                cls.removeKernel(kern, rmDupsOnly=rmDupsOnly)
-        else:
-            if nDups >= 0:
-                # recursively remove
-                spice.unload(kern)
-                cls.removeKernel(kern)
+        nUnload = nDups if rmDupsOnly else nDups + 1
+        for i in range(max(nUnload, 0)):
+            spice.unload(kern)
 
-    # Method for loading/reloading specific kernels
+        # Keep the pool manager in step with the kernel pool
+        if nUnload > 0:
+            KernelPool.forget(kern, keepLoaded=rmDupsOnly)
+
+    # Method for loading/reloading specific kernels through the process-wide
+    # KernelPool. A kernel already held is only re-furnished with
+    # reloadKern=True and only if its contents have changed on disk.
     @classmethod
     def loadKernel(cls, kern=None, reloadKern=False):
-        # Check if input kernel is loaded already
-        isLoaded = cls.checkKernelLoad(kern)
+        return KernelPool.acquire(kern, reload=reloadKern)
 
-        # Do some checks and clean up if it is loaded
-        if not isLoaded:
-            # not loaded, load kernel
-            spice.furnsh(kern)
-        else:
-            # kernel already lodade
-            # - check for duplcites
-            # - remove all instances of kernel and reload (reloadKern)
-            # - remove all but one instance of kernel (not reloadKern)
-            if reloadKern:
-                # all instances, dups or otherwise will be removed
-                cls.removeKernel(kern, rmDupsOnly=False)
-                # reload
-                spice.furnsh(kern)
-            else:
-                # Kernel will not be reloaded, but its final position in
-                # the kernel list is uncertain.
-                cls.removeKernel(kern, rmDupsOnly=True)
+    # Method for converting datetime/datetime64/ISO string epochs into an
+    # array of ephemeris times in one pass (requires a loaded LSK)
+    @classmethod
+    def convertDateToET(cls, time, verify=False, tol=1e-6):
+        """Return a float64 array of ET (TDB seconds past J2000) for `time`
+
+        `time` may be a single value or array-like of datetime.datetime,
+        numpy.datetime64 or ISO 8601 strings, all taken as UTC. Strings that
+        NumPy cannot parse (e.g. a leap second written as :60) fall back to
+        spice.str2et. With verify=True every result is checked against
+        str2et and a ValueError raised if any differs by more than `tol`
+        seconds.
+        """
+        if cls._leapSecondsGeneration != KernelPool.generation:
+            cls._leapSeconds = LeapSecondTable()
+            cls._leapSecondsGeneration = KernelPool.generation
+
+        time = np.array(time, ndmin=1)
+        try:
+            epochs = cls.__toDatetime64(time)
+        except ValueError:
+            # Not something NumPy can represent, let SPICE parse it
+            return np.array([spice.str2et(str(t)) for t in time])
+
+        # Formal UTC seconds past J2000, keeping whole seconds and the
+        # microsecond remainder apart to preserve precision
+        us = (epochs - J2000_UTC).astype(np.int64)
+        utcSec = (us // 1000000).astype(np.float64) + (us % 1000000) * 1e-6
+        et = cls._leapSeconds.utcToET(utcSec)
+
+        if verify:
+            etRef = np.array([spice.str2et(str(t)) for t in
+                              np.datetime_as_string(epochs, unit='us')])
+            err = np.abs(et - etRef)
+            if err.size and err.max() > tol:
+                raise ValueError('Bulk ET conversion differs from str2et by '
+                                 '{0:.3e} s (tolerance {1:.1e} s)'.format(err.max(), tol))
+        return et
+
+    # Private helper for coercing input epochs to datetime64[us] (UTC)
+    @staticmethod
+    def __toDatetime64(time):
+        if time.dtype == object:
+            time = np.array([t.astimezone(dt.timezone.utc).replace(tzinfo=None)
+                             if isinstance(t, dt.datetime) and t.tzinfo else t
+                             for t in time.ravel()]).reshape(time.shape)
+        elif time.dtype.kind == 'S':
+            time = time.astype('U')
+        return time.astype('datetime64[us]')
 
     # method for getting the NAID ID for a body
     @staticmethod
     def naifID(bodyStr):
+        key = bodyStr.upper()
+        naifID = SpiceCache.naifIDs.get(key)
+        if naifID is not None:
+            return naifID
         try:
-            naifID = spice.bodn2c(bodyStr.upper())
+            naifID = spice.bodn2c(key)
+            SpiceCache.naifIDs.put(key, naifID)
             return naifID
         except spice.stypes.SpiceyError as e:
             print("ERROR: INVALID SPICE NAIF NAME ENTERED")
@@ -165,19 +513,174 @@ class SpiceBase(object):
     # method for getting the NAIF name of a body
     @staticmethod
     def naifName(bodyInt):
+        naifName = SpiceCache.naifNames.get(bodyInt)
+        if naifName is not None:
+            return naifName
         try:
             naifName = spice.bodc2n(bodyInt)
+            SpiceCache.naifNames.put(bodyInt, naifName)
             return naifName
         except spice.stypes.SpiceyError as e:
             print("ERROR: INVALID SPICE NAIF ID ENTERED")
             raise e
 
+    # method for the (cached) rotation matrix from one frame to another
+    @staticmethod
+    def frameTransform(fromFrame, toFrame, et):
+        key = (fromFrame, toFrame, float(et))
+        rot = SpiceCache.frames.get(key)
+        if rot is None:
+            rot = np.array(spice.pxform(fromFrame, toFrame, float(et)))
+            SpiceCache.frames.put(key, rot)
+        return rot
+
+    # Method for the (N,3,3) rotations from one frame to another at ET
+    # epochs. Frames fixed relative to each other (checked once over a
+    # century) give one cached matrix for every epoch, others one cached
+    # pxform per epoch.
+    @classmethod
+    def frameTransforms(cls, fromFrame, toFrame, et):
+        et = np.asarray(et, dtype=np.float64).ravel()
+        if fromFrame == toFrame:
+            return np.broadcast_to(np.eye(3), (et.size, 3, 3))
+        key = (fromFrame, toFrame)
+        fixed = SpiceCache.fixedFrames.get(key)
+        if fixed is None:
+            r0 = cls.frameTransform(fromFrame, toFrame, 0.)
+            r1 = cls.frameTransform(fromFrame, toFrame, 3.15576e9)
+            fixed = bool(np.allclose(r0, r1, rtol=0, atol=1e-14))
+            SpiceCache.fixedFrames.put(key, fixed)
+        if fixed:
+            return np.broadcast_to(cls.frameTransform(fromFrame, toFrame, 0.),
+                                   (et.size, 3, 3))
+        return np.stack([cls.frameTransform(fromFrame, toFrame, t) for t in et])
+
+# Method for the (N,3,3) rotations from one frame to another at ET epochs,
+# through the backend for backends that build some frames themselves
+# (see Analytic.AnalyticBackend.frameTransforms), through SPICE otherwise
+def frameTransforms(fromFrame, toFrame, et, backend=None):
+    transforms = getattr(backend, 'frameTransforms', SpiceBase.frameTransforms)
+    return transforms(fromFrame, toFrame, et)
+
+# Method for deriving positions in several frames relative to several
+# observers from one pass of barycentric J2000 positions (km)
+def deriveViews(bodyPos, observerPos, et, frames, backend=None):
+    """Return {(frame, obs): positions} in km
+
+    bodyPos is (..., N, 3) for N epochs `et`, observerPos maps each
+    observer key to its (N, 3) position (both J2000 relative to the solar
+    system barycentre). Each view is one translation and one rotation,
+    the rotations given by `backend` (see frameTransforms).
+    """
+    rotations = {frame: frameTransforms('J2000', frame, et, backend) for frame in frames}
+    views = {}
+    for obs, obsPos in observerPos.items():
+        rel = bodyPos - obsPos
+        for frame, rot in rotations.items():
+            views[frame, obs] = (rel if frame == 'J2000' else
+                                 np.einsum('nij,...nj->...ni', rot, rel))
+    return views
+
+# Ephemeris backend evaluating states through CSPICE. Alternate backends
+# (e.g. SpkReader.SpkReader) provide the same position/state methods.
+class SpiceBackend(object):
+    """Positions (km) and states (km, km/s) of target relative to obs"""
+    def position(self, target, et, frame='J2000', obs=0):
+        return np.array(spice.spkpos(str(target), et, frame, 'NONE',
+                                     str(obs))[0]).reshape(-1, 3)
+
+    def state(self, target, et, frame='J2000', obs=0):
+        return np.array(spice.spkezr(str(target), et, frame, 'NONE',
+                                     str(obs))[0]).reshape(-1, 6)
+
+# Backend wrapper memoising small queries in SpiceCache.states
+class CachedBackend(object):
+    """Same interface as the wrapped backend; `name` separates its entries"""
+    def __init__(self, backend, name):
+        super(CachedBackend, self).__init__()
+        self.backend = backend
+        self.name = name
+
+    def position(self, target, et, frame='J2000', obs=0):
+        return self.__lookup('position', target, et, frame, obs)
+
+    def state(self, target, et, frame='J2000', obs=0):
+        return self.__lookup('state', target, et, frame, obs)
+
+    def frameTransforms(self, fromFrame, toFrame, et):
+        return frameTransforms(fromFrame, toFrame, et, self.backend)
+
+    # Private method returning a copy of the cached result, computing it
+    # through the wrapped backend on a miss
+    def __lookup(self, method, target, et, frame, obs):
+        et = np.asarray(et, dtype=np.float64).ravel()
+        if et.size > SpiceCache.maxEpochs:
+            return getattr(self.backend, method)(target, et, frame=frame, obs=obs)
+        key = (self.name, method, target, et.tobytes(), frame, obs, 'NONE')
+        value = SpiceCache.states.get(key)
+        if value is None:
+            value = getattr(self.backend, method)(target, et, frame=frame, obs=obs)
+            SpiceCache.states.put(key, value)
+        return value.copy()
+
+# Method for the name of a Planet backend argument ('spice' by default,
+# the class name of a backend object), separating cached results. Tables
+# are named with their fingerprint, the 'table' backend's being the table
+# next to `mk` (see EphemerisTable.tableFor).
+def backendName(backend=None, mk=None):
+    if backend is None:
+        return 'spice'
+    if backend == 'table':
+        from model.EphemerisTable import EphemerisTable, tableFor
+        backend = EphemerisTable.open(tableFor(mk))
+    if isinstance(backend, str):
+        return backend
+    fingerprint = getattr(backend, 'fingerprint', None)
+    return (type(backend).__name__ if fingerprint is None else
+            '{0}-{1}'.format(type(backend).__name__, fingerprint[:16]))
+
+# Method for resolving a Planet backend argument to a backend instance.
+# The named backends are wrapped in a CachedBackend. A table must have
+# been built from the loaded kernels.
+def resolveBackend(backend=None, mk=None):
+    if backend is None or backend == 'spice':
+        return CachedBackend(SpiceBackend(), 'spice')
+    elif backend == 'numpy':
+        # Pure NumPy Chebyshev evaluation of the furnished SPKs
+        from model.SpkReader import SpkReader
+        return CachedBackend(SpkReader.fromKernelPool(), 'numpy')
+    elif backend == 'table':
+        # Precomputed Hermite table (built with SolTable.py)
+        from model.EphemerisTable import EphemerisTable, tableFor
+        table = EphemerisTable.open(tableFor(mk))
+        table.checkKernels()
+        return CachedBackend(table, backendName(table))
+    elif backend == 'analytic':
+        # Mean Keplerian elements, no SPK needed (quick previews)
+        from model.Analytic import AnalyticBackend
+        return CachedBackend(AnalyticBackend(), 'analytic')
+    elif isinstance(backend, str):
+        raise ValueError("Unknown ephemeris backend '{0}'".format(backend))
+    return backend
+
+# Method for the metakernel a backend needs: the analytic backend only
+# loads the small text kernels (leapseconds, frames), not `mk`
+def kernelsFor(mk, backend=None):
+    if backend == 'analytic':
+        from model.Analytic import ANALYTIC_MK
+        return ANALYTIC_MK
+    return mk
+
 # Planet class that inherits kernel management
 class Planet(SpiceBase):
     """class docstring"""
+    # Number of epochs sampled over one orbital period for orbitPosInAU
+    orbitSamples = 1000
+
     def __init__(self, mk, planetName=None, planetID=None,
                  radiusInKilometers=None,
-                 orbPeriodInEarthYears=None, plotSymbolColor=None, customLabel=None):
+                 orbPeriodInEarthYears=None, plotSymbolColor=None, customLabel=None,
+                 orbitCache=None, backend=None):
         super(Planet, self).__init__()
 
         # Construct proper NAIF IDs and NAMES
@@ -199,18 +702,25 @@ class Planet(SpiceBase):
         self.radiusInKilometers = radiusInKilometers
         self.orbPeriodInEarthYears = orbPeriodInEarthYears
 
-        # Load some base SPICE kernels to be able to do some useful stuff
-        # TODO: Catch error but could be more cleanly
-        # dealt with
+        # Load some base SPICE kernels to be able to do some useful stuff.
+        # The KernelPool only furnishes the metakernel for the first Planet.
+        # Failing to load raises IOError so callers can fall back (e.g. to
+        # backend='analytic', which needs no SPK)
+        mk = kernelsFor(mk, backend)
         try:
-            self.loadKernel(mk, reloadKern=True)
-        except spice.stypes.SpiceyError:
-            print('Spice metakernal cannot be located or contents failed to load')
-            print('Exiting...')
-            sys.exit()
+            self.loadKernel(mk)
+        except (spice.stypes.SpiceyError, IOError) as e:
+            raise IOError('Spice metakernel {0} cannot be located or contents '
+                          'failed to load: {1}'.format(mk, e))
+
+        # Ephemeris evaluator: 'spice' (default), 'numpy' or a backend object
+        self.backend = resolveBackend(backend, mk)
 
-        # Calculate orbit positions about sun in HCI frame
-        self.orbitPosInAU = self.getOrbit()
+        # Orbit positions about sun in HCI frame are calculated (or read from
+        # the optional OrbitCache) on first access of orbitPosInAU
+        self.orbitCache = orbitCache
+        self._orbitPosInAU = None
+        self._orbitLOD = None
 
         # Set plot icon colour and custom label
         # ternary a = b if True else c
@@ -218,6 +728,63 @@ class Planet(SpiceBase):
         self.customLabel = customLabel if not customLabel == None else self.Name
 
 
+    # Orbit cache key (body, frame, observer, samples or level-of-detail
+    # tag, sampled span) of the plotted orbit track, or of its
+    # level-of-detail version. The span is the start epoch and the period
+    # in days, so a changed orbPeriodInEarthYears is a different entry.
+    def orbitCacheKey(self, lod=False):
+        samples = ('lod' + '-'.join('{0:g}'.format(t) for t in ORBIT_LOD_TOLERANCES)
+                   if lod else self.orbitSamples)
+        span = '{0:%Y%m%dT%H%M%S}+{1:.10g}d'.format(
+            ORBIT_START, self.orbPeriodInEarthYears * DAYS_PER_YEAR)
+        return (self.ID, 'HCI', 'SOLAR SYSTEM BARYCENTER', samples, span)
+
+    # Orbit track used for plotting, computed lazily and persisted through
+    # the orbit cache when one has been supplied
+    @property
+    def orbitPosInAU(self):
+        if self._orbitPosInAU is None:
+            args = self.orbitCacheKey()
+            orbit = self.orbitCache.load(*args) if self.orbitCache else None
+            if orbit is None:
+                orbit = self.getOrbit(nSamples=self.orbitSamples)
+                if self.orbitCache:
+                    self.orbitCache.store(*(args + (orbit,)))
+            self._orbitPosInAU = orbit
+        return self._orbitPosInAU
+
+    @orbitPosInAU.setter
+    def orbitPosInAU(self, orbit):
+        self._orbitPosInAU = orbit
+
+    # Adaptive level-of-detail orbit track (see getOrbitLOD), computed
+    # lazily and persisted through the orbit cache like orbitPosInAU
+    @property
+    def orbitLOD(self):
+        if self._orbitLOD is None:
+            args = self.orbitCacheKey(lod=True)
+            orbit = self.orbitCache.load(*args) if self.orbitCache else None
+            if orbit is None:
+                orbit = (self.getOrbitLOD(), None)
+                if self.orbitCache:
+                    self.orbitCache.store(*(args + (orbit,)))
+            self._orbitLOD = np.asarray(orbit[0])
+        return self._orbitLOD
+
+    @orbitLOD.setter
+    def orbitLOD(self, track):
+        self._orbitLOD = track
+
+    # Method for the coarsest orbit track deviating from the true orbit by
+    # no more than maxErrorInAU, returns (N,3) positions in AU
+    def orbitTrack(self, maxErrorInAU):
+        track = self.orbitLOD
+        scale = np.max(np.linalg.norm(track[:,:3], axis=1))
+        fits = [k for k, tol in enumerate(ORBIT_LOD_TOLERANCES)
+                if tol * scale <= maxErrorInAU]
+        level = fits[0] if fits else len(ORBIT_LOD_TOLERANCES) - 1
+        return track[track[:,3] <= level, :3]
+
     # Method for getting position for input
     # datetime (converted internally to ephermeris)
     # Return tuple with position in frames and distance from Sun
@@ -226,26 +793,83 @@ class Planet(SpiceBase):
 
         # Convert input datetime to string and parse to ephemeris time
         et = self.__convertDateToET(time)
-        return (spice.spkpos(targ=str(self.ID), et=et,
-                            ref=frame, abcorr='NONE',
-                            obs=str(self.naifID(obs)))[0] / 149.6e+6, self.__solDistanceInAU(et)/149.6e+6)
+        obsID = self.naifID(obs)
+        pos = self.backend.position(self.ID, et, frame=frame, obs=obsID)
+
+        # Relative to the Sun the distance is just the position's length
+        solDistance = (np.linalg.norm(pos[0]) if obsID == 10 else
+                       self.__solDistanceInAU(et))
+        return pos / KM_PER_AU, solDistance / KM_PER_AU
+
+    # Method for positions in several frames relative to several observers
+    # from one ephemeris pass
+    def getViews(self, time, frames=('HCI',), observers=('SUN',)):
+        """Return ({(frame, obs): posInAU (N,3)}, solDistanceInAU (N,))
+
+        The body, the Sun and each observer are evaluated once per epoch in
+        J2000 relative to the barycentre, and every frame/observer pair is
+        derived from those (see deriveViews). Unlike getPos the Sun
+        distance is given at every epoch.
+        """
+        et = self.__convertDateToET(time)
+        pos = self.backend.position(self.ID, et, frame='J2000', obs=0)
+        sun = pos if self.ID == 10 else self.backend.position(10, et, frame='J2000', obs=0)
+
+        observerPos = {}
+        for obs in observers:
+            obsID = self.naifID(obs)
+            observerPos[obs] = (np.zeros_like(pos) if obsID == 0 else sun if obsID == 10 else
+                                pos if obsID == self.ID else
+                                self.backend.position(obsID, et, frame='J2000', obs=0))
+        views = deriveViews(pos, observerPos, et, frames, self.backend)
+        return ({key: view / KM_PER_AU for key, view in views.items()},
+                np.linalg.norm(pos - sun, axis=1) / KM_PER_AU)
+
+    # Method for streaming positions over a long regular range in chunks
+    # of bounded size (see model.Stream)
+    def iterPositions(self, start, end, step, frame='HCI', obs='SUN',
+                      chunkSize=None, offset=None, out=None):
+        """Yield (et, posInAU, solDistanceInAU) for consecutive chunks
+
+        Epochs run from `start` to `end` (UTC) every `step` (seconds,
+        timedelta or timedelta64), at most chunkSize per chunk. Unlike
+        getPos the Sun distance is given at every epoch. With `out` every
+        chunk is also written to a ColumnStore in that directory, and a
+        stream into an existing store resumes after its last complete chunk.
+        """
+        from model import Stream
+
+        obsID = self.naifID(obs)
+        def compute(epochs):
+            et = self.convertDateToET(epochs)
+            pos = self.backend.position(self.ID, et, frame=frame, obs=obsID)
+            sol = pos if obsID == 10 else self.backend.position(self.ID, et,
+                                                                frame='J2000', obs=10)
+            chunk = (et, pos / KM_PER_AU, np.linalg.norm(sol, axis=1) / KM_PER_AU)
+            return chunk, dict(zip(('et', 'posInAU', 'solDistanceInAU'), chunk))
+
+        columns = {'et': (np.float64, ()), 'posInAU': (np.float64, (3,)),
+                   'solDistanceInAU': (np.float64, ())}
+        return Stream.stream(compute, columns, start, end, step,
+                             chunkSize=chunkSize or Stream.CHUNK_SIZE, offset=offset,
+                             out=out, meta=dict(body=self.ID, frame=frame, obs=obsID))
 
     # Method for calculating orbital geometry
     # requires correct spice kernels covering
     # long enough period of orbital body
-    def getOrbit(self):
+    def getOrbit(self, nSamples=1000):
 
         # Start time (set early enough to account for
         # long period orbits such as outer planets)
-        ts = dt.datetime(1850,1,1)
+        ts = ORBIT_START
 
         # End time
         te = (ts +
-              dt.timedelta(days=self.orbPeriodInEarthYears * 365.26))
+              dt.timedelta(days=self.orbPeriodInEarthYears * DAYS_PER_YEAR))
 
         # Calculate time step in terms of fractional days
-        # to give 1000 steps throughout orbit
-        tDelta = (te - ts).days/1000.
+        # to give nSamples steps throughout orbit
+        tDelta = (te - ts).days/float(nSamples)
 
         # Calculate orbital period from ts->te in tDelta
         # time steps.
@@ -256,14 +880,83 @@ class Planet(SpiceBase):
         return self.getPos(time=year, frame='HCI',
                            obs='SOLAR SYSTEM BARYCENTER')
 
+    # Method for adaptively sampling one orbital period (same start epoch,
+    # frame and observer as getOrbit) for several levels of detail
+    def getOrbitLOD(self, tolerances=ORBIT_LOD_TOLERANCES, initialSamples=16,
+                    maxDepth=16):
+        """Return an (N,4) array of orbit positions (AU) and detail level
+
+        Intervals are bisected until the midpoint of every chord lies within
+        tol * (largest orbit distance) of the true orbit, so points collect
+        where curvature is high. Levels are nested: column 3 holds the index
+        of the coarsest tolerance needing each point, so level k is
+        track[track[:,3] <= k, :3]. Every refinement pass is one batched
+        ephemeris call for the unchecked intervals only.
+        """
+        et0 = self.convertDateToET(ORBIT_START)[0]
+        period = self.orbPeriodInEarthYears * DAYS_PER_YEAR * 86400.
+        et = np.linspace(et0, et0 + period, initialSamples + 1)
+        pos = self.__orbitPosAt(et)
+        level = np.zeros(et.size)
+        scale = np.max(np.linalg.norm(pos, axis=1))
+
+        # Chord midpoint deviation per interval, NaN until evaluated
+        err = np.full(et.size - 1, np.nan)
+        midPos = np.empty((et.size - 1, 3))
+
+        for k, tol in enumerate(tolerances):
+            for depth in range(maxDepth):
+                todo = np.isnan(err)
+                if todo.any():
+                    mid = 0.5 * (et[:-1][todo] + et[1:][todo])
+                    midPos[todo] = self.__orbitPosAt(mid)
+                    chord = 0.5 * (pos[:-1][todo] + pos[1:][todo])
+                    err[todo] = np.linalg.norm(midPos[todo] - chord, axis=1)
+
+                split = np.nonzero(err > tol * scale)[0]
+                if split.size == 0:
+                    break
+
+                # Midpoints become samples, both halves need checking
+                et = np.insert(et, split + 1, 0.5 * (et[split] + et[split + 1]))
+                pos = np.insert(pos, split + 1, midPos[split], axis=0)
+                level = np.insert(level, split + 1, k)
+                err = np.insert(err, split + 1, np.nan)
+                err[split + np.arange(split.size)] = np.nan
+                midPos = np.insert(midPos, split + 1, 0., axis=0)
+
+        return np.column_stack((pos, level))
+
+    # Private method for orbit positions (AU, HCI about the barycentre)
+    def __orbitPosAt(self, et):
+        return self.backend.position(self.ID, et, frame='HCI', obs=0) / KM_PER_AU
+
+    # Method for the heliocentric ecliptic longitude (radians) at ET epochs
+    def eclipticLongitude(self, et):
+        pos = self.backend.position(self.ID, et, frame='ECLIPJ2000', obs=10)
+        return np.arctan2(pos[:,1], pos[:,0])
+
+    # Method for finding solar returns ("Sol birthdays"): the instants
+    # after `birth` at which the body is back at the heliocentric ecliptic
+    # longitude it had at birth. Returns an Events.EVENT_DTYPE array.
+    def findSolarReturns(self, birth, end=None, tol=1e-3):
+        from model import Events
+
+        if self.ID == 10:
+            raise ValueError('The Sun has no heliocentric solar return')
+        birthET = self.convertDateToET(birth)[0]
+        endET = self.convertDateToET(end if end else KERNEL_SPAN[1])[0]
+        period = self.orbPeriodInEarthYears * DAYS_PER_YEAR * 86400.
+        return Events.solarReturns(self.eclipticLongitude, self.ID, birthET,
+                                   birthET, endET, period, tol=tol)
+
     # Private method for converting datetime to
-    # spice ephemeris time
-    # TODO: Check for datetime as input
+    # spice ephemeris time (batched, see SpiceBase.convertDateToET)
     def __convertDateToET(self, time):
-        return [spice.str2et(t) for t in np.array(time, dtype='|S26', ndmin=1)]
+        return self.convertDateToET(time)
 
     # Private method for calculating the distance
     # from the sun in AU. Method used as part of getPos
     def __solDistanceInAU(self, et):
-        return np.sqrt(np.sum(spice.spkezr(str(self.ID), et[0],
-                                           'J2000','NONE','SUN')[0][0:3]**2.))
+        return np.linalg.norm(self.backend.position(self.ID, et[:1], frame='J2000',
+                                                     obs=10)[0])
@@ -0,0 +1,199 @@
+"""
+RenderCache
+
+Purpose: Content-addressed cache of encoded figures (PNG or any other
+         savefig format), so a figure requested again with the same
+         settings costs a file read instead of a matplotlib render.
+
+Comments:
+    Entries are keyed on a SHA-256 of the settings that determine the
+    image (SolPlotMixin.renderSettings: date, view mode and camera, DPI,
+    figure size, bodies, catalog and kernel-set fingerprints, plotting code
+    and matplotlib version), so a change to any of them is simply a
+    different entry and nothing is ever stale.
+
+    Two tiers: a small in-memory LRU of recently used images in this
+    process, over a directory of image files bounded to maxBytes. Disk
+    entries are evicted least recently used first, by modification time
+    (refreshed on every hit), so several processes (SolBatch, SolService
+    workers) can share one directory. Files are written to a temporary
+    name and renamed, readers never see a partial image.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import json
+import hashlib
+import threading
+import collections
+
+# Default bounds of the disk and in-memory tiers (bytes)
+DISK_BYTES = 512 << 20
+HOT_BYTES = 32 << 20
+
+
+# Default cache location (honours XDG_CACHE_HOME)
+def defaultCacheDir():
+    base = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'SolBirthday', 'renders')
+
+
+class RenderCache(object):
+    """Two-tier (memory, disk) LRU cache of encoded figures keyed on settings"""
+    def __init__(self, cacheDir=None, maxBytes=DISK_BYTES, hotBytes=HOT_BYTES):
+        super(RenderCache, self).__init__()
+
+        self.cacheDir = cacheDir if cacheDir is not None else defaultCacheDir()
+        self.maxBytes = maxBytes
+        self.hotBytes = hotBytes
+        self._hot = collections.OrderedDict()
+        self._hotSize = 0
+        self._lock = threading.Lock()
+
+        # Size of the disk tier, measured on the first store
+        self._diskSize = None
+        self.hotHits = self.diskHits = self.misses = 0
+        self.stores = self.evictions = 0
+
+    # Method for the key of a settings dictionary (JSON serialisable)
+    @staticmethod
+    def key(settings):
+        text = json.dumps(settings, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    # Private method for the file of an entry
+    def __path(self, key, fmt):
+        return os.path.join(self.cacheDir, '{0}.{1}'.format(key, fmt))
+
+    # Method for looking up the image for `settings`, None on a miss
+    def get(self, settings, fmt='png'):
+        key = self.key(settings)
+        with self._lock:
+            data = self._hot.get(key)
+            if data is not None:
+                self._hot.move_to_end(key)
+                self.hotHits += 1
+                return data
+
+        path = self.__path(key, fmt)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Mark as recently used for the disk eviction order
+            os.utime(path)
+        except (IOError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.diskHits += 1
+        self.__remember(key, data)
+        return data
+
+    # Method for storing the image for `settings`
+    def put(self, settings, data, fmt='png'):
+        key = self.key(settings)
+        self.__remember(key, data)
+        if not os.path.isdir(self.cacheDir):
+            os.makedirs(self.cacheDir, exist_ok=True)
+
+        path = self.__path(key, fmt)
+        tmp = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        # Size of any entry being overwritten, so it is not counted twice
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.stores += 1
+            if self._diskSize is None:
+                self._diskSize = self.diskBytes()
+            else:
+                self._diskSize += len(data) - replaced
+            over = self._diskSize > self.maxBytes
+        if over:
+            self.evict()
+
+    # Private method adding an entry to the in-memory tier
+    def __remember(self, key, data):
+        if len(data) > self.hotBytes:
+            return
+        with self._lock:
+            if key in self._hot:
+                self._hotSize -= len(self._hot.pop(key))
+            self._hot[key] = data
+            self._hotSize += len(data)
+            while self._hotSize > self.hotBytes:
+                self._hotSize -= len(self._hot.popitem(last=False)[1])
+
+    # Private method for the (mtime, size, path) of every disk entry
+    def __entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.cacheDir)
+        except OSError:
+            return entries
+        for fn in names:
+            if fn.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cacheDir, fn)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        return entries
+
+    # Method for the bytes held on disk (every process's entries)
+    def diskBytes(self):
+        return sum(size for mtime, size, path in self.__entries())
+
+    # Method for deleting the least recently used disk entries until the
+    # directory fits in maxBytes
+    def evict(self):
+        entries = sorted(self.__entries())
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+        with self._lock:
+            self._diskSize = total
+
+    # Method for dropping every entry (both tiers)
+    def clear(self):
+        with self._lock:
+            self._hot.clear()
+            self._hotSize = 0
+        for mtime, size, path in self.__entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._diskSize = 0
+
+    # Method for the hit/miss statistics
+    def stats(self):
+        lookups = self.hotHits + self.diskHits + self.misses
+        return dict(hotHits=self.hotHits, diskHits=self.diskHits, misses=self.misses,
+                    hitRate=(self.hotHits + self.diskHits) / lookups if lookups else None,
+                    stores=self.stores, evictions=self.evictions,
+                    hotEntries=len(self._hot), hotBytes=self._hotSize,
+                    diskBytes=(self._diskSize if self._diskSize is not None else
+                               self.diskBytes()))
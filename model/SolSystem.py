@@ -0,0 +1,259 @@
+"""
+SolSystem
+
+Purpose: Helper class managing the collection of solar system bodies
+         (Pyprika.Planet instances) plotted by SolBirthday, along with
+         batched ephemeris queries over all of them.
+
+Comments:
+    Moved out of ViewController so batch jobs can use the model without
+    importing PyQt5. ViewController re-exports it.
+
+"""
+
+## Imports
+import itertools
+
+import numpy as np
+
+from . import Pyprika
+from . import Events
+from . import Stream
+from . import ParallelOrbits
+from .BodyCatalog import BodyCatalog, DEFAULT_CATALOG
+from .OrbitCache import OrbitCache
+
+# Record layout returned by SolSystem.getPositions
+EPHEMERIS_DTYPE = np.dtype([('et', np.float64),
+                            ('posInAU', np.float64, (3,)),
+                            ('solDistanceInAU', np.float64)])
+
+# Helper class for managing solar system of bodies
+class SolSystem(object):
+
+    def __init__(self, mkFile=None, useOrbitCache=True, cacheDir=None,
+                 backend=None, processes=None, pool=None, catalog=None):
+        # Set expected location for spice metakernel if custom not entered
+        # TODO: Catch errors related to this kernel not being found
+        if mkFile == None:
+            mkFile = Pyprika.DEFAULT_MK
+        # The analytic backend needs only its small text kernel set
+        mkFile = Pyprika.kernelsFor(mkFile, backend)
+
+        # Orbit tracks are identical between runs so persist them on disk
+        self.orbitCache = (OrbitCache(mkFile, cacheDir, backend=backend)
+                           if useOrbitCache else None)
+        self.mkFile = mkFile
+
+        # Kernel set fingerprint (and backend) identify rendered figures
+        self._fingerprint = self.orbitCache or OrbitCache(mkFile, cacheDir)
+        self.backendName = Pyprika.backendName(backend, mkFile)
+
+        # Generate planets from the catalog's 'sun' and 'planet' rows, each
+        # also available as an attribute (self.sun, self.mercury, ...)
+        planets = BodyCatalog.load(DEFAULT_CATALOG)
+        self.bodies = {}
+        for k in range(len(planets)):
+            label = str(planets.labels[k])
+            self.bodies[label] = Pyprika.Planet(mk=mkFile,
+                                                orbitCache=self.orbitCache,
+                                                backend=backend,
+                                                planetName=str(planets.naif[k]),
+                                                radiusInKilometers=planets.radiusKm[k],
+                                                orbPeriodInEarthYears=planets.periodYears[k],
+                                                plotSymbolColor=str(planets.colors[k]),
+                                                customLabel=label)
+            setattr(self, label.lower(), self.bodies[label])
+
+        # Every body, including any extra catalogs (file paths or
+        # BodyCatalog instances) of small bodies drawn as groups
+        extras = [c if isinstance(c, BodyCatalog) else BodyCatalog.load(c)
+                  for c in ([] if catalog is None else
+                            [catalog] if isinstance(catalog, (str, BodyCatalog)) else catalog)]
+        for extra in extras:
+            for kern in extra.kernels:
+                Pyprika.KernelPool.acquire(kern)
+        self.catalog = BodyCatalog.concatenate([planets] + extras)
+
+        # Orbit tracks are otherwise built lazily one body at a time; with
+        # processes > 1 (or a ParallelOrbits.orbitPool) build them all now
+        # in worker processes
+        if pool is not None or (processes or 1) > 1:
+            ParallelOrbits.buildOrbits(self, mkFile, processes=processes, pool=pool,
+                                       backend=backend)
+
+        # Create dictionary lookup table for scaled plot symbols
+        # Pluto will be made not to scale since it is so tiny.
+
+        # Define 'private' function for min-max scaling
+        def __scale(ps, top=200):
+            ps = np.log10(ps)
+            ps = top*((ps - ps.min()) / (ps.max() - ps.min()))
+            ps[ps == 0] = ps[ps > 0].min() * (2./3.)
+            return ps
+
+        # Scale size of planets using min-max scaler, add sizes to look-up
+        # dictionary
+        sizes = __scale(planets.radiusKm.copy(), top=200)
+        self.scaledPlotSymbol = dict(zip(self.bodies, sizes))
+
+    # Method for computing positions of many bodies at many epochs in one
+    # pass: epochs converted and observer resolved once for every body
+    def getPositions(self, time, bodies=None, frame='HCI',
+                     obs='SOLAR SYSTEM BARYCENTER'):
+        """Return an (M, N) EPHEMERIS_DTYPE array for M bodies and N epochs
+
+        `bodies` is a list of labels from self.bodies (default: all of them,
+        in order). result['posInAU'] is the (M, N, 3) position view and
+        result['solDistanceInAU'] the heliocentric distance at every epoch.
+        """
+        labels = list(self.bodies) if bodies is None else list(bodies)
+        et = self.sun.convertDateToET(time)
+        obsID = self.sun.naifID(obs)
+        backend = self.sun.backend
+
+        out = np.empty((len(labels), et.size), dtype=EPHEMERIS_DTYPE)
+        out['et'] = et
+
+        # Sun relative to the same observer/frame gives heliocentric
+        # distances without a second query per body
+        sunPos = backend.position(self.sun.ID, et, frame=frame, obs=obsID)
+        for i, label in enumerate(labels):
+            body = self.bodies[label]
+            if body.ID == self.sun.ID:
+                pos = sunPos
+            else:
+                pos = backend.position(body.ID, et, frame=frame, obs=obsID)
+            out['posInAU'][i] = pos / Pyprika.KM_PER_AU
+            out['solDistanceInAU'][i] = np.sqrt(np.sum((pos - sunPos)**2., axis=1)) / Pyprika.KM_PER_AU
+        return out
+
+    # Method for positions of many bodies in several frames relative to
+    # several observers from one ephemeris pass
+    def getViews(self, time, frames=('HCI',), observers=('SOLAR SYSTEM BARYCENTER',),
+                 bodies=None):
+        """Return {(frame, obs): (M, N) EPHEMERIS_DTYPE array}
+
+        Each body, the Sun and any observer that is not one of the bodies
+        are evaluated once per epoch (J2000 relative to the barycentre);
+        every frame/observer view is derived from that pass by translation
+        and rotation (Pyprika.deriveViews), so F frames and O observers
+        cost M + 1 + O ephemeris calls rather than (M + 1) * F * O.
+        Positions agree with getPositions to rounding (well under 1 m).
+        """
+        labels = list(self.bodies) if bodies is None else list(bodies)
+        et = self.sun.convertDateToET(time)
+        backend = self.sun.backend
+
+        # One barycentric pass, keyed on NAIF ID so observers reuse it
+        passes = {0: np.zeros((et.size, 3))}
+        for body in [self.sun] + [self.bodies[label] for label in labels]:
+            if body.ID not in passes:
+                passes[body.ID] = backend.position(body.ID, et, frame='J2000', obs=0)
+        observerPos = {}
+        for obs in observers:
+            obsID = self.sun.naifID(obs)
+            if obsID not in passes:
+                passes[obsID] = backend.position(obsID, et, frame='J2000', obs=0)
+            observerPos[obs] = passes[obsID]
+
+        pos = np.stack([passes[self.bodies[label].ID] for label in labels])
+        solDistance = np.linalg.norm(pos - passes[self.sun.ID], axis=2) / Pyprika.KM_PER_AU
+
+        derived = Pyprika.deriveViews(pos, observerPos, et, frames, backend)
+        views = {}
+        for key, view in derived.items():
+            out = views[key] = np.empty((len(labels), et.size), dtype=EPHEMERIS_DTYPE)
+            out['et'] = et
+            out['posInAU'] = view / Pyprika.KM_PER_AU
+            out['solDistanceInAU'] = solDistance
+        return views
+
+    # Property for the fingerprint of the metakernel and the kernels it
+    # loaded (see OrbitCache.kernelHash)
+    @property
+    def kernelHash(self):
+        return self._fingerprint.kernelHash
+
+    # Method for the catalog axis ('inner' or 'outer') a body is drawn on
+    def axisOf(self, label):
+        return str(self.catalog.axes[self.catalog.index(label)])
+
+    # Method for the groups of extra catalog bodies (not the Sun/planets)
+    def catalogGroups(self):
+        return [g for g in self.catalog.groupNames if g not in ('sun', 'planet')]
+
+    # Method for the positions (AU) of every body of a catalog group at
+    # each epoch, one vectorised batch: (bodies, epochs, 3)
+    def groupPositions(self, time, group, frame='HCI', obs='SOLAR SYSTEM BARYCENTER'):
+        return self.catalog.positions(self.sun.convertDateToET(time), frame=frame,
+                                      obs=obs, backend=self.sun.backend,
+                                      index=self.catalog.select(group))
+
+    # Method for the (bodies, samples, 3) orbit tracks (AU, HCI) of a
+    # catalog group, built on first use
+    def groupTracks(self, group):
+        index = self.catalog.select(group)
+        missing = index[~self.catalog.hasTrack[index]]
+        if missing.size:
+            self.catalog.buildTracks(self.sun.backend, missing)
+        return self.catalog.tracks[index]
+
+    # Method for streaming getPositions over a long regular range in chunks
+    # of bounded size (see model.Stream)
+    def iterPositions(self, start, end, step, bodies=None, frame='HCI',
+                      obs='SOLAR SYSTEM BARYCENTER', chunkSize=None, offset=None,
+                      out=None):
+        """Yield (M, n) EPHEMERIS_DTYPE chunks as getPositions would return
+
+        Epochs run from `start` to `end` (UTC) every `step` (seconds,
+        timedelta or timedelta64), n <= chunkSize per chunk. With `out` the
+        chunks are also written to a ColumnStore in that directory with
+        columns 'et', '<label>.posInAU' and '<label>.solDistanceInAU', and
+        a stream into an existing store resumes after its last complete chunk.
+        """
+        labels = list(self.bodies) if bodies is None else list(bodies)
+        def compute(epochs):
+            chunk = self.getPositions(epochs, bodies=labels, frame=frame, obs=obs)
+            arrays = {'et': chunk['et'][0]}
+            for i, label in enumerate(labels):
+                arrays[label + '.posInAU'] = chunk['posInAU'][i]
+                arrays[label + '.solDistanceInAU'] = chunk['solDistanceInAU'][i]
+            return chunk, arrays
+
+        columns = {'et': (np.float64, ())}
+        for label in labels:
+            columns[label + '.posInAU'] = (np.float64, (3,))
+            columns[label + '.solDistanceInAU'] = (np.float64, ())
+        return Stream.stream(compute, columns, start, end, step,
+                             chunkSize=chunkSize or Stream.CHUNK_SIZE, offset=offset,
+                             out=out, meta=dict(bodies=labels, frame=frame, obs=obs))
+
+    # Method for finding solar returns of every body (bar the Sun) after a
+    # birth datetime, as one EVENT_DTYPE array sorted by time
+    def findSolarReturns(self, birth, bodies=None, end=None, tol=1e-3):
+        labels = [l for l in (list(self.bodies) if bodies is None else bodies)
+                  if l != 'SUN']
+        events = np.concatenate([self.bodies[l].findSolarReturns(birth, end=end, tol=tol)
+                                 for l in labels])
+        return events[np.argsort(events['et'], kind='stable')]
+
+    # Method for finding heliocentric conjunctions and oppositions between
+    # pairs of bodies (default: every pair bar the Sun) over the kernel span
+    def findConjunctions(self, pairs=None, start=None, end=None,
+                         oppositions=True, tol=1e-3):
+        if pairs is None:
+            pairs = itertools.combinations([l for l in self.bodies if l != 'SUN'], 2)
+        et0 = self.sun.convertDateToET(start if start else Pyprika.KERNEL_SPAN[0])[0]
+        et1 = self.sun.convertDateToET(end if end else Pyprika.KERNEL_SPAN[1])[0]
+
+        events = []
+        for a, b in pairs:
+            bodyA, bodyB = self.bodies[a], self.bodies[b]
+            events.append(Events.conjunctions(
+                bodyA.eclipticLongitude, bodyB.eclipticLongitude, bodyA.ID,
+                bodyB.ID, et0, et1, bodyA.orbPeriodInEarthYears * Pyprika.DAYS_PER_YEAR * 86400.,
+                bodyB.orbPeriodInEarthYears * Pyprika.DAYS_PER_YEAR * 86400.,
+                oppositions=oppositions, tol=tol))
+        events = np.concatenate(events)
+        return events[np.argsort(events['et'], kind='stable')]
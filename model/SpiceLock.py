@@ -0,0 +1,92 @@
+"""
+SpiceLock
+
+Purpose: Serialise the SpiceyPy calls of the model across threads, for
+         the places two threads use SPICE at once (the GUI's analytic
+         preview built alongside the precise SolSystem).
+
+Comments:
+    CSPICE is not thread safe and SpiceyPy releases the GIL in its ctypes
+    calls. Inside serialised() the `spice` global of the model modules is
+    swapped (as SpiceTrace does) for a SerialSpice proxy whose functions
+    all hold one process-wide lock, so each call is atomic. Sequences of
+    calls are not: another thread may furnish kernels in between, which is
+    harmless while both threads only add kernels. Outside the block the
+    module (or the SpiceTrace proxy active when it was entered) is put
+    back, so single-threaded use pays nothing. Tracing must not be enabled
+    or disabled inside the block.
+
+        with SpiceLock.serialised():
+            preview = threading.Thread(target=buildPreview)
+            preview.start()
+            sol = SolSystem(mkFile)
+            preview.join()
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import threading
+import importlib
+import contextlib
+
+# Model modules whose `spice` global is serialised (those calling SPICE)
+SERIALISED_MODULES = ('Pyprika', 'OrbitCache', 'SpkReader')
+
+# Held for every SPICE call made inside serialised()
+_lock = threading.RLock()
+
+# Nesting depth of serialised() and the globals it replaced
+_depth = 0
+_saved = {}
+
+
+class SerialSpice(object):
+    """Stand-in for the spiceypy module running every function under _lock"""
+    def __init__(self, module):
+        super(SerialSpice, self).__init__()
+        self._module = module
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+
+        def serial(*args, **kwargs):
+            with _lock:
+                return attr(*args, **kwargs)
+        serial.__name__ = name
+        serial.__doc__ = attr.__doc__
+
+        # Looked up once per function, later calls skip __getattr__
+        setattr(self, name, serial)
+        return serial
+
+
+# Method for the serialised model modules
+def _modules():
+    return [importlib.import_module('model.' + name) for name in SERIALISED_MODULES]
+
+
+# Context manager making the model's SPICE calls safe from several threads
+# inside the block. Blocks nest; the outermost restores the modules.
+@contextlib.contextmanager
+def serialised():
+    global _depth
+    with _lock:
+        if _depth == 0:
+            for module in _modules():
+                _saved[module] = module.spice
+                module.spice = SerialSpice(module.spice)
+        _depth += 1
+    try:
+        yield _lock
+    finally:
+        with _lock:
+            _depth -= 1
+            if _depth == 0:
+                for module, spice in _saved.items():
+                    module.spice = spice
+                _saved.clear()
@@ -0,0 +1,202 @@
+"""
+SpiceTrace
+
+Purpose: Opt-in instrumentation of the SpiceyPy calls made by the model
+         (kernel loading, time conversion, name lookups, positions and frame
+         transforms): per-function call counts, element counts for
+         vectorised calls and cumulative / percentile latencies, with JSON
+         and Chrome trace output.
+
+Comments:
+    The model modules call SpiceyPy through their module global `spice`.
+    While tracing is enabled that global is swapped for a SpiceProxy that
+    times each call and records it in every active Recorder; disabling
+    puts the spiceypy module back, so there is no overhead at all when
+    tracing is off.
+
+        with SpiceTrace.capture() as rec:
+            canvas.planetPositions(sol, '2000-01-01')
+        print(rec.report())
+        rec.dumpChromeTrace('trace.json')   # chrome://tracing or Perfetto
+
+    Captures nest (an outer capture also sees the calls of an inner one).
+    Only the calling process is traced, calls made in worker processes
+    (SolBatch, SolAnimate, ParallelOrbits) are not recorded.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import json
+import time
+import threading
+import importlib
+import contextlib
+
+import spiceypy
+import numpy as np
+
+# Model modules whose `spice` global is traced
+TRACED_MODULES = ('Pyprika', 'OrbitCache', 'SpkReader')
+
+# Events kept per Recorder for the Chrome trace (statistics are not capped)
+MAX_EVENTS = 1000000
+
+# Recorders receiving calls, innermost last
+_active = []
+_lock = threading.Lock()
+
+
+class Recorder(object):
+    """Call statistics and trace events of the traced SPICE functions"""
+    def __init__(self, maxEvents=MAX_EVENTS):
+        super(Recorder, self).__init__()
+        self.maxEvents = maxEvents
+        self.reset()
+
+    # Method for discarding everything recorded so far
+    def reset(self):
+        self.durations = {}
+        self.elements = {}
+        self.events = []
+        self.droppedEvents = 0
+        self.origin = time.perf_counter()
+
+    # Method for recording one call of `name` started at t0 (perf_counter)
+    def record(self, name, t0, seconds, elements):
+        with _lock:
+            self.durations.setdefault(name, []).append(seconds)
+            self.elements[name] = self.elements.get(name, 0) + elements
+            if len(self.events) < self.maxEvents:
+                self.events.append((name, t0, seconds, threading.get_ident(), elements))
+            else:
+                self.droppedEvents += 1
+
+    # Method for the statistics of every function called, slowest total first
+    def stats(self):
+        out = {}
+        for name, durations in self.durations.items():
+            d = np.array(durations)
+            p50, p90, p99 = np.percentile(d, (50, 90, 99))
+            out[name] = dict(calls=d.size, elements=self.elements[name],
+                             totalSeconds=float(d.sum()), meanSeconds=float(d.mean()),
+                             p50Seconds=float(p50), p90Seconds=float(p90),
+                             p99Seconds=float(p99), maxSeconds=float(d.max()))
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]['totalSeconds']))
+
+    # Property for the total number of calls recorded
+    @property
+    def calls(self):
+        return sum(len(d) for d in self.durations.values())
+
+    # Method for a text table of the statistics
+    def report(self):
+        lines = ['{0:<10s} {1:>8s} {2:>10s} {3:>10s} {4:>10s} {5:>10s} {6:>10s}'.format(
+            'function', 'calls', 'elements', 'total ms', 'p50 us', 'p99 us', 'max us')]
+        for name, s in self.stats().items():
+            lines.append('{0:<10s} {1:8d} {2:10d} {3:10.3f} {4:10.1f} {5:10.1f} {6:10.1f}'.format(
+                name, s['calls'], s['elements'], 1e3 * s['totalSeconds'],
+                1e6 * s['p50Seconds'], 1e6 * s['p99Seconds'], 1e6 * s['maxSeconds']))
+        return '\n'.join(lines)
+
+    # Method for writing the statistics as JSON
+    def dumpJSON(self, path):
+        with open(path, 'w') as f:
+            json.dump(dict(stats=self.stats(), calls=self.calls,
+                           droppedEvents=self.droppedEvents), f, indent=2)
+
+    # Method for writing the calls as a Chrome trace (Trace Event Format)
+    def dumpChromeTrace(self, path):
+        events = [dict(name=name, cat='spice', ph='X', pid=0, tid=tid,
+                       ts=1e6 * (t0 - self.origin), dur=1e6 * seconds,
+                       args=dict(elements=elements))
+                  for name, t0, seconds, tid, elements in self.events]
+        with open(path, 'w') as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit='ms'), f)
+
+
+# Method for the number of elements handled by a call: the length of its
+# first sequence argument (e.g. the epochs of a vectorised spkpos), else 1
+def _elementCount(args):
+    for arg in args:
+        if not isinstance(arg, (str, bytes)) and hasattr(arg, '__len__'):
+            return len(arg)
+    return 1
+
+
+class SpiceProxy(object):
+    """Stand-in for the spiceypy module that records every function call"""
+    def __init__(self, module=spiceypy):
+        super(SpiceProxy, self).__init__()
+        self._module = module
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr):
+            return attr
+
+        def traced(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - t0
+                elements = _elementCount(args)
+                for recorder in tuple(_active):
+                    recorder.record(name, t0, seconds, elements)
+        traced.__name__ = name
+        traced.__doc__ = attr.__doc__
+
+        # Looked up once per function, later calls skip __getattr__
+        setattr(self, name, traced)
+        return traced
+
+
+_proxy = SpiceProxy()
+
+
+# Method for the traced model modules
+def _modules():
+    return [importlib.import_module('model.' + name) for name in TRACED_MODULES]
+
+
+# Method for starting to record into `recorder` (a new one if None)
+def enable(recorder=None):
+    recorder = Recorder() if recorder is None else recorder
+    with _lock:
+        _active.append(recorder)
+    for module in _modules():
+        module.spice = _proxy
+    return recorder
+
+
+# Method for stopping `recorder` (the innermost if None). The spiceypy
+# module is restored once no recorder is left.
+def disable(recorder=None):
+    with _lock:
+        if recorder is None and _active:
+            recorder = _active[-1]
+        if recorder in _active:
+            _active.remove(recorder)
+        idle = not _active
+    if idle:
+        for module in _modules():
+            module.spice = spiceypy
+    return recorder
+
+
+# Method for whether any recorder is active
+def isEnabled():
+    return bool(_active)
+
+
+# Context manager recording the SPICE calls made inside the block
+@contextlib.contextmanager
+def capture(recorder=None):
+    recorder = enable(recorder)
+    try:
+        yield recorder
+    finally:
+        disable(recorder)
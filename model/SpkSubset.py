@@ -0,0 +1,177 @@
+"""
+SpkSubset
+
+Purpose: Shrink the SPK kernels of a metakernel to the bodies and time
+         window actually needed, writing a smaller valid SPK and a matching
+         metakernel (a Python-native replacement for spkmerge subsetting).
+
+Comments:
+    Segments are read with SpkReader.readSegments (DAF/SPK Type 2 and 3,
+    as in de431_1850_2100.bsp). A segment is kept if its target is one of
+    the requested bodies or a centre on the chain from one of them to the
+    solar system barycentre (e.g. keeping 399 keeps 3), so every kept body
+    can still be evaluated relative to any other. Only the Chebyshev
+    records overlapping the window are copied; they are rewritten through
+    spkw02/spkw03 in the original segment order, which preserves the SPICE
+    search precedence. Coefficients are copied exactly, record midpoints
+    and radii are regenerated by CSPICE from the record length, so states
+    agree with the original kernel to round-off.
+
+    Non-SPK kernels of the metakernel (LSK, PCK, FK) are referenced from
+    the new metakernel, not copied.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import time
+
+import spiceypy as spice
+import numpy as np
+
+from . import Pyprika
+from .SpkReader import SpkReader, SSB
+
+
+# Method for the kernels furnished by a metakernel as (path, type) pairs
+# in load order. The metakernel must be loaded.
+def metakernelContents(mk):
+    contents = []
+    for i in range(spice.ktotal('ALL')):
+        path, kind, source, handle = spice.kdata(i, 'ALL', 255, 255, 255)
+        if os.path.abspath(source) == os.path.abspath(mk) and kind != 'META':
+            contents.append((os.path.normpath(path), kind))
+    return contents
+
+
+# Method for the requested bodies plus every centre needed to chain them
+# to the solar system barycentre
+def requiredBodies(segments, bodies):
+    required, todo = set(), list(bodies)
+    while todo:
+        body = todo.pop()
+        if body in required or body == SSB:
+            continue
+        required.add(body)
+        todo.extend(seg.center for seg in segments if seg.target == body)
+    return required
+
+
+# Method for the pieces of `segments` to keep, as (segment, first record,
+# last record, start ET, end ET). et0/et1 of None keep the whole segment.
+def subsetSegments(segments, bodies=None, et0=None, et1=None):
+    keep = (requiredBodies(segments, bodies) if bodies is not None else
+            set(seg.target for seg in segments))
+    pieces = []
+    for seg in segments:
+        start = seg.start if et0 is None else max(seg.start, et0)
+        end = seg.end if et1 is None else min(seg.end, et1)
+        if seg.target not in keep or start > end:
+            continue
+        i0, i1 = seg.recordIndex(np.array([start, end]))
+        pieces.append((seg, int(i0), int(i1), start,
+                       min(end, seg.init + (i1 + 1) * seg.intlen)))
+    return pieces
+
+
+# Method for writing the pieces of segments to a new SPK file
+def writeSpk(outFile, pieces, internalName='SUBSET'):
+    if os.path.exists(outFile):
+        os.remove(outFile)
+    handle = spice.spkopn(outFile, internalName, 0)
+    try:
+        for seg, i0, i1, start, end in pieces:
+            writer = spice.spkw03 if seg.dataType == 3 else spice.spkw02
+            writer(handle, seg.target, seg.center, spice.frmnam(seg.frame), start, end,
+                   'SUBSET {0} REC {1}-{2}'.format(seg.target, i0, i1), seg.intlen,
+                   i1 - i0 + 1, seg.degree, np.ascontiguousarray(seg.coeffs[i0:i1+1]).ravel(),
+                   seg.init + i0 * seg.intlen)
+    finally:
+        spice.spkcls(handle)
+    return outFile
+
+
+# Method for writing a metakernel loading `kernels` (paths relative to the
+# metakernel's directory, in the same form as the repository metakernel)
+def writeMetakernel(outMk, kernels, comment=''):
+    base = os.path.dirname(outMk) or '.'
+    entries = []
+    for kern in kernels:
+        rel = os.path.relpath(kern, base)
+        entries.append("'{0}'".format(kern if rel.startswith('..') else
+                                      '$KERNELS/' + rel.replace(os.sep, '/')))
+    with open(outMk, 'w') as f:
+        f.write('\\begintext\n\n{0}\n\n\\begindata\n\n'
+                "    PATH_VALUES       = ('{1}')\n\n"
+                "    PATH_SYMBOLS      = ( 'KERNELS' )\n\n"
+                '    KERNELS_TO_LOAD = (\n{2}\n                      )\n\n'
+                '\\begintext\n'.format(comment, base,
+                                       '\n'.join(' ' * 24 + e for e in entries)))
+    return outMk
+
+
+# Method for the cold cost of a metakernel: furnish it and look up one
+# position of every body, then unload. Returns the best of `repeat` in
+# seconds (the metakernel should not already be loaded).
+def loadSeconds(mk, bodies, et=0., repeat=3):
+    times = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        with Pyprika.KernelPool.scoped(mk):
+            for body in bodies:
+                spice.spkpos(str(body), et, 'J2000', 'NONE', str(SSB))
+            times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+# Method for subsetting the SPKs of a metakernel
+def subsetMetakernel(mk, outDir, bodies=None, start=None, end=None, name='subset'):
+    """Write <outDir>/<name>.bsp and <name>.mk and return a report dict
+
+    `bodies` are NAIF IDs (default: all bodies in the kernels) and
+    start/end UTC dates bounding the window (default: full coverage). The
+    report gives the kept bodies and segments, input/output sizes, the
+    largest position difference from the original kernels and the load
+    time (furnish plus first lookups) of both metakernels.
+    """
+    with Pyprika.KernelPool.scoped(mk):
+        contents = metakernelContents(mk)
+        spks = [path for path, kind in contents if kind == 'SPK']
+        et0, et1 = (Pyprika.SpiceBase.convertDateToET(t)[0] if t else None
+                    for t in (start, end))
+        segments = [seg for path in spks for seg in SpkReader.readSegments(path)]
+        pieces = subsetSegments(segments, bodies, et0, et1)
+        if not pieces:
+            raise ValueError('No SPK data for bodies {0} between {1} and '
+                             '{2}'.format(bodies, start, end))
+
+        if not os.path.isdir(outDir):
+            os.makedirs(outDir)
+        outSpk = writeSpk(os.path.join(outDir, name + '.bsp'), pieces)
+        others = [path for path, kind in contents if kind != 'SPK']
+        outMk = writeMetakernel(os.path.join(outDir, name + '.mk'), others + [outSpk],
+                                'Subset of {0}: bodies {1}, {2} to {3}'.format(
+                                    mk, sorted(set(p[0].target for p in pieces)),
+                                    start or 'start', end or 'end'))
+
+        # Kept bodies evaluated from both kernel sets over the window they
+        # all cover
+        kept = sorted(set(p[0].target for p in pieces))
+        lo = max(min(p[3] for p in pieces if p[0].target == b) for b in kept)
+        hi = min(max(p[4] for p in pieces if p[0].target == b) for b in kept)
+        et = np.linspace(lo, hi, 1000)
+        original, subset = SpkReader(spks), SpkReader([outSpk])
+        maxDiffKm = max(float(np.abs(original.position(b, et) - subset.position(b, et)).max())
+                        for b in kept)
+        checkBodies = bodies if bodies is not None else kept
+
+    report = dict(metakernel=outMk, spk=outSpk, bodies=kept,
+                  segments=len(pieces), segmentsIn=len(segments),
+                  bytesIn=sum(os.path.getsize(p) for p in spks),
+                  bytesOut=os.path.getsize(outSpk), maxDiffKm=maxDiffKm,
+                  loadSecondsIn=loadSeconds(mk, checkBodies, 0.5 * (lo + hi)),
+                  loadSecondsOut=loadSeconds(outMk, checkBodies, 0.5 * (lo + hi)))
+    return report
@@ -0,0 +1,238 @@
+"""
+Stream
+
+Purpose: Chunked ephemeris generation over long, regularly sampled time
+         ranges with bounded memory, optionally written as it goes to a
+         columnar on-disk store that can be resumed.
+
+Comments:
+    The epoch grid (start, start + step, ... up to end, in UTC) is never
+    materialised: each chunk's epochs are generated from the row index, so
+    a 100M row range costs no more memory than one chunk. Planet and
+    SolSystem expose this as iterPositions.
+
+    A ColumnStore is a directory holding one .npy file per column (the
+    first axis is the row) plus manifest.json describing the columns, the
+    range parameters and how many rows are complete. The .npy files are
+    preallocated (sparse) for the whole range and each chunk is written in
+    place; the manifest is only advanced (atomically) once a chunk is synced,
+    so after an interruption streaming into the same directory resumes
+    from the last complete chunk. The columns are plain NPY, readable with
+    np.load(..., mmap_mode='r') by anything downstream.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import json
+import datetime as dt
+
+import numpy as np
+
+# Default number of epochs per chunk
+CHUNK_SIZE = 1000000
+
+MANIFEST = 'manifest.json'
+VERSION = 1
+
+
+# Method for coercing a step (seconds, datetime.timedelta or
+# numpy.timedelta64) to timedelta64[us]
+def toStep(step):
+    if isinstance(step, dt.timedelta):
+        step = np.timedelta64(step)
+    elif not isinstance(step, np.timedelta64):
+        step = np.timedelta64(int(round(float(step) * 1e6)), 'us')
+    step = step.astype('timedelta64[us]')
+    if step <= np.timedelta64(0, 'us'):
+        raise ValueError('Step must be positive')
+    return step
+
+
+# Method for the epoch grid of a range, returns (start, step, rows) with
+# start as datetime64[us] (UTC) and step as timedelta64[us]
+def epochGrid(start, end, step):
+    start = np.datetime64(start, 'us')
+    end = np.datetime64(end, 'us')
+    step = toStep(step)
+    if end < start:
+        raise ValueError('End {0} is before start {1}'.format(end, start))
+    return start, step, int((end - start) // step) + 1
+
+
+# Method for generating the epochs of rows [i0, i1) of a grid
+def gridEpochs(start, step, i0, i1):
+    return start + step * np.arange(i0, i1, dtype=np.int64)
+
+
+# Class for a directory of preallocated .npy columns filled chunk by chunk
+class ColumnStore(object):
+    """Columnar on-disk store of fixed-length NPY columns plus a manifest"""
+    def __init__(self, path, manifest, writable=False):
+        super(ColumnStore, self).__init__()
+
+        self.path = path
+        self.manifest = manifest
+        self.columns = {}
+        self._files = {}
+        for name in manifest['columns']:
+            columnFile = os.path.join(path, name + '.npy')
+            if writable:
+                # Plain positioned writes rather than a writable memory map,
+                # so written rows do not accumulate in the process's memory
+                f = open(columnFile, 'r+b')
+                if np.lib.format.read_magic(f) == (1, 0):
+                    np.lib.format.read_array_header_1_0(f)
+                else:
+                    np.lib.format.read_array_header_2_0(f)
+                self._files[name] = (f, f.tell())
+            else:
+                # Readers only see the complete rows
+                self.columns[name] = np.load(columnFile, mmap_mode='r')[:self.rowsWritten]
+
+    # Method for creating a store (or reopening a compatible one to resume)
+    @classmethod
+    def create(cls, path, columns, rows, meta=None):
+        """`columns` maps name -> (dtype, shape of one row)"""
+        columns = {name: dict(dtype=np.dtype(dtype).str, shape=list(shape))
+                   for name, (dtype, shape) in columns.items()}
+        meta = json.loads(json.dumps(meta or {}))
+        manifestFile = os.path.join(path, MANIFEST)
+
+        if os.path.exists(manifestFile):
+            with open(manifestFile) as f:
+                manifest = json.load(f)
+            if (manifest['columns'] != columns or manifest['rows'] != rows or
+                    manifest['meta'] != meta):
+                raise ValueError('{0} holds a different range or layout, stream into '
+                                 'a new directory'.format(path))
+            return cls(path, manifest, writable=True)
+
+        os.makedirs(path, exist_ok=True)
+        for name, spec in columns.items():
+            # Sparse preallocation of the whole column
+            column = np.lib.format.open_memmap(os.path.join(path, name + '.npy'), mode='w+',
+                                               dtype=np.dtype(spec['dtype']),
+                                               shape=(rows,) + tuple(spec['shape']))
+            del column
+        manifest = dict(version=VERSION, rows=rows, rowsWritten=0,
+                        columns=columns, meta=meta)
+        store = cls(path, manifest, writable=True)
+        store.__writeManifest()
+        return store
+
+    # Method for opening a store read-only (columns cut to complete rows)
+    @classmethod
+    def open(cls, path):
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest['version'] != VERSION:
+            raise ValueError('Unsupported column store version {0} '
+                             '(expected {1})'.format(manifest['version'], VERSION))
+        return cls(path, manifest)
+
+    # Property for the number of rows in the full range
+    @property
+    def rows(self):
+        return self.manifest['rows']
+
+    # Property for the number of complete rows from the start of the range
+    @property
+    def rowsWritten(self):
+        return self.manifest['rowsWritten']
+
+    # Property for the range parameters stored with the columns
+    @property
+    def meta(self):
+        return self.manifest['meta']
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    # Method for writing rows [i0, i0 + n) of every column and marking
+    # them complete once they are on disk
+    def write(self, i0, arrays):
+        if i0 > self.rowsWritten:
+            raise ValueError('Writing from row {0} would leave rows {1} to {0} '
+                             'empty'.format(i0, self.rowsWritten))
+        n = 0
+        for name, values in arrays.items():
+            spec = self.manifest['columns'][name]
+            values = np.ascontiguousarray(values, dtype=np.dtype(spec['dtype']))
+            n = len(values)
+            f, dataStart = self._files[name]
+            f.seek(dataStart + i0 * values.itemsize * int(np.prod(spec['shape'])))
+            f.write(values.tobytes())
+        for f, dataStart in self._files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        self.manifest['rowsWritten'] = max(self.rowsWritten, i0 + n)
+        self.__writeManifest()
+
+    # Method for closing the column files of a writable store
+    def close(self):
+        for f, dataStart in self._files.values():
+            f.close()
+        self._files = {}
+
+    # Method for reading the complete rows back chunk by chunk, yields
+    # dicts of column name -> array
+    def iterChunks(self, chunkSize=CHUNK_SIZE, columns=None):
+        names = list(self.columns) if columns is None else list(columns)
+        for i0 in range(0, self.rowsWritten, chunkSize):
+            i1 = min(i0 + chunkSize, self.rowsWritten)
+            yield {name: np.array(self.columns[name][i0:i1]) for name in names}
+
+    # Private method replacing the manifest atomically
+    def __writeManifest(self):
+        manifestFile = os.path.join(self.path, MANIFEST)
+        tmp = '{0}.{1}.tmp'.format(manifestFile, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, manifestFile)
+
+
+# Method for streaming a computation over an epoch grid in chunks
+def stream(compute, columns, start, end, step, chunkSize=CHUNK_SIZE, offset=None,
+           out=None, meta=None):
+    """Return a generator of compute(epochs) for consecutive grid chunks
+
+    compute maps a datetime64[us] array of at most chunkSize epochs to
+    (chunk, {column name: array}); the chunks are yielded and, when `out`
+    is a directory, the column arrays are written to a ColumnStore there
+    (`columns` gives its layout, `meta` the parameters a resumed run must
+    match). Streaming starts at row `offset`, by default 0 or, for an
+    existing store, its first incomplete row.
+    """
+    start, step, rows = epochGrid(start, end, step)
+    if chunkSize < 1:
+        raise ValueError('chunkSize must be at least 1')
+
+    store = None
+    if out is not None:
+        meta = dict(meta or {}, start=str(start), end=str(end),
+                    stepInMicroseconds=int(step.astype(np.int64)))
+        store = ColumnStore.create(out, columns, rows, meta)
+        if offset is None:
+            offset = store.rowsWritten
+    offset = 0 if offset is None else int(offset)
+    if not 0 <= offset <= rows:
+        raise ValueError('Offset {0} is outside the {1} row range'.format(offset, rows))
+    return _chunks(compute, store, start, step, rows, chunkSize, offset)
+
+
+# Private generator behind stream, so argument errors surface on the call
+def _chunks(compute, store, start, step, rows, chunkSize, offset):
+    try:
+        for i0 in range(offset, rows, chunkSize):
+            i1 = min(i0 + chunkSize, rows)
+            chunk, arrays = compute(gridEpochs(start, step, i0, i1))
+            if store is not None:
+                store.write(i0, arrays)
+            yield chunk
+    finally:
+        if store is not None:
+            store.close()
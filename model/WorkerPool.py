@@ -0,0 +1,100 @@
+"""
+WorkerPool
+
+Purpose: Spawned process pools whose workers load the kernels once in an
+         initialiser (SolBatch, SolAnimate, SolService, ParallelOrbits),
+         failing fast when the kernels or the initialiser are broken.
+
+Comments:
+    multiprocessing replaces a worker whose initialiser raises with a new
+    one running the same initialiser, so a missing or unreadable kernel
+    made the pools respawn workers (and print tracebacks) forever instead
+    of failing. spawnPool therefore loads the metakernel in the parent
+    first and raises IOError there if it does not load. Each worker's
+    initialiser then runs under a guard that keeps any exception rather
+    than raising it, and every task sent through `guarded(func)` to such a
+    worker raises WorkerInitError with the original traceback, so the
+    failure reaches the caller as an ordinary task error. `finishing`
+    terminates a pool on the first task error rather than closing it, so
+    the error is not held back until every queued task has run.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import functools
+import traceback
+import contextlib
+import multiprocessing as mp
+
+from . import Pyprika
+
+# Traceback of this worker's failed initialiser, None if it succeeded
+_initError = None
+
+
+class WorkerInitError(RuntimeError):
+    """A pool worker's initialiser failed, the task was not run"""
+
+
+# Method for checking in the calling process that the kernels a backend
+# needs (default metakernel if mkFile is None) load
+def checkKernels(mkFile=None, backend=None):
+    mk = Pyprika.kernelsFor(mkFile if mkFile is not None else Pyprika.DEFAULT_MK, backend)
+    try:
+        with Pyprika.KernelPool.scoped(mk):
+            pass
+    except Exception as err:
+        raise IOError('Spice metakernel {0} cannot be located or contents '
+                      'failed to load: {1}'.format(mk, err))
+
+
+# Pool initialiser running `initializer` and keeping its error
+def _guardedInit(initializer, *initargs):
+    global _initError
+    try:
+        initializer(*initargs)
+    except Exception:
+        _initError = traceback.format_exc()
+
+
+# Method run in a worker for each guarded task
+def _call(func, *args):
+    if _initError is not None:
+        raise WorkerInitError('Worker initialisation failed:\n' + _initError)
+    return func(*args)
+
+
+# Method for wrapping a task function so it raises WorkerInitError in a
+# worker whose initialiser failed (picklable, like func itself)
+def guarded(func):
+    return functools.partial(_call, func)
+
+
+# Method for starting a 'spawn' pool of `processes` workers running
+# initializer(*initargs), after checking the kernels load here
+def spawnPool(processes, initializer, initargs=(), mkFile=None, backend=None):
+    checkKernels(mkFile, backend)
+    return mp.get_context('spawn').Pool(processes, initializer=_guardedInit,
+                                        initargs=(initializer,) + tuple(initargs))
+
+
+# Context manager for shutting down a pool (None for no pool) once its
+# results are consumed: close and join on success, terminate on an error
+# so queued tasks are dropped instead of run first
+@contextlib.contextmanager
+def finishing(pool):
+    if pool is None:
+        yield pool
+        return
+    try:
+        yield pool
+    except BaseException:
+        pool.terminate()
+        pool.join()
+        raise
+    else:
+        pool.close()
+        pool.join()
@@ -0,0 +1,162 @@
+"""
+SyntheticKernels
+
+Purpose: Generate a small, self-consistent SPICE kernel set (LSK, SPK and
+         metakernel) locally so the model can be tested and benchmarked
+         offline, without the DE431 subset kernel. Test and benchmark
+         support only, not part of the model package.
+
+Comments:
+    The SPK holds circular, coplanar-ish orbits for the same body tree as
+    de431_1850_2100.bsp (barycentres 1-10 about the SSB, plus 199, 299, 399
+    and 301 about their barycentres) written as Type 2 (position only) or
+    Type 3 (position + velocity) Chebyshev segments. The LSK is copied from
+    the repository's NAIF0012.TLS and the PCK and frames kernels are reused
+    so HCI is available. Positions are therefore wrong in an astronomical
+    sense but exact with respect to the analytic model in
+    `syntheticPosition`, which makes them useful as a reference.
+
+Version History:
+    v0.1 -> Creation -> Oct 2026
+
+"""
+
+## Imports
+import os
+import shutil
+
+import spiceypy as spice
+import numpy as np
+
+# Repository kernels reused by the synthetic set
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', 'assets', 'spice')
+
+KM_PER_AU = 149597870.7
+
+# (body, centre, radius in km, period in days, inclination in rad)
+SYNTHETIC_BODIES = [
+    (1, 0, 0.39 * KM_PER_AU, 87.97, 0.12),
+    (2, 0, 0.72 * KM_PER_AU, 224.7, 0.06),
+    (3, 0, 1.00 * KM_PER_AU, 365.26, 0.00),
+    (4, 0, 1.52 * KM_PER_AU, 686.98, 0.03),
+    (5, 0, 5.20 * KM_PER_AU, 4332.6, 0.02),
+    (6, 0, 9.54 * KM_PER_AU, 10759.2, 0.04),
+    (7, 0, 19.2 * KM_PER_AU, 30685.4, 0.01),
+    (8, 0, 30.1 * KM_PER_AU, 60189.0, 0.03),
+    (9, 0, 39.5 * KM_PER_AU, 90560.0, 0.30),
+    (10, 0, 7.0e5, 4332.6, 0.02),
+    (199, 1, 1.0, 58.6, 0.0),
+    (299, 2, 1.0, 243.0, 0.0),
+    (399, 3, 4671., 27.32, 0.09),
+    (301, 3, 379729., 27.32, 0.09),
+]
+
+
+# Analytic reference state (km, km/s) of `body` relative to its centre in J2000
+def syntheticPosition(body, et, velocity=False):
+    for b, c, r, p, inc in SYNTHETIC_BODIES:
+        if b == body:
+            break
+    else:
+        raise ValueError('Body {0} not in synthetic set'.format(body))
+
+    et = np.asarray(et, dtype=np.float64)
+    w = 2. * np.pi / (p * 86400.)
+    phase = w * et + body
+    pos = np.stack([r * np.cos(phase),
+                    r * np.sin(phase) * np.cos(inc),
+                    r * np.sin(phase) * np.sin(inc)], axis=-1)
+    if not velocity:
+        return pos
+    vel = np.stack([-r * w * np.sin(phase),
+                    r * w * np.cos(phase) * np.cos(inc),
+                    r * w * np.cos(phase) * np.sin(inc)], axis=-1)
+    return np.concatenate([pos, vel], axis=-1)
+
+
+# Method for fitting Chebyshev records to the analytic model
+def _chebyshevRecords(body, first, last, intlen, polydg, withVelocity):
+    nRec = int(np.ceil((last - first) / intlen))
+    mids = first + intlen * (np.arange(nRec) + 0.5)
+    rad = intlen / 2.
+
+    # Chebyshev nodes on [-1, 1] for each record
+    nodes = np.cos(np.pi * (np.arange(polydg + 1) + 0.5) / (polydg + 1))
+    et = mids[:,None] + rad * nodes[None,:]
+    state = syntheticPosition(body, et, velocity=withVelocity)
+
+    nComp = 6 if withVelocity else 3
+    coeffs = np.empty((nRec, nComp, polydg + 1))
+    for c in range(nComp):
+        coeffs[:,c,:] = np.polynomial.chebyshev.chebfit(nodes, state[:,:,c].T, polydg).T
+    return coeffs.reshape(nRec, -1)
+
+
+# Method for writing an SPK of synthetic orbits. Each segment is
+# (body, centre, frame, model): the orbit of SYNTHETIC_BODIES entry `model`
+# stored for `body` about `centre`, its components taken as `frame`.
+def writeSyntheticSpk(spk, segments, first, last, spkType=2, polydg=11,
+                      maxIntlen=64. * 86400.):
+    if os.path.exists(spk):
+        os.remove(spk)
+    periods = dict((b, p) for b, c, r, p, inc in SYNTHETIC_BODIES)
+    handle = spice.spkopn(spk, 'SYNTHETIC', 0)
+    try:
+        for body, centre, frame, model in segments:
+            bodyLen = min(maxIntlen, periods[model] * 86400. / 4.)
+            cdata = _chebyshevRecords(model, first, last, bodyLen, polydg,
+                                      withVelocity=(spkType == 3))
+            # Segment covers whole records only
+            segLast = first + bodyLen * cdata.shape[0]
+            writer = spice.spkw03 if spkType == 3 else spice.spkw02
+            writer(handle, body, centre, frame, first, segLast,
+                   'SYNTH {0}'.format(body), bodyLen, cdata.shape[0], polydg,
+                   cdata.ravel(), first)
+    finally:
+        spice.spkcls(handle)
+
+
+# Method for writing the synthetic kernel set to `outDir`
+def makeSyntheticKernels(outDir, start='1850-01-01', end='2100-01-01',
+                         spkType=2, polydg=11, maxIntlen=64. * 86400.):
+    """Write lsk/, pck/, fk/, spk/ and metakernel.mk under outDir, returns mk path
+
+    Each body's record length is a quarter of its period (capped at
+    maxIntlen seconds) so every body is fitted to well below a metre.
+    """
+    for sub in ('lsk', 'pck', 'fk', 'spk'):
+        if not os.path.isdir(os.path.join(outDir, sub)):
+            os.makedirs(os.path.join(outDir, sub))
+
+    shutil.copy(os.path.join(ASSET_DIR, 'lsk', 'NAIF0012.TLS'),
+                os.path.join(outDir, 'lsk', 'NAIF0012.TLS'))
+    shutil.copy(os.path.join(ASSET_DIR, 'pck', 'pck00010.tpc'),
+                os.path.join(outDir, 'pck', 'pck00010.tpc'))
+    shutil.copy(os.path.join(ASSET_DIR, 'fk', 'RSSD0002.TF'),
+                os.path.join(outDir, 'fk', 'RSSD0002.TF'))
+
+    # Epochs need the LSK
+    spice.furnsh(os.path.join(outDir, 'lsk', 'NAIF0012.TLS'))
+    try:
+        first, last = spice.str2et(start), spice.str2et(end)
+    finally:
+        spice.unload(os.path.join(outDir, 'lsk', 'NAIF0012.TLS'))
+
+    writeSyntheticSpk(os.path.join(outDir, 'spk', 'synthetic.bsp'),
+                      [(body, centre, 'J2000', body)
+                       for body, centre, r, p, inc in SYNTHETIC_BODIES],
+                      first, last, spkType, polydg, maxIntlen)
+
+    mk = os.path.join(outDir, 'metakernel.mk')
+    with open(mk, 'w') as f:
+        f.write('\\begindata\n\n'
+                "    PATH_VALUES       = ('{0}')\n"
+                "    PATH_SYMBOLS      = ( 'KERNELS' )\n"
+                '    KERNELS_TO_LOAD   = ( '
+                "'$KERNELS/lsk/NAIF0012.TLS'\n"
+                "                          '$KERNELS/pck/pck00010.tpc'\n"
+                "                          '$KERNELS/fk/RSSD0002.TF'\n"
+                "                          '$KERNELS/spk/synthetic.bsp' )\n\n"
+                '\\begintext\n'.format(os.path.abspath(outDir)))
+    return mk
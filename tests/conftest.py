@@ -0,0 +1,29 @@
+"""
+conftest
+
+Purpose: Shared pytest fixtures: a synthetic SPICE kernel set
+         (tests.SyntheticKernels) furnished for the tests that need one.
+
+"""
+
+## Imports
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from model import Pyprika
+from tests.SyntheticKernels import makeSyntheticKernels
+
+
+# Synthetic metakernel furnished in the KernelPool, one per SPK type
+# (2: position only, 3: position and velocity)
+@pytest.fixture(scope='module', params=[2, 3], ids=['type2', 'type3'])
+def syntheticKernels(request, tmp_path_factory):
+    mkFile = makeSyntheticKernels(str(tmp_path_factory.mktemp('kernels')),
+                                  spkType=request.param)
+    Pyprika.KernelPool.acquire(mkFile)
+    yield mkFile
+    Pyprika.KernelPool.clear()
@@ -0,0 +1,105 @@
+"""
+test_analytic
+
+Purpose: Analytic (mean element) positions against fixed DE421 reference
+         positions, within Analytic.errorBound, and the frames the backend
+         builds itself (HEE) or refuses with only its own kernels loaded.
+
+"""
+
+## Imports
+import os
+import json
+
+import numpy as np
+import pytest
+import spiceypy as spice
+
+from model import Analytic
+from model import Pyprika
+from model.SolSystem import SolSystem
+
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                         'analytic_reference.json')
+
+# Repository root, ANALYTIC_MK's paths are relative to it
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+# Kernel pool holding only what the analytic backend loads (LSK and FK),
+# the kernels loaded before are furnished again afterwards
+@pytest.fixture
+def analyticKernels(monkeypatch):
+    monkeypatch.chdir(REPO)
+    loaded = list(Pyprika.KernelPool.refCounts)
+    Pyprika.KernelPool.clear()
+    yield
+    Pyprika.KernelPool.clear()
+    for kern in loaded:
+        Pyprika.KernelPool.acquire(kern)
+
+
+@pytest.fixture(scope='module')
+def reference():
+    with open(REFERENCE) as f:
+        return json.load(f)
+
+
+def test_reference_within_valid_span(reference):
+    first, last = Analytic.VALID_SPAN
+    assert first <= reference['tdb'][0][:10] and reference['tdb'][-1][:10] <= last
+
+
+@pytest.mark.parametrize('body', [10, 1, 2, 3, 399, 4, 5, 6, 7, 8, 9])
+def test_position_within_bound(reference, body):
+    et = np.array(reference['et'])
+    ref = np.array(reference['positions'][str(body)])
+    pos = Analytic.AnalyticBackend().position(body, et, frame=reference['frame'],
+                                              obs=reference['observer'])
+    assert pos.shape == ref.shape
+    assert np.linalg.norm(pos - ref, axis=1).max() < Analytic.errorBound(body)
+
+
+def test_observer_and_frame():
+    # Heliocentric ECLIPJ2000 agrees with the rotated barycentric positions
+    backend = Analytic.AnalyticBackend()
+    et = np.linspace(-1e9, 1e9, 7)
+    helio = backend.position(399, et, frame='ECLIPJ2000', obs=10)
+    bary = Pyprika.SpiceBase.frameTransforms('J2000', 'ECLIPJ2000', et)
+    expected = np.einsum('nij,nj->ni', bary, backend.position(399, et, obs=0) -
+                         backend.position(10, et, obs=0))
+    assert np.allclose(helio, expected, rtol=0, atol=1e-6)
+    # Heliocentric distance of the Earth-Moon barycentre stays near 1 AU
+    assert np.allclose(np.linalg.norm(helio, axis=1) / Analytic.AU_KM, 1., atol=0.02)
+
+
+def test_unknown_body():
+    with pytest.raises(ValueError):
+        Analytic.AnalyticBackend().position(301, np.zeros(1))
+
+
+def test_hee_construction(syntheticKernels):
+    # From SPICE's own Sun-Earth vector the rotations are the frames
+    # kernel's HEE
+    et = np.linspace(-3e9, 3e9, 9)
+    sunEarth = np.array(spice.spkpos('EARTH', et, 'J2000', 'NONE', 'SUN')[0])
+    expected = np.stack([spice.pxform('J2000', 'HEE', t) for t in et])
+    assert np.allclose(Analytic.heeTransforms(et, sunEarth), expected, rtol=0, atol=1e-12)
+
+
+def test_derived_frames(analyticKernels):
+    sol = SolSystem(Pyprika.DEFAULT_MK, useOrbitCache=False, backend='analytic')
+    dates = ['1900-01-01', '1975-06-30', '2000-01-01', '2040-03-03']
+
+    # HEE from the analytic Earth, the same through getViews
+    pos = sol.getPositions(dates, frame='HEE', obs='SUN')
+    views = sol.getViews(dates, frames=('HCI', 'HEE'), observers=('SUN',))
+    assert np.abs(views['HEE', 'SUN']['posInAU'] - pos['posInAU']).max() < 1e-12
+    earth = pos['posInAU'][list(sol.bodies).index('EARTH')]
+    assert np.all(earth[:,0] > 0.98) and np.abs(earth[:,1]).max() < 1e-12
+
+    # Frames defined by ephemeris data the backend does not have
+    with pytest.raises(ValueError, match='need an SPK'):
+        sol.getPositions(dates, frame='GSE', obs='SUN')
+    with pytest.raises(ValueError, match='need an SPK'):
+        sol.getViews(dates, frames=('HCI', 'HEEQ'))
@@ -0,0 +1,76 @@
+"""
+test_ephemeristable
+
+Purpose: EphemerisTable built on the synthetic kernels: the maxErrorKm
+         stored in its header bounds the error against SpiceBackend at
+         random epochs, the 'table' backend is found beside the metakernel
+         and named by the table's fingerprint, and a table built from other
+         kernels is refused.
+
+"""
+
+## Imports
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from model import Pyprika
+from model.SolSystem import SolSystem
+from model.OrbitCache import OrbitCache
+from model.EphemerisTable import EphemerisTable, tableFor
+from tests.SyntheticKernels import makeSyntheticKernels
+
+SPAN = ('2000-01-01', '2004-01-01')
+
+
+@pytest.fixture(scope='module')
+def table(syntheticKernels):
+    sol = SolSystem(syntheticKernels, useOrbitCache=False)
+    path = tableFor(syntheticKernels)
+    table = EphemerisTable.build(path, sol, start=SPAN[0], end=SPAN[1])
+    yield table
+    EphemerisTable._opened.pop(os.path.abspath(path), None)
+    os.remove(path)
+
+
+def test_stored_errors(syntheticKernels, table):
+    rng = np.random.default_rng(1)
+    et0, et1 = Pyprika.SpiceBase.convertDateToET(list(SPAN))
+    et = np.sort(rng.uniform(et0, et1, 2000))
+    spice = Pyprika.SpiceBackend()
+    for body in table.header['bodies']:
+        ref = spice.position(body['id'], et, frame=table.frame, obs=table.obs)
+        err = np.linalg.norm(table.position(body['id'], et, frame=table.frame,
+                                            obs=table.obs) - ref, axis=1)
+        # Stored errors are sampled across every interval, allow for
+        # the peak falling between samples
+        assert err.max() <= 1.05 * table.header['maxErrorKm'][body['label']] + 1e-3
+
+
+def test_table_backend(syntheticKernels, table):
+    sol = SolSystem(syntheticKernels, useOrbitCache=False, backend='table')
+    assert sol.sun.backend.backend is table
+    assert sol.backendName == 'EphemerisTable-' + table.fingerprint[:16]
+    assert OrbitCache(syntheticKernels, backend='table').backendName == sol.backendName
+
+    pos = sol.getPositions(['2001-05-17'], frame='HCI', obs='SUN')
+    ref = SolSystem(syntheticKernels, useOrbitCache=False).getPositions(
+        ['2001-05-17'], frame='HCI', obs='SUN')
+    assert np.abs(pos['posInAU'] - ref['posInAU']).max() * Pyprika.KM_PER_AU < 1e3
+
+
+def test_other_kernels_refused(syntheticKernels, table, tmp_path):
+    # The same table beside the metakernel of a different kernel set
+    otherMk = makeSyntheticKernels(str(tmp_path))
+    shutil.copy(table.path, tableFor(otherMk))
+    Pyprika.KernelPool.clear()
+    try:
+        Pyprika.KernelPool.acquire(otherMk)
+        with pytest.raises(ValueError, match='not loaded'):
+            Pyprika.resolveBackend('table', otherMk)
+    finally:
+        Pyprika.KernelPool.clear()
+        Pyprika.KernelPool.acquire(syntheticKernels)
+    assert Pyprika.resolveBackend('table', syntheticKernels).backend is table
@@ -0,0 +1,59 @@
+"""
+test_kernelpool
+
+Purpose: KernelPool bookkeeping when a kernel fails to load.
+
+"""
+
+## Imports
+import os
+
+import pytest
+import spiceypy as spice
+
+from model import Pyprika
+from tests.SyntheticKernels import ASSET_DIR
+
+LSK = os.path.abspath(os.path.join(ASSET_DIR, 'lsk', 'NAIF0012.TLS'))
+
+
+def writeMetakernel(path, kernels):
+    with open(path, 'w') as f:
+        # One kernel per line, text kernel lines are limited to 132 characters
+        f.write('\\begindata\nKERNELS_TO_LOAD = (\n{0}\n)\n\\begintext\n'.format(
+            '\n'.join("'{0}'".format(k) for k in kernels)))
+    return str(path)
+
+
+@pytest.fixture
+def emptyPool():
+    Pyprika.KernelPool.clear()
+    yield
+    Pyprika.KernelPool.clear()
+
+
+def test_failed_acquire_is_not_recorded(emptyPool, tmp_path):
+    mk = writeMetakernel(tmp_path / 'bad.mk', [LSK, str(tmp_path / 'missing.bsp')])
+    with pytest.raises(Exception):
+        Pyprika.KernelPool.acquire(mk)
+    assert mk not in Pyprika.KernelPool.refCounts
+    assert mk not in Pyprika.KernelPool.hashes
+    # Kernels listed before the missing one are unloaded again
+    assert spice.ktotal('ALL') == 0
+
+
+def test_failed_reload_is_forgotten(emptyPool, tmp_path):
+    mk = writeMetakernel(tmp_path / 'kernels.mk', [LSK])
+    Pyprika.KernelPool.acquire(mk)
+    assert spice.ktotal('ALL') == 2
+
+    writeMetakernel(mk, [LSK, str(tmp_path / 'missing.bsp')])
+    with pytest.raises(Exception):
+        Pyprika.KernelPool.acquire(mk, reload=True)
+    assert mk not in Pyprika.KernelPool.refCounts
+    assert spice.ktotal('ALL') == 0
+
+    # A fixed metakernel loads again
+    writeMetakernel(mk, [LSK])
+    Pyprika.KernelPool.acquire(mk)
+    assert Pyprika.KernelPool.refCounts[mk] == 1
@@ -0,0 +1,56 @@
+"""
+test_orbitcache
+
+Purpose: OrbitCache entries on the synthetic kernels: a stored track is
+         served back only for the same span (start and orbital period),
+         and other kernel sets' entries survive a purge until they age out.
+
+"""
+
+## Imports
+import os
+import time
+
+import numpy as np
+
+from model import Pyprika
+from model.OrbitCache import OrbitCache, MAX_AGE_DAYS
+
+
+def makePlanet(mkFile, cache, years):
+    return Pyprika.Planet(mkFile, planetID=4, orbPeriodInEarthYears=years,
+                          orbitCache=cache)
+
+
+def test_period_in_key(syntheticKernels, tmp_path):
+    cache = OrbitCache(syntheticKernels, str(tmp_path))
+    mars = makePlanet(syntheticKernels, cache, 1.88)
+    track = np.array(mars.orbitPosInAU[0])
+
+    again = makePlanet(syntheticKernels, cache, 1.88)
+    assert cache.load(*again.orbitCacheKey()) is not None
+    assert np.array_equal(again.orbitPosInAU[0], track)
+
+    # A different period samples a different span, so it must not be
+    # served the stored track
+    longer = makePlanet(syntheticKernels, cache, 3.76)
+    assert cache.load(*longer.orbitCacheKey()) is None
+    assert not np.array_equal(longer.orbitPosInAU[0][-1], track[-1])
+
+
+def test_purge_keeps_other_kernel_sets(syntheticKernels, tmp_path):
+    cache = OrbitCache(syntheticKernels, str(tmp_path))
+    fresh = tmp_path / '0123456789abcdef'
+    old = tmp_path / 'fedcba9876543210'
+    for other in (fresh, old):
+        other.mkdir()
+        (other / 'entry.npy').write_bytes(b'')
+    stamp = time.time() - (MAX_AGE_DAYS + 1) * 86400.
+    os.utime(str(old), (stamp, stamp))
+    (tmp_path / 'legacy_entry.json').write_text('{}')
+
+    makePlanet(syntheticKernels, cache, 1.88).orbitPosInAU
+    assert fresh.is_dir()
+    assert not old.exists()
+    assert not (tmp_path / 'legacy_entry.json').exists()
+    assert os.listdir(cache.entryDir)
@@ -0,0 +1,40 @@
+"""
+test_parallelorbits
+
+Purpose: Orbit tracks built in worker processes (SolSystem(processes=2))
+         on the synthetic kernels are bit-identical to the serial ones,
+         both orbitPosInAU and orbitLOD, and so are the tracks they leave
+         in the orbit cache.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+
+from model.SolSystem import SolSystem
+
+
+def assertSameTracks(sol, serial):
+    for label, body in serial.bodies.items():
+        track, solDistance = body.orbitPosInAU
+        other = sol.bodies[label]
+        assert np.array_equal(other.orbitPosInAU[0], track), label
+        assert np.array_equal(np.ravel(other.orbitPosInAU[1])[0],
+                              np.ravel(solDistance)[0]), label
+        assert np.array_equal(other.orbitLOD, body.orbitLOD), label
+
+
+@pytest.mark.parametrize('backend', [None, 'numpy'])
+def test_parallel_matches_serial(syntheticKernels, backend, tmp_path):
+    serial = SolSystem(syntheticKernels, useOrbitCache=False, backend=backend)
+    parallel = SolSystem(syntheticKernels, cacheDir=str(tmp_path), backend=backend,
+                         processes=2)
+    # Set by the workers, not computed lazily here
+    assert all(b._orbitPosInAU is not None and b._orbitLOD is not None
+               for b in parallel.bodies.values())
+    assertSameTracks(parallel, serial)
+
+    # Read back from the cache the workers' tracks were stored in
+    cached = SolSystem(syntheticKernels, cacheDir=str(tmp_path), backend=backend)
+    assertSameTracks(cached, serial)
@@ -0,0 +1,36 @@
+"""
+test_rendercache
+
+Purpose: RenderCache hits, disk size accounting and LRU eviction.
+
+"""
+
+## Imports
+from model.RenderCache import RenderCache
+
+
+def test_hit_and_miss(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert cache.get(dict(date='2000-01-01')) is None
+    cache.put(dict(date='2000-01-01'), b'png')
+    assert cache.get(dict(date='2000-01-01')) == b'png'
+    # Read from disk by a second process's cache
+    assert RenderCache(str(tmp_path)).get(dict(date='2000-01-01')) == b'png'
+
+
+def test_overwrite_counts_bytes_once(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    cache.put(dict(date='2000-01-01'), b'a' * 100)
+    for k in range(5):
+        cache.put(dict(date='2000-01-01'), b'b' * 150)
+    cache.put(dict(date='2000-01-02'), b'c' * 100)
+    assert cache.stats()['diskBytes'] == cache.diskBytes() == 250
+    assert RenderCache(str(tmp_path)).get(dict(date='2000-01-01')) == b'b' * 150
+
+
+def test_eviction(tmp_path):
+    cache = RenderCache(str(tmp_path), maxBytes=250)
+    for day in range(1, 5):
+        cache.put(dict(date='2000-01-0{0}'.format(day)), bytes(100))
+    assert cache.diskBytes() <= 250
+    assert cache.evictions == 2
@@ -0,0 +1,139 @@
+"""
+test_service
+
+Purpose: SolService round trips over HTTP on the synthetic kernels: a
+         valid positions request, malformed request lines, invalid JSON
+         fields and unknown frames or observers (answered 400, the service
+         keeps serving), frames the analytic backend cannot evaluate
+         (answered 400) and worker failures (answered 500).
+
+"""
+
+## Imports
+import os
+import json
+import asyncio
+
+import pytest
+
+from SolService import SolService
+from tests.SyntheticKernels import makeSyntheticKernels
+
+# Repository root, the analytic backend's metakernel paths are relative to it
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+@pytest.fixture(scope='module')
+def serviceKernels(tmp_path_factory):
+    return makeSyntheticKernels(str(tmp_path_factory.mktemp('servicekernels')))
+
+
+# Method for sending raw request bytes and parsing the response
+async def roundTrip(port, request):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        statusLine = (await reader.readline()).decode('latin-1')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers['content-length']))
+        return int(statusLine.split()[1]), json.loads(body)
+    finally:
+        writer.close()
+
+
+def get(target):
+    return 'GET {0} HTTP/1.1\r\nConnection: close\r\n\r\n'.format(target).encode()
+
+
+def post(target, fields):
+    body = json.dumps(fields).encode()
+    return ('POST {0} HTTP/1.1\r\nContent-Length: {1}\r\nConnection: close\r\n'
+            '\r\n'.format(target, len(body)).encode() + body)
+
+
+def test_round_trip(serviceKernels):
+    async def run():
+        service = SolService(serviceKernels, processes=1)
+        port = await service.start(port=0)
+        try:
+            return [await roundTrip(port, request) for request in (
+                get('/positions?date=2000-01-01'),
+                post('/positions', dict(dates=['2000-01-01', '2000-01-02'], obs='SUN')),
+                b'GARBAGE\r\n\r\n',
+                b'GET /positions\r\n\r\n',
+                b'POST /positions HTTP/1.1\r\nContent-Length: many\r\n\r\n',
+                post('/positions', dict(date=19900517)),
+                post('/positions', dict(dates=[None, '2000-01-01'])),
+                post('/positions', dict(dates='2000-01-01', frame=3)),
+                post('/positions', ['2000-01-01']),
+                get('/render?date=2000-01-01&dpi=100000'),
+                get('/positions?date=2000-01-01&frame=NOT_A_FRAME'),
+                post('/positions', dict(date='2000-01-01', obs='NOBODY')),
+                get('/positions?date=2000-01-01&obs=399'),
+                get('/positions?date=2000-01-03'))]
+        finally:
+            await service.close()
+
+    results = asyncio.run(run())
+    (status, single), (status2, several) = results[:2]
+    assert status == status2 == 200
+    assert single['date'] == '2000-01-01'
+    assert len(single['bodies']['EARTH']['posInAU']) == 3
+    assert [r['date'] for r in several] == ['2000-01-01', '2000-01-02']
+    assert all(r['obs'] == 'SUN' for r in several)
+
+    for status, reply in results[2:-1]:
+        assert status == 400
+        assert reply['error']
+    assert 'date must be a string' in results[5][1]['error']
+    assert 'unknown frame' in results[10][1]['error']
+    assert 'unknown observer' in results[11][1]['error']
+
+    # Still serving after the bad requests
+    assert results[-1][0] == 200
+
+
+def test_worker_failure(serviceKernels):
+    async def run():
+        service = SolService(serviceKernels, processes=1, backend='numpy')
+        port = await service.start(port=0)
+        try:
+            return [await roundTrip(port, request) for request in (
+                # Known to SPICE but not in the synthetic SPK, so the
+                # worker's SpkReader raises (a ValueError)
+                get('/positions?date=2000-01-01&obs=MARS'),
+                get('/positions?date=2000-01-01&frame=HEE&obs=SUN'))]
+        finally:
+            await service.close()
+
+    (status, reply), (status2, reply2) = asyncio.run(run())
+    assert status == 500
+    assert 'ValueError' in reply['error']
+    assert status2 == 200
+
+
+def test_analytic_frames(serviceKernels, monkeypatch):
+    monkeypatch.chdir(REPO)
+
+    async def run():
+        service = SolService(serviceKernels, processes=1, backend='analytic')
+        port = await service.start(port=0)
+        try:
+            return [await roundTrip(port, request) for request in (
+                get('/positions?date=2000-01-01&frame=HEE&obs=SUN'),
+                get('/positions?date=2000-01-01&frame=GSE&obs=SUN'))]
+        finally:
+            await service.close()
+
+    (status, reply), (status2, reply2) = asyncio.run(run())
+    assert status == 200
+    assert reply['frame'] == 'HEE'
+    assert status2 == 400
+    assert 'need an SPK' in reply2['error']
@@ -0,0 +1,85 @@
+"""
+test_spkreader
+
+Purpose: SpkReader positions and velocities against spiceypy (spkezr) on
+         the synthetic kernels, in inertial and rotating frames, including
+         segments stored in ECLIPJ2000 rather than J2000.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+import spiceypy as spice
+
+from model import Pyprika
+from model.SpkReader import SpkReader, SPKPOS_TOLERANCE_KM
+from tests.SyntheticKernels import writeSyntheticSpk
+
+# Epochs spread over the synthetic kernel span (1850-2100)
+EPOCHS = np.linspace(-4.5e9, 3.1e9, 97)
+
+# Velocity agreement (km/s)
+VELOCITY_TOLERANCE = 1e-9
+
+# Made-up NAIF IDs for the ECLIPJ2000 segments (no clash with the set)
+ECLIPTIC_BODIES = (2000001, 2000002)
+
+
+def reference(target, frame, obs):
+    return np.array(spice.spkezr(str(target), EPOCHS, frame, 'NONE', str(obs))[0])
+
+
+@pytest.mark.parametrize('target,obs', [(399, 0), (301, 10), (5, 10), (199, 399)])
+@pytest.mark.parametrize('frame', ['J2000', 'ECLIPJ2000', 'HCI', 'HEE'])
+def test_position(syntheticKernels, target, obs, frame):
+    reader = SpkReader.fromKernelPool()
+    ref = reference(target, frame, obs)[:,:3]
+    pos = reader.position(target, EPOCHS, frame=frame, obs=obs)
+    assert pos.shape == (EPOCHS.size, 3)
+    assert np.abs(pos - ref).max() < SPKPOS_TOLERANCE_KM
+
+
+@pytest.mark.parametrize('target,obs', [(399, 0), (399, 10), (301, 399)])
+@pytest.mark.parametrize('frame', ['J2000', 'HEE'])
+def test_velocity(syntheticKernels, target, obs, frame):
+    reader = SpkReader.fromKernelPool()
+    ref = reference(target, frame, obs)
+    st = reader.state(target, EPOCHS, frame=frame, obs=obs)
+    assert st.shape == (EPOCHS.size, 6)
+    assert np.abs(st[:,:3] - ref[:,:3]).max() < SPKPOS_TOLERANCE_KM
+    assert np.abs(st[:,3:] - ref[:,3:]).max() < VELOCITY_TOLERANCE
+
+
+# Extra SPK with Mars-like and Moon-like orbits stored in ECLIPJ2000,
+# loaded on top of the synthetic set
+@pytest.fixture
+def eclipticSpk(syntheticKernels, tmp_path):
+    spk = str(tmp_path / 'ecliptic.bsp')
+    first, last = spice.str2et(['1850-01-01', '2100-01-01'])
+    writeSyntheticSpk(spk, [(ECLIPTIC_BODIES[0], 10, 'ECLIPJ2000', 4),
+                            (ECLIPTIC_BODIES[1], 399, 'ECLIPJ2000', 301)],
+                      first, last, spkType=3)
+    with Pyprika.KernelPool.scoped(spk):
+        yield spk
+
+
+@pytest.mark.parametrize('target,obs', [(ECLIPTIC_BODIES[0], 10), (ECLIPTIC_BODIES[0], 0),
+                                        (ECLIPTIC_BODIES[1], 399), (ECLIPTIC_BODIES[1], 3)])
+@pytest.mark.parametrize('frame', ['J2000', 'ECLIPJ2000', 'HCI', 'HEE'])
+def test_ecliptic_segment(eclipticSpk, target, obs, frame):
+    reader = SpkReader.fromKernelPool()
+    ref = reference(target, frame, obs)
+    st = reader.state(target, EPOCHS, frame=frame, obs=obs)
+    assert np.abs(st[:,:3] - ref[:,:3]).max() < SPKPOS_TOLERANCE_KM
+    assert np.abs(st[:,3:] - ref[:,3:]).max() < VELOCITY_TOLERANCE
+
+    # Positions as spkpos gives them
+    pos = reader.position(target, EPOCHS, frame=frame, obs=obs)
+    spkpos = np.array(spice.spkpos(str(target), EPOCHS, frame, 'NONE', str(obs))[0])
+    assert np.abs(pos - spkpos).max() < SPKPOS_TOLERANCE_KM
+
+
+def test_unknown_body(syntheticKernels):
+    with pytest.raises(ValueError):
+        SpkReader.fromKernelPool().position(499, EPOCHS)
@@ -0,0 +1,63 @@
+"""
+test_spksubset
+
+Purpose: SpkSubset.subsetMetakernel on the synthetic kernels: subsetting
+         by bodies and window keeps the centres on each body's chain to
+         the barycentre, and spkezr from the new metakernel equals the
+         original inside the window.
+
+"""
+
+## Imports
+import os
+
+import numpy as np
+import pytest
+import spiceypy as spice
+
+from model import Pyprika
+from model.SpkSubset import subsetMetakernel
+
+WINDOW = ('2000-01-01', '2001-01-01')
+
+
+def states(targets, et, obs):
+    return {t: np.array(spice.spkezr(str(t), et, 'J2000', 'NONE', str(obs))[0])
+            for t in targets}
+
+
+def test_subset_bodies_and_window(syntheticKernels, tmp_path):
+    report = subsetMetakernel(syntheticKernels, str(tmp_path), bodies=[399, 301],
+                              start=WINDOW[0], end=WINDOW[1])
+
+    # The Moon and Earth about the Earth-Moon barycentre, which is kept
+    # as the centre on their chain to the solar system barycentre
+    assert report['bodies'] == [3, 301, 399]
+    assert report['segments'] == 3
+    assert report['maxDiffKm'] == 0.
+    assert report['bytesOut'] < report['bytesIn']
+
+    et0, et1 = Pyprika.SpiceBase.convertDateToET(list(WINDOW))
+    et = np.linspace(et0, et1, 200)
+    targets = [3, 301, 399]
+    reference = states(targets, et, 0)
+    referenceMoon = states([301], et, 399)
+
+    # Only the subset loaded
+    Pyprika.KernelPool.clear()
+    try:
+        Pyprika.KernelPool.acquire(report['metakernel'])
+        subset = states(targets, et, 0)
+        subsetMoon = states([301], et, 399)
+        with pytest.raises(spice.stypes.SpiceyError):
+            spice.spkezr('5', et0, 'J2000', 'NONE', '0')
+        with pytest.raises(spice.stypes.SpiceyError):
+            spice.spkezr('399', et0 - 30. * 86400., 'J2000', 'NONE', '0')
+    finally:
+        Pyprika.KernelPool.clear()
+        Pyprika.KernelPool.acquire(syntheticKernels)
+
+    for t in targets:
+        assert np.array_equal(subset[t], reference[t])
+    assert np.array_equal(subsetMoon[301], referenceMoon[301])
+    assert os.path.exists(report['spk'])
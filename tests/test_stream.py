@@ -0,0 +1,62 @@
+"""
+test_stream
+
+Purpose: Streaming into a ColumnStore on the synthetic kernels: a stream
+         closed after a few chunks resumes in the same directory, and the
+         finished store matches getPositions on the full grid; a store
+         with a different range or layout is refused.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+
+from model import Stream
+from model.SolSystem import SolSystem
+
+BODIES = ['EARTH', 'MARS']
+RANGE = ('2000-01-01', '2000-01-20T07:00', 3600)
+
+
+def test_resume(syntheticKernels, tmp_path):
+    sol = SolSystem(syntheticKernels, useOrbitCache=False)
+    out = str(tmp_path / 'store')
+
+    # Interrupted after three chunks
+    chunks = sol.iterPositions(*RANGE, bodies=BODIES, chunkSize=50, out=out)
+    for k in range(3):
+        next(chunks)
+    chunks.close()
+    assert Stream.ColumnStore.open(out).rowsWritten == 150
+
+    # Resumed (the chunk size is free to change) from row 150
+    resumed = list(sol.iterPositions(*RANGE, bodies=BODIES, chunkSize=70, out=out))
+    start, step, rows = Stream.epochGrid(*RANGE)
+    assert sum(c.shape[1] for c in resumed) == rows - 150
+
+    store = Stream.ColumnStore.open(out)
+    assert store.rowsWritten == rows
+    full = sol.getPositions(Stream.gridEpochs(start, step, 0, rows), bodies=BODIES)
+    assert np.array_equal(store['et'], full['et'][0])
+    for i, label in enumerate(BODIES):
+        assert np.array_equal(store[label + '.posInAU'], full['posInAU'][i])
+        assert np.array_equal(store[label + '.solDistanceInAU'], full['solDistanceInAU'][i])
+
+
+def test_different_layout(syntheticKernels, tmp_path):
+    sol = SolSystem(syntheticKernels, useOrbitCache=False)
+    out = str(tmp_path / 'store')
+    next(sol.iterPositions(*RANGE, bodies=BODIES, chunkSize=50, out=out))
+
+    for args, kwargs in [(RANGE[:2] + (1800,), dict(bodies=BODIES)),
+                         (('2000-01-02',) + RANGE[1:], dict(bodies=BODIES)),
+                         (RANGE, dict(bodies=BODIES[:1])),
+                         (RANGE, dict(bodies=BODIES, frame='J2000')),
+                         (RANGE, dict(bodies=BODIES, obs='SUN'))]:
+        with pytest.raises(ValueError, match='different range or layout'):
+            sol.iterPositions(*args, chunkSize=50, out=out, **kwargs)
+
+    # A single body stream into a SolSystem store is refused too
+    with pytest.raises(ValueError, match='different range or layout'):
+        sol.earth.iterPositions(*RANGE, chunkSize=50, out=out)
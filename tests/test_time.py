@@ -0,0 +1,85 @@
+"""
+test_time
+
+Purpose: Bulk UTC -> ET conversion (SpiceBase.convertDateToET and the
+         vectorised DELTET arithmetic in LeapSecondTable) against str2et on
+         a grid of dates spanning the leap-second table, plus sub-second,
+         timezone-aware and ':60' leap-second inputs.
+
+"""
+
+## Imports
+import os
+import datetime as dt
+
+import numpy as np
+import pytest
+import spiceypy as spice
+
+from model import Pyprika
+
+LSK = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                   'assets', 'spice', 'lsk', 'NAIF0012.TLS')
+TOL = 1e-6
+
+
+@pytest.fixture(scope='module')
+def leapSeconds():
+    Pyprika.KernelPool.acquire(LSK)
+    yield LSK
+    Pyprika.KernelPool.clear()
+
+
+def reference(dates):
+    return np.array([spice.str2et(str(d)) for d in dates])
+
+
+def test_grid_spanning_table(leapSeconds):
+    # Every 13 days from before the first leap second to past the last
+    # one, plus the instants either side of each leap second
+    grid = np.arange(np.datetime64('1850-01-01'), np.datetime64('2100-01-01'),
+                     np.timedelta64(13, 'D')).astype('datetime64[us]')
+    table = Pyprika.LeapSecondTable()
+    steps = (Pyprika.J2000_UTC + (table.leapEpochs * 1e6).astype('timedelta64[us]'))
+    edges = np.concatenate([steps - np.timedelta64(1, 's'), steps,
+                            steps + np.timedelta64(500, 'ms')])
+    dates = np.datetime_as_string(np.concatenate([grid, edges]), unit='us')
+
+    et = Pyprika.SpiceBase.convertDateToET(dates, verify=True, tol=TOL)
+    assert np.abs(et - reference(dates)).max() <= TOL
+
+
+def test_sub_second_strings(leapSeconds):
+    dates = ['2016-12-31T23:59:59.5', '2017-01-01T00:00:00.000001',
+             '1999-06-30T23:59:59.999999', '2024-02-29T12:34:56.789']
+    et = Pyprika.SpiceBase.convertDateToET(dates, verify=True)
+    assert np.abs(et - reference(dates)).max() <= TOL
+
+
+def test_timezone_aware(leapSeconds):
+    plus5 = dt.timezone(dt.timedelta(hours=5))
+    minus330 = dt.timezone(-dt.timedelta(hours=3, minutes=30))
+    times = [dt.datetime(2017, 1, 1, 4, 59, 59, 500000, tzinfo=plus5),
+             dt.datetime(2000, 1, 1, 8, 30, tzinfo=minus330),
+             dt.datetime(1990, 5, 17, tzinfo=dt.timezone.utc)]
+    et = Pyprika.SpiceBase.convertDateToET(times, verify=True)
+    assert np.abs(et - reference(['2016-12-31T23:59:59.5', '2000-01-01T12:00:00',
+                                  '1990-05-17T00:00:00'])).max() <= TOL
+
+
+def test_leap_second_literal(leapSeconds):
+    # NumPy cannot represent :60 so these go through str2et
+    dates = ['2016-12-31T23:59:60', '2016-12-31T23:59:60.5', '2017-01-01T00:00:00']
+    et = Pyprika.SpiceBase.convertDateToET(dates, verify=True)
+    assert np.abs(et - reference(dates)).max() <= TOL
+    assert np.all(np.diff(et) > 0)
+
+
+def test_verify_detects_mismatch(leapSeconds, monkeypatch):
+    Pyprika.SpiceBase.convertDateToET('2000-01-01')
+    table = Pyprika.SpiceBase._leapSeconds
+    utcToET = table.utcToET
+    monkeypatch.setattr(table, 'utcToET', lambda utcSec: utcToET(utcSec) + 1e-3)
+
+    with pytest.raises(ValueError, match='differs from str2et'):
+        Pyprika.SpiceBase.convertDateToET(['2000-01-01', '2020-01-01'], verify=True)
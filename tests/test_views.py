@@ -0,0 +1,49 @@
+"""
+test_views
+
+Purpose: SolSystem.getViews and Planet.getViews (one barycentric pass,
+         every frame/observer derived from it) against getPositions and
+         getPos on the synthetic kernels, over inertial and rotating frames
+         and two observers.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+
+from model import Pyprika
+from model.SolSystem import SolSystem
+
+FRAMES = ('HCI', 'J2000', 'HEE')
+OBSERVERS = ('SUN', 'EARTH')
+
+# Agreement required (km), well under a metre
+TOLERANCE_KM = 1e-4
+
+
+@pytest.mark.parametrize('backend', [None, 'numpy'])
+def test_views_match_positions(syntheticKernels, backend):
+    sol = SolSystem(syntheticKernels, useOrbitCache=False, backend=backend)
+    dates = np.datetime64('1850-01-01') + np.arange(0, 250 * 365, 97) * np.timedelta64(1, 'D')
+    views = sol.getViews(dates, frames=FRAMES, observers=OBSERVERS)
+    assert sorted(views) == sorted((f, o) for f in FRAMES for o in OBSERVERS)
+
+    for (frame, obs), view in views.items():
+        ref = sol.getPositions(dates, frame=frame, obs=obs)
+        assert np.array_equal(view['et'], ref['et'])
+        errKm = np.abs(view['posInAU'] - ref['posInAU']).max() * Pyprika.KM_PER_AU
+        assert errKm < TOLERANCE_KM, (frame, obs, errKm)
+        assert np.abs(view['solDistanceInAU'] - ref['solDistanceInAU']).max() \
+            * Pyprika.KM_PER_AU < TOLERANCE_KM
+
+
+def test_planet_views_match_getpos(syntheticKernels):
+    mars = SolSystem(syntheticKernels, useOrbitCache=False).mars
+    dates = np.datetime64('1900-01-01') + np.arange(0, 150 * 365, 211) * np.timedelta64(1, 'D')
+    views, solDistance = mars.getViews(dates, frames=FRAMES, observers=OBSERVERS)
+    for (frame, obs), view in views.items():
+        pos, refSolDistance = mars.getPos(dates, frame=frame, obs=obs)
+        assert np.abs(view - pos).max() * Pyprika.KM_PER_AU < TOLERANCE_KM, (frame, obs)
+    assert abs(solDistance[0] - mars.getPos(dates[:1], obs='EARTH')[1]) \
+        * Pyprika.KM_PER_AU < TOLERANCE_KM